@@ -4,22 +4,146 @@ dictionaries.
 Fuso provides functions for merging dictionaries and lists of dictionaries, sorting, and
 converting between different data structures. It also includes a factory function for
 creating custom merge functions.
+
+Public names are imported from their submodules on first access, so `import fuso` stays
+cheap and only the parts of the library that are used are ever loaded.
 """
 
-from fuso.dicts import merge_dict
-from fuso.factories import (
-    create_merge_factory,
-    create_merge_list_of_dicts_by_key_factory,
-)
-from fuso.lists import merge_list_of_dicts_by_key
-from fuso.utils import sort_dict, sort_list_of_dicts_by_key, to_list_of_dicts_by_key
+# Defined here rather than imported from `typing`, which would more than double the
+# cost of `import fuso`. Type checkers treat any `TYPE_CHECKING` constant this way.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from fuso.cache import MergeCache
+    from fuso.columns import merge_list_of_dicts_by_key_columnar
+    from fuso.dicts import MergeEngine, MergePlan, merge_dict, merge_into, merge_many
+    from fuso.factories import (
+        create_merge_factory,
+        create_merge_list_of_dicts_by_key_factory,
+    )
+    from fuso.lists import (
+        ListMergePlan,
+        merge_list_of_dicts_by_key,
+        merge_many_list_of_dicts_by_key,
+    )
+    from fuso.parallel import merge_list_of_dicts_by_key_sharded
+    from fuso.patches import diff, diff_list_of_dicts_by_key
+    from fuso.state import MergeState
+    from fuso.stats import MergeStats
+    from fuso.strategies import (
+        MERGE_MAPPING,
+        StrategyRegistry,
+        keep_last,
+        ordered_union,
+        prepend,
+        replace,
+        union_by,
+    )
+    from fuso.streams import iter_merge_list_of_dicts_by_key
+    from fuso.utils import (
+        ListKey,
+        Ordering,
+        RowView,
+        sort_dict,
+        sort_list_of_dicts_by_key,
+        to_list_of_dicts_by_key,
+    )
+    from fuso.views import MergedView
+del TYPE_CHECKING
+
+_LAZY_ATTRIBUTES = {
+    "MergeCache": "fuso.cache",
+    "merge_list_of_dicts_by_key_columnar": "fuso.columns",
+    "MergeEngine": "fuso.dicts",
+    "MergePlan": "fuso.dicts",
+    "merge_dict": "fuso.dicts",
+    "merge_into": "fuso.dicts",
+    "merge_many": "fuso.dicts",
+    "create_merge_factory": "fuso.factories",
+    "create_merge_list_of_dicts_by_key_factory": "fuso.factories",
+    "ListMergePlan": "fuso.lists",
+    "merge_list_of_dicts_by_key": "fuso.lists",
+    "merge_many_list_of_dicts_by_key": "fuso.lists",
+    "merge_list_of_dicts_by_key_sharded": "fuso.parallel",
+    "diff": "fuso.patches",
+    "diff_list_of_dicts_by_key": "fuso.patches",
+    "MergeState": "fuso.state",
+    "MergeStats": "fuso.stats",
+    "MERGE_MAPPING": "fuso.strategies",
+    "StrategyRegistry": "fuso.strategies",
+    "keep_last": "fuso.strategies",
+    "ordered_union": "fuso.strategies",
+    "prepend": "fuso.strategies",
+    "replace": "fuso.strategies",
+    "union_by": "fuso.strategies",
+    "iter_merge_list_of_dicts_by_key": "fuso.streams",
+    "ListKey": "fuso.utils",
+    "Ordering": "fuso.utils",
+    "RowView": "fuso.utils",
+    "sort_dict": "fuso.utils",
+    "sort_list_of_dicts_by_key": "fuso.utils",
+    "to_list_of_dicts_by_key": "fuso.utils",
+    "MergedView": "fuso.views",
+}
+"""The module defining every public name, which is imported on first access."""
 
 __all__ = [
     "merge_dict",
+    "merge_into",
+    "merge_many",
+    "MergePlan",
     "merge_list_of_dicts_by_key",
+    "merge_many_list_of_dicts_by_key",
+    "ListMergePlan",
+    "iter_merge_list_of_dicts_by_key",
+    "merge_list_of_dicts_by_key_sharded",
+    "merge_list_of_dicts_by_key_columnar",
     "to_list_of_dicts_by_key",
+    "RowView",
     "sort_dict",
     "sort_list_of_dicts_by_key",
     "create_merge_factory",
     "create_merge_list_of_dicts_by_key_factory",
+    "Ordering",
+    "ListKey",
+    "MergeEngine",
+    "MergedView",
+    "MergeStats",
+    "MergeCache",
+    "MergeState",
+    "diff",
+    "diff_list_of_dicts_by_key",
+    "StrategyRegistry",
+    "MERGE_MAPPING",
+    "ordered_union",
+    "union_by",
+    "replace",
+    "prepend",
+    "keep_last",
 ]
+
+
+def __getattr__(name: str) -> object:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        return _import_submodule(name)
+    value = getattr(__import__(module, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def _import_submodule(name: str) -> object:
+    """Import `fuso.<name>`, which `import fuso` used to load eagerly."""
+    from importlib import import_module  # noqa: PLC0415 - Not needed by `import fuso`
+
+    if name.startswith("__"):
+        raise AttributeError(f"module 'fuso' has no attribute '{name}'")
+    try:
+        return import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+    raise AttributeError(f"module 'fuso' has no attribute '{name}'")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,321 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from fuso.columns import merge_list_of_dicts_by_key_columnar
+from fuso.dicts import merge_dict, merge_many
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.utils import sort_dict, to_list_of_dicts_by_key
+
+
+class Workload(NamedTuple):
+    """A named benchmark.
+
+    `setup` builds the synthetic inputs for a given scale and returns the callable
+    that is timed, so building the inputs is never part of the measurement.
+    """
+
+    name: str
+    description: str
+    setup: Callable[[int], Callable[[], Any]]
+
+
+class BenchmarkComparison(NamedTuple):
+    """The change of one workload between two result files."""
+
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+    regressed: bool
+
+
+def _wide_dict(scale: int) -> Callable[[], Any]:
+    size = 1_000 * scale
+    original = {f"key{i}": i for i in range(size)}
+    updates = {f"key{i}": -i for i in range(0, size * 2, 2)}
+    return lambda: merge_dict(original, updates)
+
+
+def _deep_dict(scale: int) -> Callable[[], Any]:
+    def build(depth: int, leaf: str) -> dict:
+        root = node = {}
+        for level in range(depth):
+            node[f"sibling{level}"] = leaf
+            node = node.setdefault("child", {})
+        return root
+
+    original = build(200 * scale, "original")
+    updates = build(200 * scale, "update")
+    return lambda: merge_dict(original, updates)
+
+
+def _recursive_engine(scale: int) -> Callable[[], Any]:
+    original = {
+        f"group{i}": {f"key{j}": {"n": j} for j in range(20)} for i in range(50)
+    }
+    updates = {
+        f"group{i}": {f"key{j}": {"m": j} for j in range(10)} for i in range(50 * scale)
+    }
+    return lambda: merge_dict(original, updates, engine="recursive")
+
+
+def _long_lists(scale: int) -> Callable[[], Any]:
+    original = {f"list{i}": list(range(10_000 * scale)) for i in range(5)}
+    updates = {f"list{i}": list(range(1_000 * scale)) for i in range(5)}
+    return lambda: merge_dict(original, updates)
+
+
+def _keyed_list(scale: int) -> Callable[[], Any]:
+    size = 5_000 * scale
+    values = [{"id": i, "name": f"item{i}", "tags": ["value"]} for i in range(size)]
+    updates = [{"id": "default", **{f"default{i}": i for i in range(100)}}]
+    updates.extend({"id": i, "tags": ["update"]} for i in range(0, size * 2, 2))
+    return lambda: merge_list_of_dicts_by_key(
+        values, updates, key="id", default_key="default"
+    )
+
+
+def _columnar_keyed_list(scale: int) -> Callable[[], Any]:
+    size = 5_000 * scale
+    values = [
+        {"id": i, "name": f"item{i}", "n": i, "score": i / 2, "active": True}
+        for i in range(size)
+    ]
+    updates = [{"id": "default", "active": False}]
+    updates.extend({"id": i, "n": -i} for i in range(0, size * 2, 2))
+    return lambda: merge_list_of_dicts_by_key_columnar(
+        values, updates, key="id", default_key="default"
+    )
+
+
+def _many_layers(scale: int) -> Callable[[], Any]:
+    layers = [
+        {"tags": [layer], "db": {f"key{i}": layer for i in range(50)}, "n": layer}
+        for layer in range(50 * scale)
+    ]
+    return lambda: merge_many(*layers)
+
+
+def _sort_dict(scale: int) -> Callable[[], Any]:
+    size = 5_000 * scale
+    data = {f"key{i}": i for i in reversed(range(size))}
+    key_order = [f"key{i}" for i in range(0, size, 10)]
+    return lambda: sort_dict(data, key_order)
+
+
+def _to_list_of_dicts_by_key(scale: int) -> Callable[[], Any]:
+    values = [{"id": i, "name": f"item{i}", "n": i} for i in range(10_000 * scale)]
+    return lambda: to_list_of_dicts_by_key(values, key="id")
+
+
+WORKLOADS: dict[str, Workload] = {
+    workload.name: workload
+    for workload in [
+        Workload("wide_dict", "merge_dict on flat dictionaries", _wide_dict),
+        Workload("deep_dict", "merge_dict on deeply nested dictionaries", _deep_dict),
+        Workload(
+            "recursive_engine",
+            "merge_dict with the recursive engine",
+            _recursive_engine,
+        ),
+        Workload("long_lists", "merge_dict concatenating long lists", _long_lists),
+        Workload(
+            "keyed_list",
+            "merge_list_of_dicts_by_key with a default update",
+            _keyed_list,
+        ),
+        Workload(
+            "columnar_keyed_list",
+            "merge_list_of_dicts_by_key_columnar on rows of scalar fields",
+            _columnar_keyed_list,
+        ),
+        Workload("many_layers", "merge_many over many layers", _many_layers),
+        Workload("sort_dict", "sort_dict with a partial key order", _sort_dict),
+        Workload(
+            "to_list_of_dicts_by_key",
+            "to_list_of_dicts_by_key on a long list",
+            _to_list_of_dicts_by_key,
+        ),
+    ]
+}
+"""The built-in workloads, by name."""
+
+
+def run_benchmarks(
+    names: Sequence[str] | None = None,
+    scale: int = 1,
+    repeat: int = 5,
+    number: int | None = None,
+) -> dict:
+    """Time the built-in workloads.
+
+    Args:
+        names (Sequence[str] | None): Workloads to run, all of them by default
+        scale (int): Multiplier for the size of the synthetic inputs
+        repeat (int): Number of timing rounds per workload
+        number (int | None): Calls per round. By default it is picked so that a
+            round takes at least 0.2 seconds.
+
+    Returns:
+        dict: JSON serializable results, with the seconds per call of the fastest
+            and the median round of every workload under `"results"`
+
+    Raises:
+        KeyError: If a workload name is unknown.
+        ValueError: If `scale` or `repeat` is smaller than 1.
+
+    Example:
+        ```py
+        results = run_benchmarks(["wide_dict"], repeat=1, number=1)
+        assert results["results"]["wide_dict"]["best"] > 0
+        ```
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be at least 1, got {scale}")
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+    selected = list(WORKLOADS) if names is None else list(names)
+    unknown = [name for name in selected if name not in WORKLOADS]
+    if unknown:
+        raise KeyError(
+            f"Unknown workload '{unknown[0]}'. "
+            f"Available workloads: {', '.join(WORKLOADS)}"
+        )
+    results = {}
+    for name in selected:
+        workload = WORKLOADS[name]
+        timer = timeit.Timer(workload.setup(scale))
+        calls = number or timer.autorange()[0]
+        timings = [elapsed / calls for elapsed in timer.repeat(repeat, calls)]
+        results[name] = {
+            "description": workload.description,
+            "number": calls,
+            "repeat": repeat,
+            "best": min(timings),
+            "median": statistics.median(timings),
+        }
+    return {
+        "fuso_version": _fuso_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = 0.1
+) -> list[BenchmarkComparison]:
+    """Compare two sets of results from `run_benchmarks`.
+
+    Workloads are compared by their fastest round, which is the least noisy
+    measure. Workloads that only appear in one of the results are skipped.
+
+    Args:
+        baseline (dict): Results to compare against
+        current (dict): New results
+        threshold (float): Allowed slowdown as a fraction, `0.1` flags workloads that
+            got more than 10% slower
+
+    Returns:
+        list[BenchmarkComparison]: One comparison per workload in both results
+
+    Example:
+        ```py
+        baseline = {"results": {"wide_dict": {"best": 1.0}}}
+        current = {"results": {"wide_dict": {"best": 1.5}}}
+        [comparison] = compare_results(baseline, current, threshold=0.2)
+        assert comparison.regressed and comparison.ratio == 1.5
+        ```
+    """
+    comparisons = []
+    current_results = current["results"]
+    for name, baseline_result in baseline["results"].items():
+        if name not in current_results:
+            continue
+        before = baseline_result["best"]
+        after = current_results[name]["best"]
+        ratio = after / before if before else float("inf")
+        comparisons.append(
+            BenchmarkComparison(name, before, after, ratio, ratio > 1 + threshold)
+        )
+    return comparisons
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmark command line.
+
+    `python -m fuso.bench run --output results.json` times the workloads and writes
+    the results to a JSON file. `python -m fuso.bench compare baseline.json
+    results.json --threshold 0.1` compares two result files and fails if a workload
+    got slower than the threshold allows.
+
+    Args:
+        argv (Sequence[str] | None): Arguments, `sys.argv[1:]` by default
+
+    Returns:
+        int: Exit status, `1` if `compare` found a regression
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fuso.bench", description="Benchmark fuso merges."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("--output", "-o", type=Path, help="write the results to a file")
+    run.add_argument(
+        "--workload",
+        "-w",
+        action="append",
+        choices=list(WORKLOADS),
+        help="workload to run, can be repeated (default: all)",
+    )
+    run.add_argument("--scale", type=int, default=1, help="input size multiplier")
+    run.add_argument("--repeat", type=int, default=5, help="timing rounds")
+    run.add_argument("--number", type=int, help="calls per round")
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed slowdown as a fraction"
+    )
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run_benchmarks(args.workload, args.scale, args.repeat, args.number)
+        for name, result in results["results"].items():
+            sys.stdout.write(f"{name:<26}{result['best'] * 1e3:>12.3f} ms\n")
+        if args.output is not None:
+            args.output.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+    comparisons = compare_results(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.current.read_text()),
+        args.threshold,
+    )
+    for comparison in comparisons:
+        status = "SLOWER" if comparison.regressed else "ok"
+        sys.stdout.write(
+            f"{comparison.name:<26}{comparison.baseline * 1e3:>12.3f} ms"
+            f"{comparison.current * 1e3:>12.3f} ms{comparison.ratio:>8.2f}x  {status}\n"
+        )
+    return 1 if any(comparison.regressed for comparison in comparisons) else 0
+
+
+def _fuso_version() -> str:
+    try:
+        return version("fuso")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+class MergeCache:
+    """A bounded LRU cache of merge results.
+
+    Pass a cache to `create_merge_factory` or
+    `create_merge_list_of_dicts_by_key_factory` to return stored results when a plan
+    is called with inputs it has seen before. A cache can be shared by several plans.
+
+    By default inputs are fingerprinted by content: they are pickled and hashed, so
+    equal inputs hit the same entry even when they are different objects, and
+    mutating an input after a merge never returns a stale result. With
+    `identity=True` inputs are looked up by identity instead, which skips the
+    fingerprint. Only use it for inputs that are never modified, or call `clear()`
+    after modifying one.
+
+    Results are stored pickled and unpickled on the way out, so every caller gets its
+    own copy and can modify it freely. Inputs or results that cannot be pickled are
+    merged without caching.
+
+    Args:
+        max_entries (int): Maximum number of stored results
+        max_bytes (int | None): Maximum total size of the stored results, measured
+            by their pickled size. Results larger than this are not stored.
+        identity (bool): Look inputs up by identity instead of by content
+
+    Raises:
+        ValueError: If `max_entries` is smaller than 1.
+
+    Example:
+        ```py
+        cache = MergeCache(max_entries=16)
+        merge = create_merge_factory(cache=cache)
+        first = merge({"tags": ["a"]}, {"tags": ["b"]})
+        first["tags"].append("changed")
+        assert merge({"tags": ["a"]}, {"tags": ["b"]}) == {"tags": ["a", "b"]}
+        assert (cache.hits, cache.misses) == (1, 1)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: int | None = None,
+        identity: bool = False,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.identity = identity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[Any, tuple[bytes, tuple]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"MergeCache(entries={len(self._entries)}, "
+            f"max_entries={self.max_entries}, size_bytes={self.size_bytes}, "
+            f"max_bytes={self.max_bytes}, hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions})"
+        )
+
+    def clear(self) -> None:
+        """Remove every stored result. The counters are kept."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def get_or_merge(
+        self, owner: object, merge: Callable[..., Any], *inputs: Any
+    ) -> Any:
+        """Return the stored result for `inputs`, or compute and store it.
+
+        Used by `MergePlan` and `ListMergePlan`. `owner` is part of the key, so
+        plans sharing a cache never see each other's results.
+
+        Args:
+            owner (object): The plan doing the merge
+            merge (Callable[..., Any]): Function computing the result from `inputs`
+            *inputs (Any): The inputs of the merge
+
+        Returns:
+            Any: A private copy of the merge result
+        """
+        import pickle  # noqa: PLC0415 - Only load pickle once a cache is used
+
+        key = self._key(owner, inputs)
+        if key is None:
+            self.misses += 1
+            return merge(*inputs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pickle.loads(entry[0])
+        self.misses += 1
+        result = merge(*inputs)
+        try:
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return result
+        self._store(key, data, inputs if self.identity else ())
+        return pickle.loads(data)
+
+    def _key(self, owner: object, inputs: tuple) -> tuple | None:
+        if self.identity:
+            return (owner, *map(id, inputs))
+        import pickle  # noqa: PLC0415 - Only load pickle once a cache is used
+        from hashlib import blake2b  # noqa: PLC0415 - Only load hashlib when hashing
+
+        try:
+            data = pickle.dumps(inputs, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return None
+        return (owner, blake2b(data, digest_size=16).digest())
+
+    def _store(self, key: tuple, data: bytes, pinned: tuple) -> None:
+        # In identity mode the inputs are kept alive with the entry, so their ids
+        # cannot be reused by other objects while it exists.
+        size = len(data)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (data, pinned)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
@@ -0,0 +1,222 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TextIO, get_args
+
+from fuso.dicts import MergePlan
+from fuso.streams import iter_merge_list_of_dicts_by_key
+from fuso.utils import Ordering
+
+_JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+def read_jsonl(path: str | Path) -> Iterator[Any]:
+    """Yield the values of a JSON Lines file one line at a time.
+
+    The file is memory-mapped and parsed line by line, so only the current line is
+    held in memory no matter how large the file is. Blank lines are skipped.
+
+    Args:
+        path (str | Path): Path of the file
+
+    Returns:
+        Iterator[Any]: The value of every line
+
+    Raises:
+        ValueError: If a line is not valid JSON. The message names the file and line.
+    """
+    with open(path, "rb") as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            return
+        with mapped:
+            for number, line in enumerate(iter(mapped.readline, b""), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{number}: {e.msg}") from None
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the `fuso` command line.
+
+    `fuso base.json override.json -o merged.json` deep merges JSON objects, applying
+    the files in order. JSON Lines files (`.jsonl`, `.ndjson`) contribute one layer
+    per line. The layers are merged into one result in place, and the result is
+    written in chunks instead of being serialized into one string first.
+
+    `fuso users.jsonl changes.jsonl --key id --default-key default` merges lists of
+    objects by key, like `iter_merge_list_of_dicts_by_key`. JSON Lines inputs are
+    streamed: the first file is read one line at a time, every later file is
+    indexed in memory, and merged items are written as they are produced, in the
+    order of the first file followed by new items. With `--presorted` every input
+    must be sorted by the key and all of them are streamed. JSON inputs must hold
+    an array and are loaded whole.
+
+    With `--output`, the result is written to a temporary file next to it, which
+    replaces the output file only once the merge succeeded. A failed run leaves an
+    existing output file untouched, and the output may be one of the inputs.
+
+    Args:
+        argv (Sequence[str] | None): Arguments, `sys.argv[1:]` by default
+
+    Returns:
+        int: Exit status, `1` if an input could not be read or merged
+    """
+    parser = argparse.ArgumentParser(
+        prog="fuso", description="Merge JSON and JSON Lines files."
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="files to merge, in order")
+    parser.add_argument(
+        "--output", "-o", type=Path, help="write to a file instead of stdout"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        help="output format (default: jsonl for keyed merges of JSON Lines files, "
+        "json otherwise)",
+    )
+    parser.add_argument("--key", help="merge lists of objects by this field")
+    parser.add_argument(
+        "--default-key", help="key value of the item applied to every item"
+    )
+    parser.add_argument(
+        "--presorted",
+        action="store_true",
+        help="stream all inputs, which must be sorted by --key",
+    )
+    parser.add_argument(
+        "--ordering",
+        choices=get_args(Ordering),
+        default="sorted",
+        help="key order of the merged object when merging objects (default: sorted)",
+    )
+    parser.add_argument("--indent", type=int, help="indent JSON output")
+    args = parser.parse_args(argv)
+    if args.key is None and (args.default_key is not None or args.presorted):
+        parser.error("--default-key and --presorted require --key")
+    output_format = args.format or (
+        "jsonl" if args.key is not None and _is_jsonl(args.files[0]) else "json"
+    )
+    try:
+        with _open_output(args.output) as output:
+            if args.key is None:
+                result = _merge_documents(args.files, args.ordering)
+                _write_json(result, output, args.indent)
+            else:
+                rows = _merge_rows(args)
+                _write_rows(rows, output, output_format, args.indent)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        message = e.args[0] if isinstance(e, KeyError) and e.args else e
+        sys.stderr.write(f"fuso: error: {message}\n")
+        return 1
+    return 0
+
+
+def _is_jsonl(path: Path) -> bool:
+    return path.suffix.lower() in _JSONL_SUFFIXES
+
+
+@contextmanager
+def _open_output(path: Path | None) -> Iterator[TextIO]:
+    """Yield stdout, or a temporary file that replaces `path` if no error occurs."""
+    if path is None:
+        yield sys.stdout
+        return
+    descriptor, temporary = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with open(descriptor, "w", encoding="utf-8") as output:
+            yield output
+        os.chmod(temporary, _output_mode(path))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _output_mode(path: Path) -> int:
+    """Keep the permissions of an existing output, `mkstemp` only grants the owner."""
+    try:
+        return path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _merge_documents(paths: list[Path], ordering: Ordering) -> dict:
+    """Merge every object of `paths` into one result, one layer at a time."""
+    plan = MergePlan(ordering=ordering, inplace=True)
+    result: dict = {}
+    for path in paths:
+        for document in _read_documents(path):
+            if not isinstance(document, dict):
+                raise TypeError(f"{path}: expected a JSON object")
+            result = plan(result, document)
+    return result
+
+
+def _read_documents(path: Path) -> Iterable[Any]:
+    if _is_jsonl(path):
+        return read_jsonl(path)
+    with open(path, "rb") as file:
+        return [json.load(file)]
+
+
+def _read_rows(path: Path) -> Iterable[Any]:
+    if _is_jsonl(path):
+        return read_jsonl(path)
+    with open(path, "rb") as file:
+        rows = json.load(file)
+    if not isinstance(rows, list):
+        raise TypeError(f"{path}: expected a JSON array")
+    return rows
+
+
+def _merge_rows(args: argparse.Namespace) -> Iterator[dict]:
+    rows: Iterable[dict] = _read_rows(args.files[0])
+    for path in args.files[1:]:
+        rows = iter_merge_list_of_dicts_by_key(
+            rows,
+            _read_rows(path),
+            key=args.key,
+            default_key=args.default_key,
+            presorted=args.presorted,
+        )
+    return iter(rows)
+
+
+def _write_json(value: Any, output: TextIO, indent: int | None) -> None:
+    for chunk in json.JSONEncoder(indent=indent).iterencode(value):
+        output.write(chunk)
+    output.write("\n")
+
+
+def _write_rows(
+    rows: Iterator[dict], output: TextIO, output_format: str, indent: int | None
+) -> None:
+    encoder = json.JSONEncoder(indent=indent if output_format == "json" else None)
+    if output_format == "jsonl":
+        for row in rows:
+            output.write(encoder.encode(row))
+            output.write("\n")
+        return
+    output.write("[")
+    separator = "\n"
+    for row in rows:
+        output.write(separator)
+        output.write(encoder.encode(row))
+        separator = ",\n"
+    output.write("\n]\n")
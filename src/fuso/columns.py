@@ -0,0 +1,330 @@
+from array import array
+from collections.abc import Callable, Hashable, Sequence
+from itertools import chain, repeat
+from typing import Any, Literal
+
+from fuso.dicts import _SCALAR_TYPES, MergePlan
+from fuso.selectors import SELECTOR_PREFIX, is_selector
+from fuso.utils import (
+    ListKey,
+    Ordering,
+    _check_ordering,
+    _index_rows,
+    _key_fields,
+    _key_ranks,
+    _sort_by_rank,
+    _sorted_key_values,
+    _type_mismatch,
+)
+
+
+class _Missing:
+    """Marks a field that is not set in a row."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+_EMPTY: dict = {}
+_NULL_TYPES = frozenset({type(None), _Missing})
+_COLUMN_TYPES = _SCALAR_TYPES | _NULL_TYPES
+_COLUMN_TYPECODES = {int: "q", float: "d"}
+
+
+def merge_list_of_dicts_by_key_columnar(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    values: list[dict],
+    updates: list[dict],
+    key: ListKey,
+    default_key: Hashable | None = None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    object_key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+    schema: Sequence[str] | None = None,
+    output: Literal["rows", "columns"] = "rows",
+) -> list[dict] | dict[str, list | array]:
+    """Merge two lists of dictionaries by a specified key, one field at a time.
+
+    The result equals `merge_list_of_dicts_by_key`, but the rows are split into one
+    column per field and every field whose values are all scalars (strings, numbers,
+    booleans or `None`) is merged for all items in a single pass over its columns.
+    Only fields holding dictionaries or lists, and fields addressed by
+    `merge_functions`, are merged row by row with a `MergePlan`. Rows that share a
+    schema of mostly scalar fields merge several times faster than with
+    `merge_list_of_dicts_by_key`, which merges and sorts a dictionary per item.
+
+    The fields of the rows are detected from the inputs unless `schema` is given.
+    Rows may leave out fields, which are then left out of the merged item. With
+    `ordering="insertion"` the fields of every item follow the schema rather than
+    the item's own rows.
+
+    With `output="columns"` the result is a dictionary mapping every field,
+    including the fields of `key`, to its merged values in the order of the items.
+    Fields missing from an item are `None` there. Columns of plain integers or
+    floats are `array.array`s, every other column is a list.
+
+    Args:
+        values (list[dict]): List of original dictionaries
+        updates (list[dict]): List of dictionaries with updates
+        key (ListKey): Field, tuple of fields or callable to merge by
+        default_key (Hashable | None): Key value of the default update. Not supported
+            with a callable `key`.
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
+            by
+        ordering (Ordering): How to order the result, see `merge_list_of_dicts_by_key`
+        schema (Sequence[str] | None): Fields of the rows, without the fields of
+            `key`. Detected from the inputs if `None`.
+        output (Literal["rows", "columns"]): Return a list of dictionaries, or a
+            dictionary of columns
+
+    Returns:
+        list[dict] | dict[str, list | array]: Merged list of dictionaries, or its
+            columns
+
+    Raises:
+        ValueError: If `ordering` or `output` is unknown, if `default_key` is combined
+            with a callable `key`, or if a row has a field outside of `schema`.
+        KeyError: If `key` is missing in an item or if duplicate key values are found.
+        TypeError: If a field has values of different types.
+
+    Example:
+        ```py
+        values = [
+            {"id": 1, "name": "Alice", "age": 30, "tags": ["user"]},
+            {"id": 2, "name": "Bob", "age": 25, "tags": ["admin"]},
+        ]
+        updates = [
+            {"id": 1, "age": 31, "tags": ["editor"]},
+            {"id": 3, "name": "Charlie"},
+        ]
+        merged = merge_list_of_dicts_by_key_columnar(values, updates, key="id")
+        assert merged == [
+            {"id": 1, "name": "Alice", "age": 31, "tags": ["user", "editor"]},
+            {"id": 2, "name": "Bob", "age": 25, "tags": ["admin"]},
+            {"id": 3, "name": "Charlie"},
+        ]
+        columns = merge_list_of_dicts_by_key_columnar(
+            values, updates, key="id", output="columns"
+        )
+        assert list(columns["id"]) == [1, 2, 3]
+        assert columns["name"] == ["Alice", "Bob", "Charlie"]
+        assert columns["age"] == [31, 25, None]
+        ```
+    """
+    _check_ordering(ordering)
+    if output not in ("rows", "columns"):
+        raise ValueError(f"Unknown output '{output}'. Expected one of: rows, columns")
+    if default_key is not None and callable(key):
+        raise ValueError("default_key requires a field or a tuple of fields as key")
+    rows = _index_rows(values or [], key)
+    update_rows = _index_rows(updates or [], key, kind="update")
+    default_row = (
+        update_rows.pop(default_key, None) if default_key is not None else None
+    )
+    key_fields = _key_fields(key)
+    if ordering == "sorted":
+        all_keys = _sorted_key_values(rows.keys() | update_rows.keys(), key)
+    else:
+        all_keys = list(rows)
+        all_keys.extend(k for k in update_rows if k not in rows)
+    value_rows = list(map(rows.get, all_keys, repeat(_EMPTY)))
+    update_rows_in_order = list(map(update_rows.get, all_keys, repeat(_EMPTY)))
+    default_row = default_row or _EMPTY
+    fields = _fields(schema, rows, update_rows, default_row, key_fields)
+    if schema is not None:
+        _check_schema(fields, value_rows, update_rows_in_order, default_row, key_fields)
+    if ordering == "sorted":
+        fields = list(
+            _sort_by_rank(
+                dict.fromkeys(fields), _key_ranks(tuple(object_key_order or ()))
+            )
+        )
+    row_wise = _row_wise_fields(fields, merge_functions)
+    columns = {}
+    nested_columns = {}
+    for field in fields:
+        value_column = _column(value_rows, field)
+        update_column = _column(update_rows_in_order, field)
+        default = default_row.get(field, _MISSING)
+        types = set(map(type, value_column))
+        types.update(map(type, update_column))
+        types.add(type(default))
+        if field not in row_wise and types <= _COLUMN_TYPES:
+            mixed = len(types - _NULL_TYPES) > 1
+            columns[field] = _merge_column(value_column, update_column, default, mixed)
+        else:
+            nested_columns[field] = (value_column, update_column, default)
+            columns[field] = None
+    if nested_columns:
+        plan = MergePlan(merge_functions=merge_functions, ordering="none")
+        columns.update(_merge_rows(plan, nested_columns, update_rows_in_order))
+    columns.update(_key_columns(key, all_keys))
+    if output == "columns":
+        return {field: _finish_column(column) for field, column in columns.items()}
+    return _to_rows(columns)
+
+
+def _fields(
+    schema: Sequence[str] | None,
+    rows: dict,
+    update_rows: dict,
+    default_row: dict,
+    key_fields: tuple,
+) -> list:
+    """Return the fields of the rows in order of first appearance, without the key."""
+    if schema is not None:
+        return [field for field in schema if field not in key_fields]
+    fields = dict.fromkeys(
+        chain(
+            chain.from_iterable(rows.values()),
+            chain.from_iterable(update_rows.values()),
+            default_row,
+        )
+    )
+    for field in key_fields:
+        fields.pop(field, None)
+    return list(fields)
+
+
+def _check_schema(
+    fields: list,
+    value_rows: list[dict],
+    update_rows: list[dict],
+    default_row: dict,
+    key_fields: tuple,
+) -> None:
+    """Raise `ValueError` if a row has a field that is not in `fields`."""
+    known = set(fields).union(key_fields)
+    for row in chain(value_rows, update_rows, (default_row,)):
+        if len(row) > len(known) or not known.issuperset(row):
+            extra = ", ".join(map(str, (field for field in row if field not in known)))
+            raise ValueError(f"Fields outside of the schema: {extra}")
+
+
+def _column(rows: list[dict], field: Hashable) -> list:
+    # `dict.get` is called from C, which is about twice as fast as a comprehension.
+    return list(map(dict.get, rows, repeat(field), repeat(_MISSING)))
+
+
+def _row_wise_fields(
+    fields: list, merge_functions: dict[str, Callable[[Any, Any], Any]] | None
+) -> set:
+    """Return the fields that `merge_functions` apply to, which are merged per row."""
+    result = set()
+    for selector in merge_functions or ():
+        if not is_selector(selector):
+            result.add(selector)
+            continue
+        head = selector[len(SELECTOR_PREFIX) :].split(".", 1)[0]
+        if "*" in head:
+            return set(fields)
+        result.add(head)
+    return result
+
+
+def _merge_column(
+    value_column: list, update_column: list, default: Any, mixed: bool
+) -> list:
+    """Merge a column of scalars with the default and the update of every item.
+
+    Values are only compared type by type when the columns are `mixed`, that is when
+    they hold more than one type besides `None`.
+    """
+    if default is None:
+        update_column = [
+            None if update is _MISSING else update for update in update_column
+        ]
+    elif default is not _MISSING:
+        if mixed:
+            _check_types([default] * len(update_column), update_column)
+        update_column = [
+            default if update is None or update is _MISSING else update
+            for update in update_column
+        ]
+    if mixed:
+        _check_types(value_column, update_column)
+    return [
+        update
+        if value is _MISSING or (update is not None and update is not _MISSING)
+        else value
+        for value, update in zip(value_column, update_column)
+    ]
+
+
+def _check_types(value_column: list, update_column: list) -> None:
+    """Raise the `TypeError` of `merge_dict` if two values of an item differ in type."""
+    for value, update in zip(value_column, update_column):
+        if (
+            type(value) is not type(update)
+            and type(value) not in _NULL_TYPES
+            and type(update) not in _NULL_TYPES
+        ):
+            raise _type_mismatch(value, update)
+
+
+def _merge_rows(plan: MergePlan, nested_columns: dict, update_rows: list) -> dict:
+    """Merge the fields of `nested_columns` item by item with `plan`."""
+    fields = list(nested_columns)
+    value_columns, update_columns, defaults = zip(*nested_columns.values())
+    default = {
+        field: value for field, value in zip(fields, defaults) if value is not _MISSING
+    }
+    merged = []
+    for row, values, updates in zip(
+        update_rows, zip(*value_columns), zip(*update_columns)
+    ):
+        original = {
+            field: value
+            for field, value in zip(fields, values)
+            if value is not _MISSING
+        }
+        update = (
+            None
+            if row is _EMPTY
+            else {
+                field: value
+                for field, value in zip(fields, updates)
+                if value is not _MISSING
+            }
+        )
+        merged.append(plan.merge_with_defaults(original, default, update))
+    return {field: [item.get(field, _MISSING) for item in merged] for field in fields}
+
+
+def _key_columns(key: ListKey, all_keys: list) -> dict:
+    if isinstance(key, str):
+        return {key: list(all_keys)}
+    if callable(key):
+        return {}
+    if not all_keys:
+        return {field: [] for field in key}
+    return dict(zip(key, map(list, zip(*all_keys))))
+
+
+def _to_rows(columns: dict) -> list[dict]:
+    names = list(columns)
+    if not any(_MISSING in column for column in columns.values()):
+        return list(map(dict, map(zip, repeat(names), zip(*columns.values()))))
+    return [
+        {name: value for name, value in zip(names, values) if value is not _MISSING}
+        for values in zip(*columns.values())
+    ]
+
+
+def _finish_column(column: list) -> list | array:
+    """Replace missing values by `None` and store plain numbers in an `array`."""
+    if _MISSING in column:
+        return [None if value is _MISSING else value for value in column]
+    types = set(map(type, column))
+    if len(types) == 1:
+        typecode = _COLUMN_TYPECODES.get(types.pop())
+        if typecode is not None:
+            try:
+                return array(typecode, column)
+            except OverflowError:
+                pass
+    return column
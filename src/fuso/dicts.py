@@ -1,15 +1,52 @@
-from collections.abc import Callable
-from typing import Any
+from collections.abc import (
+    Callable,
+    Container,
+    Hashable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from functools import lru_cache, partial
+from itertools import chain
+from time import perf_counter
+from typing import Any, Literal, get_args
 
-from fuso.utils import sort_dict
+from fuso.cache import MergeCache
+from fuso.selectors import SelectorState, compile_selectors, is_selector
+from fuso.stats import MergeStats
+from fuso.strategies import StrategyRegistry
+from fuso.utils import (
+    ListKey,
+    Ordering,
+    _check_ordering,
+    _key_ranks,
+    _missing_key,
+    _sort_by_rank,
+    _type_mismatch,
+)
 
+MergeEngine = Literal["iterative", "recursive"]
+"""Engine used for deep merges.
 
-def merge_dict(
+- `"iterative"`: walk nested dictionaries with an explicit stack. It has no depth
+    limit and is the default.
+- `"recursive"`: recurse once per nesting level. Bounded by Python's recursion limit.
+"""
+
+
+def merge_dict(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
     original: dict | None,
     updates: dict | None,
     merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
     post_processor: Callable[[dict], dict] | None = None,
     key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+    engine: MergeEngine = "iterative",
+    inplace: bool = False,
+    copy_on_write: bool = False,
+    stats: MergeStats | None = None,
+    strategies: StrategyRegistry | None = None,
+    list_keys: dict[str, ListKey] | None = None,
 ) -> dict:
     """Merge two dictionaries.
 
@@ -17,9 +54,31 @@ def merge_dict(
         original (dict): Original dictionary
         updates (dict): Dictionary with updates
         merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
-            Dictionary of functions to use for merging specific keys
+            Dictionary of functions to use for merging specific keys. Keys can also
+            be path selectors such as `"$.spec.containers"`, `"$.*.tags"` or
+            `"$.**.labels"`, which apply wherever both sides have a dictionary at the
+            parent path, see `fuso.selectors.is_selector`.
         post_processor (callable | None): Function to process the result after merging
         key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        ordering (Ordering): How to order the keys of the result. `"sorted"` sorts
+            them by `key_order`, `"insertion"` keeps the keys of `original` first,
+            followed by new keys from `updates`, and `"none"` skips ordering entirely.
+        engine (MergeEngine): Engine used for nested values. Both engines produce the
+            same result, but `"iterative"` is not limited by the recursion limit.
+        inplace (bool): Apply the updates directly to `original` instead of building a
+            new dictionary, see `merge_into`
+        copy_on_write (bool): Only rebuild the dictionaries on paths that the updates
+            actually change and reuse everything else from the inputs by reference.
+            When nothing changes and the result does not need sorting or
+            post-processing, `original` itself is returned. The result shares
+            structure with the inputs, so treat it as read-only.
+        stats (MergeStats | None): Collect statistics about the merge, see
+            `MergeStats`
+        strategies (StrategyRegistry | None): Merge nested values by type with these
+            strategies instead of the engine, see `StrategyRegistry`
+        list_keys (dict[str, ListKey] | None): Merge the lists of dictionaries at
+            these top-level keys or path selectors by key instead of concatenating
+            them, see `MergePlan`
 
     Returns:
         dict: Merged dictionary
@@ -50,25 +109,554 @@ def merge_dict(
         }
         ```
     """
-    if merge_functions is None:
-        merge_functions = {}
-    original = original or {}
-    updates = updates or {}
-    result = {}
-    all_keys = set(original.keys()).union(updates.keys())
-    for key in all_keys:
-        original_value = original.get(key)
-        update_value = updates.get(key)
-        merge_function = merge_functions.get(key)
-        if merge_function:
-            result[key] = merge_function(original_value, update_value)
-        elif update_value is None:
-            result[key] = original_value
+    if (
+        not (merge_functions or list_keys)
+        and post_processor is None
+        and stats is None
+        and strategies is None
+    ):
+        plan = _plain_plan(
+            ordering, engine, tuple(key_order or ()), inplace, copy_on_write
+        )
+        return plan(original, updates)
+    return MergePlan(
+        merge_functions=merge_functions,
+        key_order=key_order,
+        post_processor=post_processor,
+        ordering=ordering,
+        engine=engine,
+        inplace=inplace,
+        copy_on_write=copy_on_write,
+        stats=stats,
+        strategies=strategies,
+        list_keys=list_keys,
+    )(original, updates)
+
+
+@lru_cache(maxsize=256)
+def _plain_plan(
+    ordering: Ordering,
+    engine: MergeEngine,
+    key_order: tuple,
+    inplace: bool,
+    copy_on_write: bool,
+) -> "MergePlan":
+    """Return a shared plan for `merge_dict` calls without functions or hooks.
+
+    Such plans hold no per-call state, so validating and compiling them once per
+    configuration keeps one-off calls as cheap as calling a plan.
+    """
+    return MergePlan(
+        key_order=list(key_order),
+        ordering=ordering,
+        engine=engine,
+        inplace=inplace,
+        copy_on_write=copy_on_write,
+    )
+
+
+def merge_many(
+    original: dict | None,
+    *updates: dict | None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    post_processor: Callable[[dict], dict] | None = None,
+    key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+) -> dict:
+    """Merge any number of dictionaries in a single traversal.
+
+    The result equals folding `merge_dict` over the layers, except that
+    `post_processor` runs once on the final result. Every key is visited once, list
+    values from all layers are concatenated in a single allocation and the result is
+    sorted only once.
+
+    Args:
+        original (dict | None): Original dictionary
+        *updates (dict | None): Dictionaries with updates, applied in order
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys. They are
+            applied layer by layer, exactly as when folding `merge_dict`.
+        post_processor (callable | None): Function to process the result after merging
+        key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        ordering (Ordering): How to order the keys of the result, see `merge_dict`
+
+    Returns:
+        dict: Merged dictionary
+
+    Example:
+        ```py
+        base = {"tags": ["base"], "db": {"host": "localhost", "port": 5432}}
+        env = {"tags": ["prod"], "db": {"host": "db.internal"}}
+        tenant = {"tags": ["acme"], "db": {"port": 6432}}
+        assert merge_many(base, env, tenant) == {
+            "db": {"host": "db.internal", "port": 6432},
+            "tags": ["base", "prod", "acme"],
+        }
+        ```
+    """
+    if not merge_functions and post_processor is None:
+        plan = _plain_plan(ordering, "iterative", tuple(key_order or ()), False, False)
+        return plan.merge_many(original, *updates)
+    return MergePlan(
+        merge_functions=merge_functions,
+        key_order=key_order,
+        post_processor=post_processor,
+        ordering=ordering,
+    ).merge_many(original, *updates)
+
+
+def merge_into(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    target: dict,
+    updates: dict | None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    post_processor: Callable[[dict], dict] | None = None,
+    key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+) -> dict:
+    """Merge `updates` into `target` in place.
+
+    Follows the same rules as `merge_dict`, but nested dictionaries of `target` are
+    updated rather than rebuilt and its lists are extended in place, so the work done
+    is proportional to the size of `updates`. Values taken from `updates` are copied
+    before they are stored, so later merges into `target` never modify `updates`.
+
+    If a `TypeError` is raised, `target` may already be partially updated.
+
+    Args:
+        target (dict): Dictionary to update
+        updates (dict): Dictionary with updates
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        post_processor (callable | None): Function to process the result after merging
+        key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        ordering (Ordering): How to order the keys of the result, see `merge_dict`.
+            Sorting reorders `target` in place.
+
+    Returns:
+        dict: `target` after applying the updates, or the result of `post_processor`
+
+    Example:
+        ```py
+        accumulator = {"tags": ["user"], "profile": {"name": "Alice"}}
+        tags = accumulator["tags"]
+        merge_into(accumulator, {"tags": ["editor"], "profile": {"age": 30}})
+        assert accumulator == {
+            "profile": {"name": "Alice", "age": 30},
+            "tags": ["user", "editor"],
+        }
+        assert accumulator["tags"] is tags
+        ```
+    """
+    return MergePlan(
+        merge_functions=merge_functions,
+        key_order=key_order,
+        post_processor=post_processor,
+        ordering=ordering,
+        inplace=True,
+    )(target, updates)
+
+
+class MergePlan:
+    """A compiled, reusable dictionary merge.
+
+    The plan normalizes its configuration once, so calling it only performs the
+    merge itself. Strategy lookups happen in a precomputed table, `key_order` is
+    turned into a rank table, and plans without `merge_functions` or without a
+    `post_processor` use code paths that skip those steps entirely. Path selectors
+    in `merge_functions` are compiled into a trie, so finding the function for a
+    nested key is a dictionary lookup no matter how many selectors there are.
+
+    `list_keys` merges lists of dictionaries by key inside the merge, wherever a
+    path matches, instead of concatenating them. Items with the same key are merged
+    in place, new items are appended in order. Fields of the items continue the
+    path, so `"$.spec.containers.env"` addresses the `env` list of every container.
+    Each list is indexed once per merge, and `merge_many` reuses the index of a
+    merged list for the next layer.
+
+    Args:
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        post_processor (callable | None): Function to process the result after merging
+        ordering (Ordering): How to order the keys of the result, see `merge_dict`
+        engine (MergeEngine): Engine used for nested values, see `merge_dict`
+        inplace (bool): Merge into the original dictionary, see `merge_into`
+        copy_on_write (bool): Share unchanged subtrees with the inputs, see
+            `merge_dict`
+        stats (MergeStats | None): Collect statistics about every merge, see
+            `MergeStats`
+        cache (MergeCache | None): Return stored results for inputs the plan has
+            already merged, see `MergeCache`. Only calls of the plan are cached.
+        strategies (StrategyRegistry | None): Merge nested values by type with these
+            strategies instead of the engine, see `StrategyRegistry`
+        list_keys (dict[str, ListKey] | None): Keys to merge lists of dictionaries
+            by, by top-level key or path selector, see `fuso.utils.ListKey`
+
+    Raises:
+        ValueError: If `ordering` or `engine` is unknown, if `inplace` or
+            `copy_on_write` is combined with the recursive engine, if both are
+            enabled, if either is combined with `stats`, if `inplace` is combined
+            with `cache`, if path selectors or `list_keys` are combined with
+            `inplace`, `copy_on_write` or `stats`, or if `strategies` is combined with
+            `inplace` or `copy_on_write`.
+
+    Example:
+        ```py
+        plan = MergePlan(merge_functions={"age": max}, key_order=["name"])
+        assert plan({"name": "Alice", "age": 30}, {"age": 25}) == {
+            "name": "Alice",
+            "age": 30,
+        }
+        assert "age -> max" in plan.explain()
+        plan = MergePlan(list_keys={"$.spec.containers": "name"})
+        merged = plan(
+            {"spec": {"containers": [{"name": "app", "image": "app:1"}]}},
+            {"spec": {"containers": [{"name": "app", "image": "app:2"}]}},
+        )
+        assert merged == {"spec": {"containers": [{"name": "app", "image": "app:2"}]}}
+        ```
+    """
+
+    def __init__(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+        self,
+        merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+        key_order: list[str] | None = None,
+        post_processor: Callable[[dict], dict] | None = None,
+        ordering: Ordering = "sorted",
+        engine: MergeEngine = "iterative",
+        inplace: bool = False,
+        copy_on_write: bool = False,
+        stats: MergeStats | None = None,
+        cache: MergeCache | None = None,
+        strategies: StrategyRegistry | None = None,
+        list_keys: dict[str, ListKey] | None = None,
+    ) -> None:
+        _check_ordering(ordering)
+        _check_plan_options(
+            engine,
+            inplace=inplace,
+            copy_on_write=copy_on_write,
+            stats=stats,
+            cache=cache,
+            strategies=strategies,
+        )
+        self.merge_functions = dict(merge_functions or {})
+        # Keys mapped to a falsy value have no function and are deep merged.
+        self._function_keys = frozenset(
+            key for key, function in self.merge_functions.items() if function
+        )
+        self.key_order = tuple(key_order or ())
+        self.post_processor = post_processor
+        self.ordering = ordering
+        self.engine = engine
+        self.inplace = inplace
+        self.copy_on_write = copy_on_write
+        self.stats = stats
+        self.cache = cache
+        self.strategies = strategies
+        self.list_keys = dict(list_keys or {})
+        self._plain = not (inplace or copy_on_write or stats is not None)
+        self._selectors = self._list_selectors = None
+        if self.list_keys or any(map(is_selector, self.merge_functions)):
+            if not self._plain:
+                raise ValueError(
+                    "Path selectors and list keys are not supported for "
+                    "in-place, copy-on-write or instrumented merges"
+                )
+            self._selectors = compile_selectors(self.merge_functions, self.list_keys)
+            self._list_selectors = compile_selectors({}, self.list_keys)
+        self._layered = self._plain and self._selectors is None and strategies is None
+        self._sorted = ordering == "sorted"
+        if strategies is not None:
+            self._merge_value = strategies.merge
+        elif copy_on_write:
+            self._merge_value = _merge_copy_on_write
         else:
-            result[key] = _merge(original_value, update_value)
-    if post_processor:
-        result = post_processor(result)
-    return sort_dict(result, key_order=key_order)
+            self._merge_value = _ENGINES[engine]
+        self._key_ranks = _key_ranks(self.key_order)
+        self._merge_keys = self._select_merge_keys()
+        if stats is not None:
+            self._finish = self._finish_with_stats
+
+    def _select_merge_keys(self) -> Callable[[dict, dict], dict]:
+        if self.stats is not None:
+            return self._merge_with_stats
+        if self._selectors is not None:
+            return self._merge_with_selectors
+        if self.inplace and self.merge_functions:
+            return self._merge_into_with_functions
+        if self.inplace:
+            return self._merge_into_without_functions
+        if self.merge_functions:
+            return self._merge_with_functions
+        return (
+            _merge_dicts_copy_on_write
+            if self.copy_on_write
+            else self._merge_without_functions
+        )
+
+    def __call__(self, original: dict | None, updates: dict | None) -> dict:
+        if self.cache is not None:
+            return self.cache.get_or_merge(self, self._merge, original, updates)
+        return self._merge(original, updates)
+
+    def _merge(self, original: dict | None, updates: dict | None) -> dict:
+        result = self._merge_keys({} if original is None else original, updates or {})
+        return self._finish(result)
+
+    def merge_many(self, original: dict | None, *updates: dict | None) -> dict:
+        """Merge any number of layers in a single traversal.
+
+        The result equals folding the plan over the layers, but every key is visited
+        once, list values from all layers are concatenated in one allocation and the
+        result is post-processed and sorted only once. In-place plans and plans
+        collecting `stats` apply the layers to `original` one after another.
+
+        Args:
+            original (dict | None): Original dictionary
+            *updates (dict | None): Dictionaries with updates, applied in order
+
+        Returns:
+            dict: Merged dictionary
+        """
+        if not self._layered:
+            result = {} if original is None else original
+            merge_keys = self._merge_keys
+            if self._selectors is not None:
+                merge_keys = partial(self._merge_with_selectors, indexes={})
+            for update in updates:
+                result = merge_keys(result, update or {})
+            return self._finish(result)
+        if not updates:
+            return self._merge(original, None)
+        layers = [original or {}, *(update or {} for update in updates)]
+        merge_functions = self.merge_functions
+        result = _merge_many(layers, skip=self._function_keys)
+        for key, merge_function in merge_functions.items():
+            if merge_function and key in result:
+                result[key] = _fold_merge_function(merge_function, key, layers)
+        return self._finish(result)
+
+    def merge_with_defaults(
+        self, original: dict | None, defaults: dict, updates: dict | None = None
+    ) -> dict:
+        """Merge `defaults` and `updates` into `original` without combining them first.
+
+        The result equals `plan(original, merge_dict(defaults, updates))`, where
+        `merge_functions` see the combined value of `defaults` and `updates`, but the
+        intermediate dictionary is never built. Without `updates`, `defaults` is
+        applied as a template: its keys are copied in one step and only the keys it
+        shares with `original` are merged one by one, which is cheap when `defaults`
+        is much larger than the overlap.
+
+        Args:
+            original (dict | None): Original dictionary
+            defaults (dict): Updates applied before `updates`
+            updates (dict | None): Dictionary with updates
+
+        Returns:
+            dict: Merged dictionary
+
+        Example:
+            ```py
+            plan = MergePlan(ordering="insertion")
+            defaults = {"env": "prod", "tags": ["a"]}
+            merged = plan.merge_with_defaults({"id": 1}, defaults, {"tags": ["b"]})
+            assert merged == {
+                "id": 1,
+                "env": "prod",
+                "tags": ["a", "b"],
+            }
+            ```
+        """
+        original = {} if original is None else original
+        if not defaults or not self._layered:
+            if updates and defaults and self._list_selectors is not None:
+                updates = _merge_selected(
+                    defaults, updates, self._list_selectors, self._merge_value
+                )
+            elif updates and defaults:
+                updates = self._merge_without_functions(defaults, updates)
+            return self._merge(original, updates or defaults)
+        if not updates:
+            return self._finish(self._apply_template(original, defaults))
+        merge_functions = self.merge_functions
+        result = _merge_many([original, defaults, updates], skip=self._function_keys)
+        merge_value = self._merge_value
+        for key, merge_function in merge_functions.items():
+            if merge_function and key in result:
+                update_value = updates.get(key)
+                if update_value is None:
+                    update_value = defaults.get(key)
+                elif defaults.get(key) is not None:
+                    update_value = merge_value(defaults[key], update_value)
+                result[key] = merge_function(original.get(key), update_value)
+        return self._finish(result)
+
+    def _apply_template(self, original: dict, template: dict) -> dict:
+        merge_functions = self.merge_functions
+        merge_value = self._merge_value
+        result = dict(original)
+        result.update(template)
+        for key in original.keys() & template.keys():
+            if merge_functions.get(key):
+                continue
+            original_value = original[key]
+            update_value = template[key]
+            if update_value is None:
+                result[key] = original_value
+            elif original_value is not None:
+                result[key] = merge_value(original_value, update_value)
+        for key, merge_function in merge_functions.items():
+            if merge_function and (key in original or key in template):
+                result[key] = merge_function(original.get(key), template.get(key))
+        return result
+
+    def _finish(self, result: dict) -> dict:
+        if self.post_processor is not None:
+            result = self.post_processor(result)
+        if not self._sorted:
+            return result
+        ordered = _sort_by_rank(result, self._key_ranks)
+        if not self.inplace:
+            return ordered
+        result.clear()
+        result.update(ordered)
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"MergePlan(merge_functions={sorted(self.merge_functions)!r}, "
+            f"key_order={list(self.key_order)!r}, "
+            f"post_processor={self.post_processor!r}, "
+            f"ordering={self.ordering!r}, "
+            f"engine={self.engine!r}, "
+            f"inplace={self.inplace!r}, "
+            f"copy_on_write={self.copy_on_write!r})"
+        )
+
+    def explain(self) -> str:
+        """Describe what the plan compiled.
+
+        Returns:
+            str: Human readable description of the plan
+        """
+        functions = ", ".join(
+            f"{key} -> {getattr(function, '__qualname__', repr(function))}"
+            for key, function in self.merge_functions.items()
+        )
+        list_keys = ", ".join(
+            f"{path} by {getattr(key, '__qualname__', repr(key))}"
+            for path, key in self.list_keys.items()
+        )
+        return "\n".join(
+            [
+                "MergePlan",
+                f"  merge path: {self._merge_keys.__name__.lstrip('_')}",
+                f"  engine: {self.engine}",
+                f"  copy on write: {self.copy_on_write}",
+                f"  strategies: {self.strategies or '(none)'}",
+                f"  list keys: {list_keys or '(none)'}",
+                f"  merge functions: {functions or '(none)'}",
+                f"  ordering: {self.ordering}",
+                f"  key order: {', '.join(map(str, self.key_order)) or '(sorted)'}",
+                f"  post processor: {self.post_processor or '(none)'}",
+            ]
+        )
+
+    def _merge_without_functions(self, original: dict, updates: dict) -> dict:
+        merge_value = self._merge_value
+        result = dict(original)
+        for key, update_value in updates.items():
+            if update_value is None:
+                result.setdefault(key, None)
+            else:
+                result[key] = merge_value(original.get(key), update_value)
+        return result
+
+    def _merge_with_functions(self, original: dict, updates: dict) -> dict:
+        merge_functions = self.merge_functions
+        merge_value = self._merge_value
+        keys = list(original)
+        keys.extend(key for key in updates if key not in original)
+        result = {}
+        for key in keys:
+            original_value = original.get(key)
+            update_value = updates.get(key)
+            merge_function = merge_functions.get(key)
+            if merge_function:
+                result[key] = merge_function(original_value, update_value)
+            elif update_value is None:
+                result[key] = original_value
+            else:
+                result[key] = merge_value(original_value, update_value)
+        return result
+
+    def _merge_with_stats(self, original: dict, updates: dict) -> dict:
+        stats = self.stats
+        merge_functions = self.merge_functions
+        merge_value = self._merge_value
+        key_time = stats.key_time
+        keys = list(original)
+        keys.extend(key for key in updates if key not in original)
+        result = {}
+        merge_time = 0.0
+        for key in keys:
+            start = perf_counter()
+            original_value = original.get(key)
+            update_value = updates.get(key)
+            merge_function = merge_functions.get(key)
+            if merge_function:
+                result[key] = merge_function(original_value, update_value)
+            elif update_value is None:
+                result[key] = original_value
+            else:
+                result[key] = merge_value(original_value, update_value)
+            elapsed = perf_counter() - start
+            merge_time += elapsed
+            key_time[key] += elapsed
+            if merge_function:
+                stats.merge_function_calls[key] += 1
+                stats.merge_function_time[key] += elapsed
+            else:
+                stats._count(original_value, update_value)
+        stats.merges += 1
+        stats.merge_time += merge_time
+        return result
+
+    def _finish_with_stats(self, result: dict) -> dict:
+        if self.post_processor is not None:
+            result = self.post_processor(result)
+        if not self._sorted:
+            return result
+        start = perf_counter()
+        ordered = _sort_by_rank(result, self._key_ranks)
+        self.stats.sorts += 1
+        self.stats.sort_time += perf_counter() - start
+        return ordered
+
+    def _merge_with_selectors(
+        self, original: dict, updates: dict, indexes: dict | None = None
+    ) -> dict:
+        return _merge_selected(
+            original, updates, self._selectors, self._merge_value, indexes
+        )
+
+    def _merge_into_without_functions(self, original: dict, updates: dict) -> dict:
+        return _merge_into(original, updates.items())
+
+    def _merge_into_with_functions(self, original: dict, updates: dict) -> dict:
+        merge_functions = self.merge_functions
+        for key, update_value in updates.items():
+            merge_function = merge_functions.get(key)
+            if merge_function:
+                original[key] = merge_function(original.get(key), update_value)
+            else:
+                _merge_into(original, ((key, update_value),))
+        for key, merge_function in merge_functions.items():
+            if merge_function and key in original and key not in updates:
+                original[key] = merge_function(original[key], None)
+        return original
 
 
 def _merge(
@@ -76,9 +664,7 @@ def _merge(
     update: list | dict | str | int | float | None,
 ) -> list | dict | str | int | float | None:
     if value is not None and update is not None and type(value) is not type(update):
-        raise TypeError(
-            f"Cannot merge different types: {type(value)} and {type(update)}"
-        )
+        raise _type_mismatch(value, update)
     if value is None:
         return update
     elif update is None:
@@ -86,9 +672,430 @@ def _merge(
     elif isinstance(value, list) and isinstance(update, list):
         return value + update
     elif isinstance(value, dict) and isinstance(update, dict):
-        result = {}
-        all_keys = set(value.keys()).union(update.keys())
-        for key in all_keys:
-            result[key] = _merge(value.get(key), update.get(key))
+        result = dict(value)
+        for key, update_value in update.items():
+            result[key] = _merge(value.get(key), update_value)
         return result
     return update
+
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, bytes, complex})
+
+
+def _merge_iterative(
+    value: list | dict | str | int | float | None,
+    update: list | dict | str | int | float | None,
+) -> list | dict | str | int | float | None:
+    """Merge like `_merge`, but walk nested dictionaries with an explicit stack.
+
+    Every nested dictionary is copied into its parent before it is visited, so the
+    stack only needs to remember where to resume in each parent.
+    """
+    if not isinstance(value, dict) or type(value) is not type(update):
+        return _merge(value, update)
+    root = result = dict(value)
+    items = iter(update.items())
+    stack = []
+    scalar_types = _SCALAR_TYPES
+    while True:
+        for key, update_value in items:
+            if update_value is None:
+                if key not in result:
+                    result[key] = None
+                continue
+            original_value = value.get(key)
+            if original_value is None:
+                result[key] = update_value
+                continue
+            value_type = type(original_value)
+            if value_type is not type(update_value):
+                raise _type_mismatch(original_value, update_value)
+            if value_type is dict or (
+                value_type not in scalar_types and isinstance(original_value, dict)
+            ):
+                child = dict(original_value)
+                result[key] = child
+                stack.append((value, items, result))
+                value, items, result = original_value, iter(update_value.items()), child
+                break
+            if value_type is list or (
+                value_type not in scalar_types and isinstance(original_value, list)
+            ):
+                result[key] = original_value + update_value
+            else:
+                result[key] = update_value
+        else:
+            if not stack:
+                return root
+            value, items, result = stack.pop()
+
+
+def _merge_copy_on_write(
+    value: list | dict | str | int | float | None,
+    update: list | dict | str | int | float | None,
+) -> list | dict | str | int | float | None:
+    """Merge like `_merge_iterative`, but return inputs that the merge leaves as-is."""
+    if isinstance(value, dict) and type(value) is type(update):
+        return _merge_dicts_copy_on_write(value, update)
+    if isinstance(value, list) and type(value) is type(update) and not update:
+        return value
+    return _merge(value, update)
+
+
+def _merge_dicts_copy_on_write(value: dict, update: dict) -> dict:  # noqa: PLR0912 - The merge loop is kept flat to avoid call overhead
+    """Merge two dictionaries, copying only the dictionaries that change.
+
+    Nested dictionaries are visited depth first with an explicit stack. A dictionary
+    is copied the first time one of its values changes, and a changed child is
+    written into its parent when the child is finished. Dictionaries without any
+    changes are returned as they are.
+    """
+    items = iter(update.items())
+    result = None
+    stack = []
+    scalar_types = _SCALAR_TYPES
+    while True:
+        for key, update_value in items:
+            if update_value is None:
+                if key not in value:
+                    if result is None:
+                        result = dict(value)
+                    result[key] = None
+                continue
+            original_value = value.get(key)
+            if original_value is None:
+                merged = update_value
+            else:
+                value_type = type(original_value)
+                if value_type is not type(update_value):
+                    raise _type_mismatch(original_value, update_value)
+                if value_type is dict or (
+                    value_type not in scalar_types and isinstance(original_value, dict)
+                ):
+                    stack.append((value, items, result, key))
+                    value, items, result = (
+                        original_value,
+                        iter(update_value.items()),
+                        None,
+                    )
+                    break
+                if value_type is list or (
+                    value_type not in scalar_types and isinstance(original_value, list)
+                ):
+                    merged = (
+                        original_value + update_value
+                        if update_value
+                        else original_value
+                    )
+                else:
+                    merged = update_value
+            if merged is not original_value:
+                if result is None:
+                    result = dict(value)
+                result[key] = merged
+        else:
+            merged = value if result is None else result
+            if not stack:
+                return merged
+            value, items, result, key = stack.pop()
+            if merged is not value[key]:
+                if result is None:
+                    result = dict(value)
+                result[key] = merged
+
+
+def _merge_many(layers: list[dict], skip: Container = ()) -> dict:
+    """Merge all `layers` in one traversal, like folding `_merge_iterative`.
+
+    Keys in `skip` are only placed in the top-level result; their values are left
+    for the caller to compute.
+    """
+    root, groups = _group_layers(layers, skip)
+    stack = [(root, iter(groups.items()))]
+    scalar_types = _SCALAR_TYPES
+    while stack:
+        result, items = stack[-1]
+        for key, values in items:
+            first = values[0]
+            value_type = type(first)
+            for value in values:
+                if type(value) is not value_type:
+                    raise _type_mismatch(first, value)
+            if value_type is dict or (
+                value_type not in scalar_types and isinstance(first, dict)
+            ):
+                child, child_groups = _group_layers(values)
+                result[key] = child
+                if child_groups:
+                    stack.append((child, iter(child_groups.items())))
+                    break
+            elif value_type is list or (
+                value_type not in scalar_types and isinstance(first, list)
+            ):
+                result[key] = list(chain.from_iterable(values))
+            else:
+                result[key] = values[-1]
+        else:
+            stack.pop()
+    return root
+
+
+def _group_layers(layers: list[dict], skip: Container = ()) -> tuple[dict, dict]:
+    """Place every key of `layers` in a result and group values that need merging.
+
+    Keys with a single non-`None` value get their final value right away. Keys with
+    several hold the first value as a placeholder and are returned in the groups,
+    mapped to all their non-`None` values in layer order.
+    """
+    result = dict(layers[0])
+    groups: dict[Any, list] = {}
+    for layer in layers[1:]:
+        for key, value in layer.items():
+            if value is None:
+                if key not in result:
+                    result[key] = None
+                continue
+            current = result.get(key)
+            if current is None:
+                result[key] = value
+            elif key not in skip:
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [current, value]
+                else:
+                    group.append(value)
+    return result, groups
+
+
+def _fold_merge_function(
+    merge_function: Callable[[Any, Any], Any], key: Any, layers: Sequence[Mapping]
+) -> Any:
+    """Apply `merge_function` to `key` layer by layer, as a fold of merges would.
+
+    A fold calls the function for every layer from the first one that contains `key`.
+    """
+    original, *updates = layers
+    present = key in original
+    value = original.get(key)
+    for update in updates:
+        if present or key in update:
+            value = merge_function(value, update.get(key))
+            present = True
+    return value
+
+
+def _merge_into(target: dict, items: Iterable[tuple[Any, Any]]) -> dict:
+    """Apply `items` from an update to `target` in place.
+
+    Nested dictionaries of `target` are walked with an explicit stack and updated
+    directly, and its lists are extended. Values that only exist in the update are
+    stored as copies made by `_copy_tree`.
+    """
+    root = target
+    items = iter(items)
+    stack = []
+    scalar_types = _SCALAR_TYPES
+    while True:
+        for key, update_value in items:
+            if update_value is None:
+                if key not in target:
+                    target[key] = None
+                continue
+            target_value = target.get(key)
+            if target_value is None:
+                target[key] = _copy_tree(update_value)
+                continue
+            value_type = type(target_value)
+            if value_type is not type(update_value):
+                raise _type_mismatch(target_value, update_value)
+            if value_type is dict or (
+                value_type not in scalar_types and isinstance(target_value, dict)
+            ):
+                stack.append((target, items))
+                target, items = target_value, iter(update_value.items())
+                break
+            if value_type is list or (
+                value_type not in scalar_types and isinstance(target_value, list)
+            ):
+                target_value.extend(update_value)
+            else:
+                target[key] = update_value
+        else:
+            if not stack:
+                return root
+            target, items = stack.pop()
+
+
+def _copy_tree(value: Any) -> Any:
+    """Copy the dictionaries and lists that a merge could later modify in place."""
+    if isinstance(value, list):
+        return value.copy()
+    if not isinstance(value, dict):
+        return value
+    root = value.copy()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for key, child in node.items():
+            if isinstance(child, dict):
+                node[key] = copied = child.copy()
+                stack.append(copied)
+            elif isinstance(child, list):
+                node[key] = child.copy()
+    return root
+
+
+def _merge_selected(
+    original: dict,
+    updates: dict,
+    selectors: SelectorState,
+    merge_value: Callable[[Any, Any], Any],
+    indexes: dict | None = None,
+) -> dict:
+    """Merge with the functions and list keys of a selector trie.
+
+    `indexes` maps the ids of merged keyed lists to their lists and indexes, so a
+    fold over several layers does not index the same list again.
+    """
+    root: dict = {}
+    stack = [(original, updates, selectors, root)]
+    while stack:
+        original, updates, state, result = stack.pop()
+        keys = list(original)
+        keys.extend(key for key in updates if key not in original)
+        for key in keys:
+            original_value = original.get(key)
+            update_value = updates.get(key)
+            child = state.step(key)
+            if child is not None and child.function:
+                result[key] = child.function(original_value, update_value)
+            elif update_value is None:
+                result[key] = original_value
+            elif (
+                child is not None
+                and child.get_key is not None
+                and isinstance(update_value, list)
+                and isinstance(original_value, list)
+            ):
+                result[key] = _merge_keyed_list(
+                    original_value,
+                    update_value,
+                    child,
+                    merge_value,
+                    indexes=indexes,
+                    stack=stack,
+                )
+            elif (
+                child is not None
+                and child.live
+                and isinstance(update_value, dict)
+                and type(original_value) is type(update_value)
+            ):
+                result[key] = nested = {}
+                stack.append((original_value, update_value, child, nested))
+            else:
+                result[key] = merge_value(original_value, update_value)
+    return root
+
+
+def _merge_keyed_list(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    original: list,
+    updates: list,
+    state: SelectorState,
+    merge_value: Callable[[Any, Any], Any],
+    *,
+    indexes: dict | None,
+    stack: list,
+) -> list:
+    """Merge two lists of dictionaries by the list key of `state`.
+
+    Items with the same key are merged in place, either right away or, if
+    selectors apply below the list, by pushing them onto `stack`.
+    """
+    get_key = state.get_key
+    entry = None if indexes is None else indexes.pop(id(original), None)
+    if entry is not None and entry[0] is original:
+        index = entry[1]
+    else:
+        index = _index_positions(original, get_key, state.list_key, "value")
+    items = list(original)
+    seen = set()
+    for update in updates:
+        value_key = _item_key(update, get_key, "update")
+        if value_key in seen:
+            raise KeyError(
+                f"Duplicate key '{value_key}' found for lookup key '{state.list_key}'"
+            )
+        seen.add(value_key)
+        position = index.get(value_key)
+        if position is None:
+            index[value_key] = len(items)
+            items.append(update)
+        elif state.live:
+            value = items[position]
+            items[position] = merged = {}
+            stack.append((value, update, state, merged))
+        else:
+            items[position] = merge_value(items[position], update)
+    if indexes is not None:
+        indexes[id(items)] = (items, index)
+    return items
+
+
+def _index_positions(
+    items: list, get_key: Callable[[dict], Hashable], list_key: ListKey, kind: str
+) -> dict:
+    index: dict = {}
+    for position, item in enumerate(items):
+        value_key = _item_key(item, get_key, kind)
+        if value_key in index:
+            raise KeyError(
+                f"Duplicate key '{value_key}' found for lookup key '{list_key}'"
+            )
+        index[value_key] = position
+    return index
+
+
+def _item_key(item: dict, get_key: Callable[[dict], Hashable], kind: str) -> Hashable:
+    try:
+        return get_key(item)
+    except KeyError as e:
+        raise _missing_key(item, e.args[0], kind) from None
+
+
+def _check_plan_options(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    engine: MergeEngine,
+    *,
+    inplace: bool,
+    copy_on_write: bool,
+    stats: MergeStats | None,
+    cache: MergeCache | None,
+    strategies: StrategyRegistry | None,
+) -> None:
+    if engine not in _ENGINES:
+        raise ValueError(
+            f"Unknown engine '{engine}'. "
+            f"Expected one of: {', '.join(get_args(MergeEngine))}"
+        )
+    if inplace and engine != "iterative":
+        raise ValueError("In-place merges require the iterative engine")
+    if copy_on_write and engine != "iterative":
+        raise ValueError("Copy-on-write merges require the iterative engine")
+    if inplace and copy_on_write:
+        raise ValueError("A merge cannot be both in place and copy-on-write")
+    if stats is not None and (inplace or copy_on_write):
+        raise ValueError(
+            "Merge statistics are not supported for in-place or copy-on-write merges"
+        )
+    if cache is not None and inplace:
+        raise ValueError("In-place merges cannot be cached")
+    if strategies is not None and (inplace or copy_on_write):
+        raise ValueError(
+            "Type strategies are not supported for in-place or copy-on-write merges"
+        )
+
+
+_ENGINES = {
+    "iterative": _merge_iterative,
+    "recursive": _merge,
+}
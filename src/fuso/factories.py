@@ -1,25 +1,54 @@
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from typing import Any
 
-from fuso.dicts import merge_dict
-from fuso.lists import merge_list_of_dicts_by_key
+from fuso.cache import MergeCache
+from fuso.dicts import MergeEngine, MergePlan
+from fuso.lists import ListMergePlan
+from fuso.stats import MergeStats
+from fuso.strategies import StrategyRegistry
+from fuso.utils import ListKey, Ordering
 
 
-def create_merge_factory(
+def create_merge_factory(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
     merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
     key_order: list[str] | None = None,
     post_processor: Callable[[dict], dict] | None = None,
-) -> Callable[[dict, dict], dict]:
+    ordering: Ordering = "sorted",
+    engine: MergeEngine = "iterative",
+    inplace: bool = False,
+    copy_on_write: bool = False,
+    stats: MergeStats | None = None,
+    cache: MergeCache | None = None,
+    strategies: StrategyRegistry | None = None,
+    list_keys: dict[str, ListKey] | None = None,
+) -> MergePlan:
     """Create a merge function that merges arbitrarily nested dictionaries.
 
+    The configuration is compiled once into a `MergePlan`, so repeated calls only pay
+    for the merge itself. Use `MergePlan.explain()` to inspect what was compiled, and
+    `MergePlan.merge_many()` to merge any number of layers in one pass.
+
     Args:
         merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
             Dictionary of functions to use for merging specific keys
         key_order (list[str] | None): List of keys to determine the order of merging.
         post_processor (callable | None): Function to process the result after merging
+        ordering (Ordering): How to order the keys of the result, see `merge_dict`
+        engine (MergeEngine): Engine used for nested values, see `merge_dict`
+        inplace (bool): Merge into the first argument, see `merge_into`
+        copy_on_write (bool): Share unchanged subtrees with the inputs, see
+            `merge_dict`
+        stats (MergeStats | None): Collect statistics about every merge, see
+            `MergeStats`
+        cache (MergeCache | None): Return stored results for inputs that were
+            already merged, see `MergeCache`
+        strategies (StrategyRegistry | None): Merge nested values by type with these
+            strategies, see `StrategyRegistry`
+        list_keys (dict[str, ListKey] | None): Merge the lists of dictionaries at
+            these top-level keys or path selectors by key, see `MergePlan`
 
     Returns:
-        Callable: Function that merges two arbitrarily nested dictionaries.
+        MergePlan: Callable that merges two arbitrarily nested dictionaries.
 
     Example:
         ```py
@@ -46,37 +75,61 @@ def create_merge_factory(
         }
         ```
     """
-
-    def factory(values, updates):
-        return merge_dict(
-            values,
-            updates,
-            merge_functions=merge_functions,
-            key_order=key_order,
-            post_processor=post_processor,
-        )
-
-    return factory
+    return MergePlan(
+        merge_functions=merge_functions,
+        key_order=key_order,
+        post_processor=post_processor,
+        ordering=ordering,
+        engine=engine,
+        inplace=inplace,
+        copy_on_write=copy_on_write,
+        stats=stats,
+        cache=cache,
+        strategies=strategies,
+        list_keys=list_keys,
+    )
 
 
-def create_merge_list_of_dicts_by_key_factory(
-    key: str,
-    default_key: str | None = None,
+def create_merge_list_of_dicts_by_key_factory(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    key: ListKey,
+    default_key: Hashable | None = None,
     merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
     object_key_order: list[str] | None = None,
-) -> Callable[[list[dict], list[dict]], list[dict]]:
+    ordering: Ordering = "sorted",
+    workers: int | None = None,
+    chunk_size: int = 10_000,
+    stats: MergeStats | None = None,
+    cache: MergeCache | None = None,
+    columnar: bool = False,
+) -> ListMergePlan:
     """Create a merge function that merges two lists of dictionaries by a specified key.
 
+    The returned `ListMergePlan` also offers `merge_many` to merge any number of lists
+    in one pass.
+
     Args:
-        key (str): Key to use for merging
-        default_key (str | None): Key to use for default updates
+        key (ListKey): Field, tuple of fields or callable to merge by, see
+            `merge_list_of_dicts_by_key`
+        default_key (Hashable | None): Key value of the default update
         merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
             Dictionary of functions to use for merging specific keys
         object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
             by
+        ordering (Ordering): How to order the result, see
+            `merge_list_of_dicts_by_key`
+        workers (int | None): Merge in a process pool with this many workers, see
+            `fuso.parallel.merge_list_of_dicts_by_key_sharded`
+        chunk_size (int): Approximate number of items per shard when `workers` is set
+        stats (MergeStats | None): Collect statistics about every merge, see
+            `MergeStats`
+        cache (MergeCache | None): Return stored results for inputs that were
+            already merged, see `MergeCache`
+        columnar (bool): Merge one field at a time, see
+            `fuso.columns.merge_list_of_dicts_by_key_columnar`
 
     Returns:
-        Callable: Function that merges two lists of dictionaries by a specified key.
+        ListMergePlan: Callable that merges two lists of dictionaries by a specified
+            key.
 
     Example:
         ```py
@@ -97,15 +150,15 @@ def create_merge_list_of_dicts_by_key_factory(
         ]
         ```
     """
-
-    def factory(values, updates):
-        return merge_list_of_dicts_by_key(
-            values=values,
-            updates=updates,
-            key=key,
-            default_key=default_key,
-            merge_functions=merge_functions,
-            object_key_order=object_key_order,
-        )
-
-    return factory
+    return ListMergePlan(
+        key=key,
+        default_key=default_key,
+        merge_functions=merge_functions,
+        object_key_order=object_key_order,
+        ordering=ordering,
+        workers=workers,
+        chunk_size=chunk_size,
+        stats=stats,
+        cache=cache,
+        columnar=columnar,
+    )
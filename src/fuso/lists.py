@@ -1,33 +1,74 @@
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
+from time import perf_counter
 from typing import Any
 
-from fuso.dicts import merge_dict
-from fuso.utils import sort_list_of_dicts_by_key, to_list_of_dicts_by_key
+from fuso.cache import MergeCache
+from fuso.dicts import MergePlan, merge_dict
+from fuso.stats import MergeStats
+from fuso.utils import (
+    ListKey,
+    Ordering,
+    _check_ordering,
+    _index_rows,
+    _key_fields,
+    _restore_key,
+    _sorted_key_values,
+    _without_key,
+    to_list_of_dicts_by_key,
+)
 
 
 def merge_list_of_dicts_by_key(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
     values: list[dict],
     updates: list[dict],
-    key: str,
-    default_key: str | None = None,
+    key: ListKey,
+    default_key: Hashable | None = None,
     merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
     object_key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+    stats: MergeStats | None = None,
 ) -> list[dict]:
     """Merge two lists of dictionaries by a specified key.
 
+    The `default_key` update is applied to every item. It is combined with each
+    item's own update without being copied or re-sorted per item, and items without
+    an update of their own get it applied as a template.
+
+    Items are identified by `key`: a field, a tuple of fields such as
+    `("region", "account", "id")` or a callable, see `ListKey`. The key value of every
+    row is extracted once. The fields of the key are not merged and are set from the
+    key value on every merged item; with a callable every field is merged.
+
+    Both lists are indexed by `key` without copying their rows; a row is only copied
+    when it is merged. With `ordering="insertion"` or `"none"`, and without
+    `default_key` updates, `merge_functions` or `stats`, items found in only one list
+    are returned as they are, without any copy. They share the input's dictionary,
+    so copy the result before modifying it if the input must stay unchanged.
+
     Args:
         values (list[dict]): List of original dictionaries
         updates (list[dict]): List of dictionaries with updates
-        key (str): Key to use for merging
-        default_key (str | None): Key to use for default updates
+        key (ListKey): Field, tuple of fields or callable to merge by
+        default_key (Hashable | None): Key value of the default update. Not supported
+            with a callable `key`.
         merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
             Dictionary of functions to use for merging specific keys
         object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
             by
+        ordering (Ordering): How to order the result. `"sorted"` sorts items by `key`
+            and their keys by `object_key_order`, `"insertion"` keeps the order of
+            `values` followed by new items from `updates`, and `"none"` skips
+            ordering entirely.
+        stats (MergeStats | None): Collect statistics about the merge of every item
+            and the final sort, see `MergeStats`
 
     Returns:
         list[dict]: Merged list of dictionaries
 
+    Raises:
+        ValueError: If `ordering` is not a known ordering policy, or if `default_key`
+            is combined with a callable `key`.
+
     Example:
         ```py
         values = [
@@ -44,33 +85,303 @@ def merge_list_of_dicts_by_key(  # noqa: PLR0913 - Too many arguments, but they
             {"id": 2, "name": "Bob", "tags": ["admin"]},
             {"id": 3, "name": "Charlie", "tags": ["user"]},
         ]
+        merged = merge_list_of_dicts_by_key(
+            [{"region": "eu", "id": 1, "plan": "free"}],
+            [{"region": "eu", "id": 1, "plan": "pro"}, {"region": "us", "id": 1}],
+            key=("region", "id"),
+        )
+        assert merged == [
+            {"region": "eu", "id": 1, "plan": "pro"},
+            {"region": "us", "id": 1},
+        ]
         ```
     """
-    if merge_functions is None:
-        merge_functions = {}
-    dict_values = to_list_of_dicts_by_key(values or [], key=key)
-    try:
-        dict_updates = to_list_of_dicts_by_key(updates or [], key=key)
-    except KeyError as e:
-        raise KeyError(
-            f"Key '{key}' not found in update. Available keys: "
-            f"{', '.join(updates[0].keys())}"
-        ) from e
-    if default_key is not None:
-        default_updates = dict_updates.pop(default_key, {})
+    _check_ordering(ordering)
+    _check_key(key, default_key)
+    rows = _index_rows(values or [], key)
+    update_rows = _index_rows(updates or [], key, kind="update")
+    default_row = (
+        update_rows.pop(default_key, None) if default_key is not None else None
+    )
+    fields = _key_fields(key)
+    default_updates = _without_key(default_row, fields) if default_row else {}
+    if ordering == "insertion":
+        all_keys = list(rows)
+        all_keys.extend(k for k in update_rows if k not in rows)
     else:
-        default_updates = {}
+        all_keys = rows.keys() | update_rows.keys()
+    if ordering == "sorted":
+        start = perf_counter()
+        all_keys = _sorted_key_values(all_keys, key)
+        if stats is not None:
+            stats.sorts += 1
+            stats.sort_time += perf_counter() - start
+    plan = MergePlan(
+        merge_functions=merge_functions,
+        key_order=object_key_order,
+        ordering=ordering,
+        stats=stats,
+    )
+    # Without defaults or merge functions an item found in one list is already
+    # merged, and unless it has to be sorted it is returned as it is.
+    pass_through = not (
+        default_updates or merge_functions or stats is not None or ordering == "sorted"
+    )
     result = []
-    all_keys = set(dict_values.keys()).union(dict_updates.keys())
     for value_key in all_keys:
-        value = dict_values.get(value_key, {})
-        specific_update = dict_updates.get(value_key, {})
-        merged = merge_dict(
-            original=value,
-            updates=merge_dict(original=default_updates, updates=specific_update),
-            merge_functions=merge_functions,
-            key_order=object_key_order,
+        row = rows.get(value_key)
+        update = update_rows.get(value_key)
+        if pass_through and (row is None or update is None):
+            result.append(update if row is None else row)
+            continue
+        merged = plan.merge_with_defaults(
+            {} if row is None else _without_key(row, fields),
+            default_updates,
+            None if update is None else _without_key(update, fields),
         )
-        merged[key] = value_key
+        _restore_key(merged, key, value_key)
         result.append(merged)
-    return sort_list_of_dicts_by_key(result, key=key)
+    return result
+
+
+def merge_many_list_of_dicts_by_key(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    values: list[dict],
+    *updates: list[dict],
+    key: ListKey,
+    default_key: Hashable | None = None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    object_key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+) -> list[dict]:
+    """Merge any number of lists of dictionaries by a specified key in one pass.
+
+    The result equals folding `merge_list_of_dicts_by_key` over the update lists. Each
+    item collects its contribution from every layer (including that layer's
+    `default_key` update) and is then merged once with `merge_many`, and the result
+    is sorted only once.
+
+    Args:
+        values (list[dict]): List of original dictionaries
+        *updates (list[dict]): Lists of dictionaries with updates, applied in order
+        key (ListKey): Field, tuple of fields or callable to merge by
+        default_key (Hashable | None): Key value of the default update. Not supported
+            with a callable `key`.
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
+            by
+        ordering (Ordering): How to order the result, see `merge_list_of_dicts_by_key`
+
+    Returns:
+        list[dict]: Merged list of dictionaries
+
+    Raises:
+        ValueError: If `ordering` is not a known ordering policy, or if `default_key`
+            is combined with a callable `key`.
+
+    Example:
+        ```py
+        base = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["b"]}]
+        env = [{"id": "default", "env": "prod"}, {"id": 1, "tags": ["c"]}]
+        tenant = [{"id": 3, "tags": ["d"]}]
+        merged = merge_many_list_of_dicts_by_key(
+            base, env, tenant, key="id", default_key="default"
+        )
+        assert merged == [
+            {"id": 1, "env": "prod", "tags": ["a", "c"]},
+            {"id": 2, "env": "prod", "tags": ["b"]},
+            {"id": 3, "tags": ["d"]},
+        ]
+        ```
+    """
+    _check_key(key, default_key)
+    plan = MergePlan(
+        merge_functions=merge_functions, key_order=object_key_order, ordering=ordering
+    )
+    rows = {
+        value_key: [value]
+        for value_key, value in to_list_of_dicts_by_key(values or [], key=key).items()
+    }
+    for update in updates:
+        dict_updates = _index_updates(update, key)
+        if default_key is not None:
+            default_updates = dict_updates.pop(default_key, {})
+        else:
+            default_updates = {}
+        for value_key in dict_updates:
+            if value_key not in rows:
+                rows[value_key] = [{}]
+        for value_key, layers in rows.items():
+            specific_update = dict_updates.get(value_key)
+            if specific_update and default_updates:
+                layers.append(
+                    merge_dict(default_updates, specific_update, ordering="insertion")
+                )
+            elif specific_update or default_updates or plan.merge_functions:
+                layers.append(specific_update or default_updates)
+    result = []
+    all_keys = _sorted_key_values(rows, key) if ordering == "sorted" else rows
+    for value_key in all_keys:
+        merged = plan.merge_many(*rows[value_key])
+        _restore_key(merged, key, value_key)
+        result.append(merged)
+    return result
+
+
+class ListMergePlan:
+    """A reusable merge of lists of dictionaries by a specified key.
+
+    Returned by `create_merge_list_of_dicts_by_key_factory`. Calling the plan merges
+    two lists with `merge_list_of_dicts_by_key`, and `merge_many` merges any number
+    of lists with `merge_many_list_of_dicts_by_key`.
+
+    Args:
+        key (ListKey): Field, tuple of fields or callable to merge by
+        default_key (Hashable | None): Key value of the default update. Not supported
+            with a callable `key`.
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
+            by
+        ordering (Ordering): How to order the result, see `merge_list_of_dicts_by_key`
+        workers (int | None): Merge two lists in a process pool with this many workers,
+            see `fuso.parallel.merge_list_of_dicts_by_key_sharded`
+        chunk_size (int): Approximate number of items per shard when `workers` is set
+        stats (MergeStats | None): Collect statistics about two-list merges, see
+            `MergeStats`. Not supported together with `workers`.
+        cache (MergeCache | None): Return stored results for lists the plan has
+            already merged, see `MergeCache`. Only calls of the plan are cached.
+        columnar (bool): Merge two lists one field at a time, see
+            `fuso.columns.merge_list_of_dicts_by_key_columnar`. Not supported
+            together with `workers` or `stats`.
+
+    Raises:
+        ValueError: If `ordering` is not a known ordering policy, if `stats` is
+            combined with `workers`, if `columnar` is combined with `workers` or
+            `stats`, if `default_key` is combined with a callable
+            `key`, or if `workers` is combined with a `key` that is not a single
+            field.
+    """
+
+    def __init__(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+        self,
+        key: ListKey,
+        default_key: Hashable | None = None,
+        merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+        object_key_order: list[str] | None = None,
+        ordering: Ordering = "sorted",
+        workers: int | None = None,
+        chunk_size: int = 10_000,
+        stats: MergeStats | None = None,
+        cache: MergeCache | None = None,
+        columnar: bool = False,
+    ) -> None:
+        _check_ordering(ordering)
+        _check_key(key, default_key)
+        if workers is not None and not isinstance(key, str):
+            raise ValueError("Parallel merges require a single field as key")
+        if stats is not None and workers is not None:
+            raise ValueError(
+                "Merge statistics are not collected across worker processes"
+            )
+        if columnar and (workers is not None or stats is not None):
+            raise ValueError("Columnar merges do not support workers or stats")
+        self.key = key
+        self.default_key = default_key
+        self.merge_functions = merge_functions
+        self.object_key_order = object_key_order
+        self.ordering = ordering
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.stats = stats
+        self.cache = cache
+        self.columnar = columnar
+
+    def __call__(self, values: list[dict], updates: list[dict]) -> list[dict]:
+        if self.cache is not None:
+            return self.cache.get_or_merge(self, self._merge, values, updates)
+        return self._merge(values, updates)
+
+    def _merge(self, values: list[dict], updates: list[dict]) -> list[dict]:
+        if self.workers is not None:
+            from fuso.parallel import (  # noqa: PLC0415 - Only load the process pool when it is used
+                merge_list_of_dicts_by_key_sharded,
+            )
+
+            return merge_list_of_dicts_by_key_sharded(
+                values,
+                updates,
+                key=self.key,
+                default_key=self.default_key,
+                merge_functions=self.merge_functions,
+                object_key_order=self.object_key_order,
+                ordering=self.ordering,
+                workers=self.workers,
+                chunk_size=self.chunk_size,
+            )
+        if self.columnar:
+            from fuso.columns import (  # noqa: PLC0415 - Only load the columnar engine when it is used
+                merge_list_of_dicts_by_key_columnar,
+            )
+
+            return merge_list_of_dicts_by_key_columnar(
+                values,
+                updates,
+                key=self.key,
+                default_key=self.default_key,
+                merge_functions=self.merge_functions,
+                object_key_order=self.object_key_order,
+                ordering=self.ordering,
+            )
+        return merge_list_of_dicts_by_key(
+            values=values,
+            updates=updates,
+            key=self.key,
+            default_key=self.default_key,
+            merge_functions=self.merge_functions,
+            object_key_order=self.object_key_order,
+            ordering=self.ordering,
+            stats=self.stats,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ListMergePlan(key={self.key!r}, default_key={self.default_key!r}, "
+            f"merge_functions={sorted(self.merge_functions or {})!r}, "
+            f"object_key_order={self.object_key_order!r}, "
+            f"ordering={self.ordering!r}, workers={self.workers!r}, "
+            f"columnar={self.columnar!r})"
+        )
+
+    def merge_many(self, values: list[dict], *updates: list[dict]) -> list[dict]:
+        """Merge any number of lists in one pass.
+
+        Args:
+            values (list[dict]): List of original dictionaries
+            *updates (list[dict]): Lists of dictionaries with updates, applied in order
+
+        Returns:
+            list[dict]: Merged list of dictionaries
+        """
+        return merge_many_list_of_dicts_by_key(
+            values,
+            *updates,
+            key=self.key,
+            default_key=self.default_key,
+            merge_functions=self.merge_functions,
+            object_key_order=self.object_key_order,
+            ordering=self.ordering,
+        )
+
+
+def _check_key(key: ListKey, default_key: Hashable | None) -> None:
+    if default_key is not None and callable(key):
+        raise ValueError("default_key requires a field or a tuple of fields as key")
+
+
+def _index_updates(updates: list[dict], key: ListKey) -> dict:
+    fields = _key_fields(key)
+    return {
+        value_key: _without_key(update, fields)
+        for value_key, update in _index_rows(updates or [], key, kind="update").items()
+    }
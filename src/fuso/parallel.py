@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Any
+
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.utils import Ordering, _key_of, sort_list_of_dicts_by_key
+
+
+def merge_list_of_dicts_by_key_sharded(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    values: list[dict],
+    updates: list[dict],
+    key: str,
+    default_key: str | None = None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    object_key_order: list[str] | None = None,
+    ordering: Ordering = "sorted",
+    workers: int = 2,
+    chunk_size: int = 10_000,
+) -> list[dict]:
+    """Merge two lists of dictionaries by a specified key in a process pool.
+
+    `values` and `updates` are hash-partitioned by `key` into shards of roughly
+    `chunk_size` items, so every item and its update land in the same shard. The
+    `default_key` update is sent to every shard. Each shard is merged with
+    `merge_list_of_dicts_by_key` in a `concurrent.futures.ProcessPoolExecutor`, and
+    the results are put back together in the requested order. Inputs that fit in a
+    single shard are merged in the current process.
+
+    Everything sent to the workers, including `merge_functions`, must be picklable,
+    so use module-level functions rather than lambdas.
+
+    Args:
+        values (list[dict]): List of original dictionaries
+        updates (list[dict]): List of dictionaries with updates
+        key (str): Key to use for merging
+        default_key (str | None): Key to use for default updates
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
+            by
+        ordering (Ordering): How to order the result, see `merge_list_of_dicts_by_key`
+        workers (int): Number of worker processes
+        chunk_size (int): Approximate number of items per shard
+
+    Returns:
+        list[dict]: Merged list of dictionaries
+
+    Raises:
+        ValueError: If `workers` or `chunk_size` is smaller than 1.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    values = values or []
+    updates = updates or []
+    item_count = len(values) + len(updates)
+    if workers == 1 or item_count <= chunk_size:
+        return merge_list_of_dicts_by_key(
+            values,
+            updates,
+            key=key,
+            default_key=default_key,
+            merge_functions=merge_functions,
+            object_key_order=object_key_order,
+            ordering=ordering,
+        )
+    shard_count = max(workers, -(-item_count // chunk_size))
+    positions: dict = {}
+    track_positions = ordering == "insertion"
+    shard_values: list[list[dict]] = [[] for _ in range(shard_count)]
+    shard_updates: list[list[dict]] = [[] for _ in range(shard_count)]
+    default_updates = []
+    for value in values:
+        value_key = _key_of(value, key, "value")
+        if track_positions:
+            positions.setdefault(value_key, len(positions))
+        shard_values[hash(value_key) % shard_count].append(value)
+    for update in updates:
+        value_key = _key_of(update, key, "update")
+        if default_key is not None and value_key == default_key:
+            default_updates.append(update)
+            continue
+        if track_positions:
+            positions.setdefault(value_key, len(positions))
+        shard_updates[hash(value_key) % shard_count].append(update)
+    merge_shard = partial(
+        merge_list_of_dicts_by_key,
+        key=key,
+        default_key=default_key,
+        merge_functions=merge_functions,
+        object_key_order=object_key_order,
+        # Shards order the keys of their items, the items are ordered below.
+        ordering=ordering,
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(merge_shard, shard_value, shard_update + default_updates)
+            for shard_value, shard_update in zip(shard_values, shard_updates)
+            if shard_value or shard_update
+        ]
+        merged = list(chain.from_iterable(future.result() for future in futures))
+    if ordering == "sorted":
+        return sort_list_of_dicts_by_key(merged, key=key)
+    if track_positions:
+        merged.sort(key=lambda item: positions[item[key]])
+    return merged
@@ -0,0 +1,156 @@
+from typing import Any
+
+from fuso.utils import to_list_of_dicts_by_key
+
+
+def diff(original: dict | None, updated: dict | None) -> dict:
+    """Compute the smallest updates that turn `original` into `updated`.
+
+    The result is a patch for `merge_dict` without `merge_functions`:
+    `merge_dict(original, diff(original, updated)) == updated`. Values that did not
+    change are left out, nested dictionaries only contain the keys that changed, and
+    lists that grew only contain the appended elements. Subtrees that are the same
+    object or compare equal are skipped without being walked.
+
+    Some changes cannot be expressed as updates, because merging never removes keys,
+    `None` keeps the original value, lists are concatenated and values of different
+    types cannot be merged. All of them are collected and reported together.
+
+    The patch shares values with `updated`, so copy it before modifying either.
+
+    Args:
+        original (dict | None): Dictionary the patch will be applied to
+        updated (dict | None): Dictionary the patch should produce
+
+    Returns:
+        dict: Updates for `merge_dict`
+
+    Raises:
+        ValueError: If some changes cannot be expressed as updates. The message
+            lists the path of every such change and the reason.
+
+    Example:
+        ```py
+        original = {"db": {"host": "localhost", "port": 5432}, "tags": ["a"]}
+        updated = {"db": {"host": "localhost", "port": 6432}, "tags": ["a", "b"]}
+        patch = diff(original, updated)
+        assert patch == {"db": {"port": 6432}, "tags": ["b"]}
+        assert merge_dict(original, patch) == updated
+        ```
+    """
+    problems: list[tuple[tuple, str]] = []
+    patch = _diff(original or {}, updated or {}, (), problems)
+    _raise_problems(problems)
+    return patch
+
+
+def diff_list_of_dicts_by_key(
+    values: list[dict] | None, updated: list[dict] | None, key: str
+) -> list[dict]:
+    """Compute the smallest updates that turn `values` into `updated`.
+
+    The result is a patch for `merge_list_of_dicts_by_key` without `default_key` or
+    `merge_functions`. Items are matched by `key`. Items that did not change are
+    left out, changed items only contain `key` and the output of `diff`, and new
+    items are included as they are. Items are compared by key, so the order of the
+    lists does not matter.
+
+    Args:
+        values (list[dict] | None): List the patch will be applied to
+        updated (list[dict] | None): List the patch should produce
+        key (str): Key to match items by
+
+    Returns:
+        list[dict]: Updates for `merge_list_of_dicts_by_key`
+
+    Raises:
+        KeyError: If `key` is missing in an item or if duplicate key values are found.
+        ValueError: If some changes cannot be expressed as updates, including items
+            that were removed. Paths in the message start with the item's key.
+
+    Example:
+        ```py
+        values = [{"id": 1, "tags": ["a"]}, {"id": 2, "name": "Bob"}]
+        updated = [{"id": 1, "tags": ["a", "b"]}, values[1], {"id": 3, "name": "Cy"}]
+        patch = diff_list_of_dicts_by_key(values, updated, key="id")
+        assert patch == [{"id": 1, "tags": ["b"]}, {"id": 3, "name": "Cy"}]
+        assert merge_list_of_dicts_by_key(values, patch, key="id") == updated
+        ```
+    """
+    originals = to_list_of_dicts_by_key(values or [], key=key)
+    problems: list[tuple[tuple, str]] = []
+    patch = []
+    for value_key, item in to_list_of_dicts_by_key(updated or [], key=key).items():
+        original = originals.pop(value_key, None)
+        if original is None:
+            patch.append({key: value_key, **item})
+            continue
+        item_patch = _diff(original, item, (value_key,), problems)
+        if item_patch:
+            patch.append({key: value_key, **item_patch})
+    problems.extend(((value_key,), "item was removed") for value_key in originals)
+    _raise_problems(problems)
+    return patch
+
+
+def _diff(
+    original: dict, updated: dict, path: tuple, problems: list[tuple[tuple, str]]
+) -> dict:
+    patch: dict = {}
+    stack = [(path, original, updated, patch)]
+    while stack:
+        path, old, new, target = stack.pop()
+        problems.extend(
+            ((*path, key), "key was removed") for key in old if key not in new
+        )
+        for key, new_value in new.items():
+            if key not in old:
+                target[key] = new_value
+                continue
+            old_value = old[key]
+            if old_value is new_value:
+                continue
+            if old_value is None:
+                target[key] = new_value
+                continue
+            problem = _inexpressible(old_value, new_value)
+            if problem is not None:
+                problems.append(((*path, key), problem))
+            elif old_value == new_value:
+                continue
+            elif isinstance(new_value, dict):
+                target[key] = child = {}
+                stack.append(((*path, key), old_value, new_value, child))
+            elif isinstance(new_value, list):
+                target[key] = new_value[len(old_value) :]
+            else:
+                target[key] = new_value
+    return patch
+
+
+def _inexpressible(old_value: Any, new_value: Any) -> str | None:
+    """Return why `old_value` cannot be merged into `new_value`, if it cannot."""
+    if new_value is None:
+        return "value was replaced by None"
+    if type(old_value) is not type(new_value):
+        return (
+            f"type changed from {type(old_value).__name__} to "
+            f"{type(new_value).__name__}"
+        )
+    if isinstance(new_value, list) and new_value[: len(old_value)] != old_value:
+        return "list does not start with the original list"
+    return None
+
+
+def _raise_problems(problems: list[tuple[tuple, Any]]) -> None:
+    if not problems:
+        return
+    lines = [
+        f"  {'.'.join(map(str, path))}: {reason}"
+        for path, reason in sorted(
+            problems, key=lambda problem: tuple(map(str, problem[0]))
+        )
+    ]
+    raise ValueError(
+        "Cannot express the changes as merge updates:\n" + "\n".join(lines)
+    )
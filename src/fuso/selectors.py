@@ -0,0 +1,220 @@
+from collections.abc import Callable, Hashable, Mapping
+from typing import Any
+
+from fuso.utils import ListKey, _key_getter
+
+SELECTOR_PREFIX = "$."
+"""Prefix marking a `merge_functions` or `list_keys` key as a path selector."""
+
+
+def is_selector(key: Any) -> bool:
+    """Return whether a `merge_functions` key is a path selector.
+
+    Selectors are strings starting with `$.`, followed by dot-separated segments. A
+    segment is a literal key, `*` for exactly one key or `**` for any number of
+    keys, including none. Every other key addresses a top-level key literally, even
+    if it contains dots or asterisks, so keys such as `"example.com"` keep working.
+
+    Args:
+        key (Any): A key of `merge_functions`
+
+    Returns:
+        bool: Whether `key` is a path selector
+
+    Example:
+        ```py
+        assert is_selector("$.spec.containers")
+        assert is_selector("$.**.labels")
+        assert not is_selector("labels")
+        assert not is_selector("example.com")
+        ```
+    """
+    return isinstance(key, str) and key.startswith(SELECTOR_PREFIX)
+
+
+class _Node:
+    """A node of the selector trie."""
+
+    __slots__ = (
+        "function",
+        "globstar",
+        "list_key",
+        "list_rank",
+        "literal",
+        "loops",
+        "rank",
+        "star",
+    )
+
+    def __init__(self, loops: bool = False) -> None:
+        self.literal: dict[Hashable, _Node] = {}
+        self.star: _Node | None = None
+        self.globstar: _Node | None = None
+        self.loops = loops
+        self.function: Callable[[Any, Any], Any] | None = None
+        self.rank: tuple = ()
+        self.list_key: ListKey | None = None
+        self.list_rank: tuple = ()
+
+
+class SelectorState:
+    """The trie nodes matched by a path, with its transitions computed once.
+
+    Stepping to a child key is a dictionary lookup: transitions for the literal keys
+    of the selectors are precomputed, and every other key shares one default
+    transition. States are created on first use and shared between paths.
+
+    `get_key` extracts the key of the items of a list at the path, if the list is
+    merged by key. Items of such a list continue the path: a field of an item is
+    addressed by the path of the list followed by the field.
+    """
+
+    __slots__ = (
+        "_cache",
+        "_default",
+        "_literal",
+        "function",
+        "get_key",
+        "list_key",
+        "live",
+        "nodes",
+    )
+
+    def __init__(self, nodes: frozenset, cache: dict) -> None:
+        self.nodes = nodes
+        self._cache = cache
+        self._literal: dict[Hashable, SelectorState | None] | None = None
+        self._default: SelectorState | None = None
+        functions = [node for node in nodes if node.function is not None]
+        self.function = (
+            max(functions, key=lambda node: node.rank).function if functions else None
+        )
+        keyed = [node for node in nodes if node.list_key is not None]
+        self.list_key = (
+            max(keyed, key=lambda node: node.list_rank).list_key if keyed else None
+        )
+        self.get_key = None if self.list_key is None else _key_getter(self.list_key)
+        self.live = any(
+            node.literal or node.star or node.globstar or node.loops for node in nodes
+        )
+
+    def step(self, key: Hashable) -> "SelectorState | None":
+        """Return the state for the child `key`, or `None` if no selector can match
+        it or anything below it."""
+        literal = self._literal
+        if literal is None:
+            literal = self._compile()
+        return literal.get(key, self._default)
+
+    def _compile(self) -> dict:
+        keys = {key for node in self.nodes for key in node.literal}
+        self._literal = {key: self._transition(key) for key in keys}
+        self._default = self._transition(_NO_KEY)
+        return self._literal
+
+    def _transition(self, key: Hashable) -> "SelectorState | None":
+        nodes = set()
+        for node in self.nodes:
+            if node.loops:
+                nodes.add(node)
+            if node.star is not None:
+                nodes.add(node.star)
+            child = node.literal.get(key)
+            if child is not None:
+                nodes.add(child)
+        return _state(_closure(nodes), self._cache)
+
+
+_NO_KEY = object()
+
+
+def compile_selectors(
+    merge_functions: Mapping[Any, Callable[[Any, Any], Any] | None],
+    list_keys: Mapping[Any, ListKey] | None = None,
+) -> SelectorState | None:
+    """Compile `merge_functions` and `list_keys` keys into a selector trie.
+
+    When several selectors match the same path, the one with the most literal
+    segments wins, then the one with the most `*` segments, then the one listed
+    first. Merge functions and list keys are ranked separately; if both match a
+    path, the merge function is used.
+
+    Args:
+        merge_functions (Mapping[Any, Callable[[Any, Any], Any] | None]): Functions
+            by top-level key or path selector. Keys mapped to `None` are ignored.
+        list_keys (Mapping[Any, ListKey] | None): Keys to merge lists of
+            dictionaries by, by top-level key or path selector
+
+    Returns:
+        SelectorState | None: The state at the root of a merge, or `None` if there
+            are no functions or list keys
+
+    Example:
+        ```py
+        root = compile_selectors({"$.spec.labels": max, "$.**.labels": min})
+        assert root.step("spec").step("labels").function is max
+        assert root.step("meta").step("labels").function is min
+        assert root.step("labels").function is min
+        root = compile_selectors({}, {"$.spec.containers": "name"})
+        assert root.step("spec").step("containers").list_key == "name"
+        ```
+    """
+    root = _Node()
+    for index, (key, function) in enumerate(merge_functions.items()):
+        if function:
+            node, rank = _insert(root, key, index)
+            if node.function is None:
+                node.function = function
+                node.rank = rank
+    for index, (key, list_key) in enumerate((list_keys or {}).items()):
+        node, rank = _insert(root, key, index)
+        if node.list_key is None:
+            node.list_key = list_key
+            node.list_rank = rank
+    if root.literal or root.star or root.globstar:
+        return _state(_closure({root}), {})
+    return None
+
+
+def _insert(root: _Node, key: Any, index: int) -> tuple[_Node, tuple]:
+    """Add the path of the selector `key` to the trie, returning its node and rank."""
+    if is_selector(key):
+        segments = key[len(SELECTOR_PREFIX) :].split(".")
+    else:
+        segments = [key]
+    node = root
+    literals = stars = 0
+    for segment in segments:
+        if segment == "**":
+            if node.globstar is None:
+                node.globstar = _Node(loops=True)
+            node = node.globstar
+        elif segment == "*":
+            if node.star is None:
+                node.star = _Node()
+            node = node.star
+            stars += 1
+        else:
+            node = node.literal.setdefault(segment, _Node())
+            literals += 1
+    return node, (literals, stars, -index)
+
+
+def _closure(nodes: set) -> frozenset:
+    """Add the nodes reachable by letting `**` match no keys."""
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if node.globstar is not None and node.globstar not in nodes:
+            nodes.add(node.globstar)
+            stack.append(node.globstar)
+    return frozenset(nodes)
+
+
+def _state(nodes: frozenset, cache: dict) -> SelectorState | None:
+    if not nodes:
+        return None
+    state = cache.get(nodes)
+    if state is None:
+        state = cache[nodes] = SelectorState(nodes, cache)
+    return state
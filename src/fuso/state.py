@@ -0,0 +1,215 @@
+from collections.abc import Callable
+from itertools import chain
+from operator import ne
+from typing import Any
+
+from fuso.dicts import (
+    MergePlan,
+    _copy_tree,
+    _fold_merge_function,
+    _merge_many,
+    _type_mismatch,
+)
+from fuso.selectors import is_selector
+from fuso.utils import Ordering, _sort_by_rank
+
+_MISSING = object()
+
+
+class MergeState:
+    """The result of merging layers, kept up to date as single layers change.
+
+    The state merges its layers like `merge_many` and keeps both the layers and the
+    result. `update()` replaces one layer and only recomputes the key paths where the
+    old and new layer differ, so the cost depends on the size of the change rather
+    than on the size of the merged tree.
+
+    `result` is updated in place and owns all of its dictionaries and lists, so it
+    never shares them with the layers. Treat it as read-only. Layers are compared
+    with their replacements, so do not modify a layer after passing it in; pass a
+    new dictionary to `update()` instead.
+
+    `post_processor` is not supported, because it needs the complete result.
+
+    Args:
+        *layers (dict | None): Dictionaries to merge, in order
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific top-level keys
+        key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        ordering (Ordering): How to order the top-level keys, see `merge_dict`
+
+    Raises:
+        ValueError: If `ordering` is not a known ordering policy, or if
+            `merge_functions` contains path selectors.
+
+    Example:
+        ```py
+        base = {"db": {"host": "localhost", "port": 5432}, "debug": False}
+        state = MergeState(base, {"db": {"port": 6432}})
+        changed = state.update(1, {"db": {"port": 7432}})
+        assert changed == [("db", "port")]
+        assert state.result["db"] == {"host": "localhost", "port": 7432}
+        ```
+    """
+
+    def __init__(
+        self,
+        *layers: dict | None,
+        merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+        key_order: list[str] | None = None,
+        ordering: Ordering = "sorted",
+    ) -> None:
+        if any(map(is_selector, merge_functions or {})):
+            raise ValueError("MergeState does not support path selectors")
+        self._plan = MergePlan(
+            merge_functions=merge_functions, key_order=key_order, ordering=ordering
+        )
+        self._layers = [layer or {} for layer in layers]
+        self.result: dict = (
+            _copy_tree(self._plan.merge_many(*self._layers)) if self._layers else {}
+        )
+
+    @property
+    def layers(self) -> tuple[dict, ...]:
+        """The current layers, in order."""
+        return tuple(self._layers)
+
+    def __repr__(self) -> str:
+        return f"MergeState(layers={len(self._layers)}, keys={len(self.result)})"
+
+    def update(self, layer_index: int, new_layer: dict | None) -> list[tuple]:
+        """Replace one layer and recompute the parts of the result it affects.
+
+        If recomputing raises, for example a `TypeError` because the new layer does
+        not match the types of the other layers, the state is left unchanged.
+
+        Args:
+            layer_index (int): Index of the layer to replace
+            new_layer (dict | None): The new layer
+
+        Returns:
+            list[tuple]: Paths of the values in `result` that changed, as tuples of
+                keys. A path ends at the first value that changed as a whole, so
+                changes inside a list or a new dictionary are reported at the path
+                of that list or dictionary.
+
+        Raises:
+            IndexError: If there is no layer at `layer_index`.
+        """
+        new_layer = new_layer or {}
+        layers = list(self._layers)
+        old_layer = layers[layer_index]
+        layers[layer_index] = new_layer
+        paths, reordered = _diff_layers(old_layer, new_layer)
+        merge_functions = self._plan.merge_functions
+        if merge_functions:
+            paths = list(
+                dict.fromkeys(
+                    path[:1] if merge_functions.get(path[0]) else path for path in paths
+                )
+            )
+        values = [(path, self._compute(layers, path)) for path in paths]
+        self._layers = layers
+        changed = []
+        for path, value in values:
+            parent = self._lookup(path[:-1])
+            previous = parent.get(path[-1], _MISSING)
+            if value is _MISSING:
+                parent.pop(path[-1], None)
+            else:
+                parent[path[-1]] = value
+            if not _same(previous, value):
+                changed.append(path)
+        for parent_path in reordered:
+            if not (parent_path and merge_functions.get(parent_path[0])):
+                self._reorder(parent_path)
+        return changed
+
+    def _compute(self, layers: list[dict], path: tuple) -> Any:
+        """Merge the values of `layers` at `path`, or return `_MISSING`."""
+        key = path[0]
+        merge_function = self._plan.merge_functions.get(key)
+        if merge_function:
+            if not any(key in layer for layer in layers):
+                return _MISSING
+            # merge_many runs merge functions once even for a single layer.
+            fold_layers = layers if len(layers) > 1 else [*layers, {}]
+            return _copy_tree(_fold_merge_function(merge_function, key, fold_layers))
+        found = []
+        for layer in layers:
+            node = _walk(layer, path[:-1])
+            if isinstance(node, dict):
+                if path[-1] in node:
+                    found.append({key: node[path[-1]]})
+            elif node is not None and node is not _MISSING:
+                raise _type_mismatch(node, {})
+        if not found:
+            return _MISSING
+        return _copy_tree(_merge_many(found)[key])
+
+    def _lookup(self, path: tuple) -> dict:
+        node = self.result
+        for key in path:
+            node = node[key]
+        return node
+
+    def _reorder(self, path: tuple) -> None:
+        """Restore the key order of the dictionary at `path` after the keys of a
+        layer were added, removed or reordered, matching what a full merge would
+        produce."""
+        if path:
+            parent = _walk(self.result, path)
+            if not isinstance(parent, dict):
+                return
+            nodes = [_walk(layer, path) for layer in self._layers]
+            order = dict.fromkeys(
+                chain.from_iterable(node for node in nodes if isinstance(node, dict))
+            )
+        elif self._plan.ordering == "none":
+            return
+        else:
+            parent = self.result
+            if self._plan.ordering == "sorted":
+                order = _sort_by_rank(parent, self._plan._key_ranks)
+            else:
+                order = dict.fromkeys(chain.from_iterable(self._layers))
+        ordered = {key: parent[key] for key in order if key in parent}
+        parent.clear()
+        parent.update(ordered)
+
+
+def _walk(node: Any, path: tuple) -> Any:
+    """Follow `path` through nested dictionaries, returning `_MISSING` if a key is
+    missing and the value in the way if it is not a dictionary."""
+    for key in path:
+        if not isinstance(node, dict):
+            return node
+        node = node.get(key, _MISSING)
+    return node
+
+
+def _diff_layers(old: dict, new: dict) -> tuple[list[tuple], list[tuple]]:
+    """Return the paths where `old` and `new` differ, and the paths of dictionaries
+    whose keys were added, removed or reordered."""
+    paths = []
+    reordered = []
+    stack = [((), old, new)]
+    while stack:
+        path, old_node, new_node = stack.pop()
+        for key in chain(old_node, (key for key in new_node if key not in old_node)):
+            if key not in old_node or key not in new_node:
+                paths.append((*path, key))
+                continue
+            old_value = old_node[key]
+            new_value = new_node[key]
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                stack.append(((*path, key), old_value, new_value))
+            elif not _same(old_value, new_value):
+                paths.append((*path, key))
+        if len(old_node) != len(new_node) or any(map(ne, old_node, new_node)):
+            reordered.append(path)
+    return paths, reordered
+
+
+def _same(old: Any, new: Any) -> bool:
+    return old is new or (type(old) is type(new) and old == new)
@@ -0,0 +1,360 @@
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from itertools import chain
+from typing import Any
+
+from fuso.utils import ListKey, _key_getter, _type_mismatch
+
+MERGE_MAPPING: Any = object()
+"""Strategy that merges a mapping key by key into a copy of the original.
+
+The copy is made with the mapping's own `copy()` method, so subclasses such as
+`OrderedDict` and `defaultdict` (including its `default_factory`) are preserved.
+"""
+
+_UNKNOWN = object()
+
+
+class StrategyRegistry:
+    """Merge strategies for nested values, looked up by type.
+
+    Pass a registry as `strategies` to `merge_dict`, `MergePlan` or
+    `create_merge_factory` to choose how values of each type are merged. A strategy
+    is a function `(original, update) -> merged`, or `MERGE_MAPPING` to merge a
+    mapping key by key. Values of types without a strategy are replaced by the
+    update, as in the default engine. `None` still keeps the original value, and
+    values of different types still raise a `TypeError`.
+
+    Types are looked up by exact type first, then along the method resolution
+    order, and the outcome is cached per type, so dispatch is one dictionary lookup
+    per value.
+
+    With `builtins=True` the registry starts with these strategies:
+
+    - `dict`, `OrderedDict` and `defaultdict`: `MERGE_MAPPING`
+    - `list` and `tuple`: concatenation
+    - `set` and `frozenset`: union
+    - `Counter`: counts are added
+
+    Args:
+        builtins (bool): Start with the built-in strategies
+
+    Example:
+        ```py
+        strategies = StrategyRegistry()
+        strategies.register(str, lambda original, update: f"{original},{update}")
+        merged = merge_dict(
+            {"tags": {"a"}, "path": "x", "hits": Counter(a=1)},
+            {"tags": {"b"}, "path": "y", "hits": Counter(a=2)},
+            strategies=strategies,
+        )
+        assert merged == {"hits": Counter(a=3), "path": "x,y", "tags": {"a", "b"}}
+        ```
+    """
+
+    def __init__(self, builtins: bool = True) -> None:
+        self._strategies: dict[type, Any] = {}
+        self._cache: dict[type, Any] = {}
+        if builtins:
+            for mapping_type in (dict, OrderedDict, defaultdict):
+                self.register(mapping_type, MERGE_MAPPING)
+            self.register(list, _concatenate)
+            self.register(tuple, _concatenate)
+            self.register(set, _union)
+            self.register(frozenset, _union)
+            self.register(Counter, _add_counts)
+
+    def register(self, value_type: type, strategy: Callable[[Any, Any], Any]) -> None:
+        """Use `strategy` for values of `value_type` and its subclasses.
+
+        Args:
+            value_type (type): Type the strategy applies to
+            strategy (Callable[[Any, Any], Any]): Function returning the merged value,
+                or `MERGE_MAPPING`
+        """
+        self._strategies[value_type] = strategy
+        self._cache.clear()
+
+    def lookup(self, value_type: type) -> Callable[[Any, Any], Any] | None:
+        """Return the strategy for `value_type`, or `None` if values are replaced.
+
+        Args:
+            value_type (type): Type to look up
+
+        Returns:
+            Callable[[Any, Any], Any] | None: The strategy of the closest registered
+                type in the method resolution order
+        """
+        try:
+            return self._cache[value_type]
+        except KeyError:
+            pass
+        strategy = next(
+            (
+                self._strategies[base]
+                for base in value_type.__mro__
+                if base in self._strategies
+            ),
+            None,
+        )
+        self._cache[value_type] = strategy
+        return strategy
+
+    def __repr__(self) -> str:
+        names = ", ".join(value_type.__name__ for value_type in self._strategies)
+        return f"StrategyRegistry({names})"
+
+    def merge(self, value: Any, update: Any) -> Any:
+        """Merge `update` into `value` with the registered strategies.
+
+        Nested mappings are walked with an explicit stack, so there is no depth
+        limit. The inputs are not modified.
+
+        Args:
+            value (Any): Original value
+            update (Any): Update
+
+        Returns:
+            Any: Merged value
+
+        Raises:
+            TypeError: If two values that are not `None` have different types.
+        """
+        if value is None:
+            return update
+        if update is None:
+            return value
+        if type(value) is not type(update):
+            raise _type_mismatch(value, update)
+        strategy = self.lookup(type(value))
+        if strategy is None:
+            return update
+        if strategy is not MERGE_MAPPING:
+            return strategy(value, update)
+        root = value.copy()
+        self._merge_mapping(root, update)
+        return root
+
+    def _merge_mapping(self, root: Any, update: Any) -> None:
+        """Merge `update` into the mapping `root`, copying nested mappings."""
+        cache = self._cache
+        stack = [(root, update)]
+        while stack:
+            target, update = stack.pop()
+            for key, update_value in update.items():
+                if update_value is None:
+                    if key not in target:
+                        target[key] = None
+                    continue
+                original_value = target.get(key)
+                if original_value is None:
+                    target[key] = update_value
+                    continue
+                value_type = type(original_value)
+                if value_type is not type(update_value):
+                    raise _type_mismatch(original_value, update_value)
+                strategy = cache.get(value_type, _UNKNOWN)
+                if strategy is _UNKNOWN:
+                    strategy = self.lookup(value_type)
+                if strategy is None:
+                    target[key] = update_value
+                elif strategy is MERGE_MAPPING:
+                    target[key] = child = original_value.copy()
+                    stack.append((child, update_value))
+                else:
+                    target[key] = strategy(original_value, update_value)
+
+
+def _concatenate(value: Any, update: Any) -> Any:
+    return value + update
+
+
+def _union(value: Any, update: Any) -> Any:
+    return value | update
+
+
+def _add_counts(value: Counter, update: Counter) -> Counter:
+    result = value.copy()
+    result.update(update)
+    return result
+
+
+def ordered_union(original: list | None, update: list | None) -> list | None:
+    """Merge two lists into their union, keeping the first occurrence of each item.
+
+    Items are compared by hashing, so the merge runs in linear time. Unhashable
+    items such as dictionaries and lists are compared by a hashable copy of their
+    contents, and items that cannot be copied that way by equality. Use it as a
+    merge function for specific keys, or register it for `list` in a
+    `StrategyRegistry` to apply it to every list.
+
+    Args:
+        original (list | None): Original list
+        update (list | None): List with updates
+
+    Returns:
+        list | None: Items of both lists without duplicates, or `None` if both are
+            `None`
+
+    Example:
+        ```py
+        assert ordered_union(["a", "b"], ["b", "c", "a"]) == ["a", "b", "c"]
+        merged = merge_dict(
+            {"tags": ["a"], "perms": [{"id": 1}]},
+            {"tags": ["a", "b"], "perms": [{"id": 1}, {"id": 2}]},
+            merge_functions={"tags": ordered_union, "perms": ordered_union},
+        )
+        assert merged == {"perms": [{"id": 1}, {"id": 2}], "tags": ["a", "b"]}
+        ```
+    """
+    if original is None and update is None:
+        return None
+    return _unique(chain(original or (), update or ()), None)
+
+
+def union_by(key: ListKey) -> Callable[[list | None, list | None], list | None]:
+    """Create a list strategy that keeps the first item for every key.
+
+    Like `ordered_union`, but items are compared by their key instead of their whole
+    value. To merge items with the same key instead of dropping the later ones, use
+    `list_keys`, see `MergePlan`.
+
+    Args:
+        key (ListKey): Field, tuple of fields or callable identifying each item
+
+    Returns:
+        Callable[[list | None, list | None], list | None]: The list strategy
+
+    Example:
+        ```py
+        by_id = union_by("id")
+        merged = by_id([{"id": 1, "v": "a"}], [{"id": 1, "v": "b"}, {"id": 2}])
+        assert merged == [{"id": 1, "v": "a"}, {"id": 2}]
+        ```
+    """
+    get_key = _key_getter(key)
+
+    def merge_union_by(original: list | None, update: list | None) -> list | None:
+        if original is None and update is None:
+            return None
+        return _unique(chain(original or (), update or ()), get_key)
+
+    return merge_union_by
+
+
+def replace(original: list | None, update: list | None) -> list | None:
+    """Replace the original list with the update, keeping it if the update is `None`.
+
+    Args:
+        original (list | None): Original list
+        update (list | None): List with updates
+
+    Returns:
+        list | None: `update`, or `original` if `update` is `None`
+    """
+    return original if update is None else update
+
+
+def prepend(original: list | None, update: list | None) -> list | None:
+    """Put the items of the update before the items of the original list.
+
+    Args:
+        original (list | None): Original list
+        update (list | None): List with updates
+
+    Returns:
+        list | None: Items of `update` followed by items of `original`, or `None` if
+            both are `None`
+    """
+    if original is None and update is None:
+        return None
+    return [*(update or ()), *(original or ())]
+
+
+def keep_last(n: int) -> Callable[[list | None, list | None], list | None]:
+    """Create a list strategy that concatenates and keeps the last `n` items.
+
+    Args:
+        n (int): Number of items to keep
+
+    Returns:
+        Callable[[list | None, list | None], list | None]: The list strategy
+
+    Raises:
+        ValueError: If `n` is negative.
+
+    Example:
+        ```py
+        history = keep_last(3)
+        assert history([1, 2, 3], [4, 5]) == [3, 4, 5]
+        ```
+    """
+    if n < 0:
+        raise ValueError(f"n must not be negative, got {n}")
+
+    def merge_keep_last(original: list | None, update: list | None) -> list | None:
+        if original is None and update is None:
+            return None
+        update = update or []
+        if len(update) >= n:
+            return update[len(update) - n :]
+        original = original or []
+        return original[max(len(original) - n + len(update), 0) :] + update
+
+    return merge_keep_last
+
+
+def _unique(items: Iterable, get_key: Callable[[Any], Hashable] | None) -> list:
+    """Return `items` without repeated keys, in one pass."""
+    result = []
+    seen: set = set()
+    unhashable: list = []
+    for item in items:
+        marker = item if get_key is None else get_key(item)
+        try:
+            if marker in seen:
+                continue
+            seen.add(marker)
+        except TypeError:
+            try:
+                frozen = _freeze(marker)
+            except TypeError:
+                # Not even a copy is hashable, so compare by equality.
+                if marker in unhashable:
+                    continue
+                unhashable.append(marker)
+            else:
+                if frozen in seen:
+                    continue
+                seen.add(frozen)
+        result.append(item)
+    return result
+
+
+_DICT = object()
+_LIST = object()
+_TUPLE = object()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable copy of `value` that is equal exactly when `value` is.
+
+    Dictionaries, lists and tuples are tagged with private markers, so their copies
+    never equal a hashable value of the inputs. Raises `TypeError` for unhashable
+    values of other types.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        pass
+    else:
+        return value
+    if isinstance(value, dict):
+        return (_DICT, frozenset((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return (_LIST, tuple(map(_freeze, value)))
+    if isinstance(value, tuple):
+        return (_TUPLE, tuple(map(_freeze, value)))
+    if isinstance(value, set):
+        return frozenset(value)
+    raise TypeError(f"unhashable type: '{type(value).__name__}'")
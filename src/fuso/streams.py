@@ -0,0 +1,180 @@
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from itertools import chain
+from typing import Any
+
+from fuso.dicts import MergePlan
+from fuso.utils import _key_of
+
+
+def iter_merge_list_of_dicts_by_key(  # noqa: PLR0913 - Too many arguments, but they are all necessary for the functionality
+    values: Iterable[dict],
+    updates: Iterable[dict],
+    key: str,
+    default_key: str | None = None,
+    merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+    object_key_order: list[str] | None = None,
+    presorted: bool = False,
+) -> Iterator[dict]:
+    """Merge two iterables of dictionaries by a specified key, yielding merged items.
+
+    Items are merged with the same rules as `merge_list_of_dicts_by_key`, but they are
+    produced one at a time instead of being collected into a list.
+
+    By default `updates` is indexed in memory and `values` is streamed. Items are
+    yielded in the order of `values`, followed by the new items from `updates`.
+    Duplicate keys in `values` are not detected in this mode.
+
+    With `presorted=True` both inputs must already be sorted by `key` in ascending
+    order, and they are merged with a merge-join that only holds one item of each
+    input at a time. Items are yielded sorted by `key`, like
+    `merge_list_of_dicts_by_key`. The `default_key` item, if any, must be the first
+    item of `updates`.
+
+    Args:
+        values (Iterable[dict]): Original dictionaries
+        updates (Iterable[dict]): Dictionaries with updates
+        key (str): Key to use for merging
+        default_key (str | None): Key to use for default updates
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific keys
+        object_key_order (list[str] | None): Non-exhaustive list of keys to sort objects
+            by
+        presorted (bool): Whether both inputs are sorted by `key`
+
+    Returns:
+        Iterator[dict]: Merged dictionaries
+
+    Raises:
+        KeyError: If `key` is missing in an item or if duplicate key values are found.
+        ValueError: If `presorted` is set and an input is not sorted by `key`, or the
+            `default_key` item is not the first item of `updates`.
+
+    Example:
+        ```py
+        values = ({"id": i, "n": i} for i in range(3))
+        updates = iter([{"id": 1, "n": 10}, {"id": 5, "n": 50}])
+        merged = iter_merge_list_of_dicts_by_key(
+            values, updates, key="id", presorted=True
+        )
+        assert list(merged) == [
+            {"id": 0, "n": 0},
+            {"id": 1, "n": 10},
+            {"id": 2, "n": 2},
+            {"id": 5, "n": 50},
+        ]
+        ```
+    """
+    merge_row = _RowMerger(
+        key,
+        MergePlan(merge_functions=merge_functions, key_order=object_key_order),
+    )
+    if presorted:
+        return _merge_join(values, updates, key, default_key, merge_row)
+    return _hash_join(values, updates, key, default_key, merge_row)
+
+
+class _RowMerger:
+    """Merge one item with its update, applying the default update first."""
+
+    def __init__(self, key: str, plan: MergePlan) -> None:
+        self.key = key
+        self.plan = plan
+        self.default_update: dict = {}
+
+    def __call__(
+        self, value_key: Hashable, value: dict, specific_update: dict | None
+    ) -> dict:
+        merged = self.plan.merge_with_defaults(
+            value, self.default_update, specific_update
+        )
+        merged[self.key] = value_key
+        return merged
+
+
+def _hash_join(
+    values: Iterable[dict],
+    updates: Iterable[dict],
+    key: str,
+    default_key: str | None,
+    merge_row: _RowMerger,
+) -> Iterator[dict]:
+    index = {}
+    for value_key, update in _split_rows(updates, key, "update"):
+        if default_key is not None and value_key == default_key:
+            merge_row.default_update = update
+        elif value_key in index:
+            raise KeyError(f"Duplicate key '{value_key}' found for lookup key '{key}'")
+        else:
+            index[value_key] = update
+    for value_key, value in _split_rows(values, key, "value"):
+        yield merge_row(value_key, value, index.pop(value_key, None))
+    for value_key, update in index.items():
+        yield merge_row(value_key, {}, update)
+
+
+def _merge_join(
+    values: Iterable[dict],
+    updates: Iterable[dict],
+    key: str,
+    default_key: str | None,
+    merge_row: _RowMerger,
+) -> Iterator[dict]:
+    update_rows = _split_rows(updates, key, "update")
+    first = next(update_rows, None)
+    if first is not None and default_key is not None and first[0] == default_key:
+        merge_row.default_update = first[1]
+    elif first is not None:
+        update_rows = chain([first], update_rows)
+    update_rows = _check_sorted(update_rows, key, "updates", default_key)
+    pending = next(update_rows, None)
+    for value_key, value in _check_sorted(
+        _split_rows(values, key, "value"), key, "values"
+    ):
+        while pending is not None and pending[0] < value_key:
+            yield merge_row(pending[0], {}, pending[1])
+            pending = next(update_rows, None)
+        if pending is not None and pending[0] == value_key:
+            yield merge_row(value_key, value, pending[1])
+            pending = next(update_rows, None)
+        else:
+            yield merge_row(value_key, value, None)
+    while pending is not None:
+        yield merge_row(pending[0], {}, pending[1])
+        pending = next(update_rows, None)
+
+
+def _split_rows(
+    rows: Iterable[dict], key: str, kind: str
+) -> Iterator[tuple[Hashable, dict]]:
+    """Yield `(key value, item without key)` pairs."""
+    for row in rows:
+        yield _key_of(row, key, kind), {k: v for k, v in row.items() if k != key}
+
+
+def _check_sorted(
+    rows: Iterator[tuple[Any, dict]],
+    key: str,
+    name: str,
+    default_key: str | None = None,
+) -> Iterator[tuple[Any, dict]]:
+    """Pass `rows` through, checking that their keys are strictly increasing."""
+    previous = None
+    for index, row in enumerate(rows):
+        value_key = row[0]
+        if default_key is not None and value_key == default_key:
+            raise ValueError(
+                f"The default item '{default_key}' must be the first item of "
+                "sorted updates"
+            )
+        if index:
+            if value_key == previous:
+                raise KeyError(
+                    f"Duplicate key '{value_key}' found for lookup key '{key}'"
+                )
+            if value_key < previous:
+                raise ValueError(
+                    f"{name.capitalize()} are not sorted by '{key}': "
+                    f"{value_key!r} follows {previous!r}"
+                )
+        previous = value_key
+        yield row
@@ -0,0 +1,158 @@
+from collections.abc import Callable, Iterator, Mapping
+from itertools import chain
+from typing import Any
+
+from fuso.dicts import _fold_merge_function, _type_mismatch
+from fuso.selectors import is_selector
+from fuso.utils import Ordering, _check_ordering, _key_ranks, _sort_by_rank
+
+
+class MergedView(Mapping):
+    """A read-only mapping that merges its layers lazily, one key at a time.
+
+    Constructing a view does no merging. Each key is resolved the first time it is
+    read, following the same rules as folding `merge_dict` over the layers, and the
+    resolved value is cached. Values that are dictionaries in more than one layer are
+    returned as nested views, so only the keys that are actually read get merged.
+
+    `post_processor` is not supported, because it needs the complete result. Call
+    `materialize()` and post-process the returned dictionary instead.
+
+    Args:
+        original (dict | None): Original dictionary
+        *updates (dict | None): Dictionaries with updates, applied in order
+        merge_functions (dict[str, Callable[[Any, Any], Any]] | None):
+            Dictionary of functions to use for merging specific top-level keys
+        key_order (list[str] | None): Non-exhaustive list of keys to sort by
+        ordering (Ordering): How to order the top-level keys, see `merge_dict`.
+            Nested views always use insertion order, like `merge_dict`.
+
+    Raises:
+        ValueError: If `ordering` is not a known ordering policy, or if
+            `merge_functions` contains path selectors.
+
+    Example:
+        ```py
+        base = {"db": {"host": "localhost", "port": 5432}, "tags": ["base"]}
+        tenant = {"db": {"host": "tenant.example.com"}, "tags": ["tenant"]}
+        view = MergedView(base, tenant)
+        assert view["db"]["host"] == "tenant.example.com"
+        assert view["tags"] == ["base", "tenant"]
+        assert view.materialize() == merge_dict(base, tenant)
+        ```
+    """
+
+    def __init__(
+        self,
+        original: dict | None,
+        *updates: dict | None,
+        merge_functions: dict[str, Callable[[Any, Any], Any]] | None = None,
+        key_order: list[str] | None = None,
+        ordering: Ordering = "sorted",
+    ) -> None:
+        _check_ordering(ordering)
+        if any(map(is_selector, merge_functions or {})):
+            raise ValueError("MergedView does not support path selectors")
+        self._layers = (original or {},) + tuple(update or {} for update in updates)
+        if len(self._layers) == 1:
+            # merge_dict(original, None) still runs merge_functions once per key.
+            self._layers += ({},)
+        self._merge_functions = dict(merge_functions or {})
+        self._key_order = tuple(key_order or ())
+        self._ordering = ordering
+        self._resolved: dict[Any, Any] = {}
+        self._keys: list | None = None
+
+    @classmethod
+    def _nested(cls, layers: list[dict]) -> "MergedView":
+        view = cls.__new__(cls)
+        view._layers = tuple(layers)
+        view._merge_functions = {}
+        view._key_order = ()
+        view._ordering = "insertion"
+        view._resolved = {}
+        view._keys = None
+        return view
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        value = self._resolved[key] = self._resolve(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resolved or any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._ordered_keys())
+
+    def __len__(self) -> int:
+        return len(self._ordered_keys())
+
+    def __repr__(self) -> str:
+        return f"MergedView(layers={len(self._layers)}, resolved={len(self._resolved)})"
+
+    def materialize(self) -> dict:
+        """Resolve every key and return the merged result as a plain dictionary.
+
+        Returns:
+            dict: The same result as folding `merge_dict` over the layers
+        """
+        root: dict = {}
+        stack = [(self, root)]
+        while stack:
+            view, target = stack.pop()
+            for key in view:
+                value = view[key]
+                if isinstance(value, MergedView):
+                    target[key] = child = {}
+                    stack.append((value, child))
+                else:
+                    target[key] = value
+        return root
+
+    def _ordered_keys(self) -> list:
+        if self._keys is None:
+            keys = dict.fromkeys(chain.from_iterable(self._layers))
+            if self._ordering == "sorted":
+                keys = _sort_by_rank(keys, _key_ranks(self._key_order))
+            self._keys = list(keys)
+        return self._keys
+
+    def _resolve(self, key: Any) -> Any:
+        merge_function = self._merge_functions.get(key)
+        if merge_function:
+            return self._resolve_with_function(key, merge_function)
+        values = []
+        present = False
+        for layer in self._layers:
+            if key in layer:
+                present = True
+                value = layer[key]
+                if value is not None:
+                    values.append(value)
+        if not present:
+            raise KeyError(key)
+        if not values:
+            return None
+        first = values[0]
+        if len(values) == 1:
+            return first
+        value_type = type(first)
+        for value in values:
+            if type(value) is not value_type:
+                raise _type_mismatch(first, value)
+        if isinstance(first, dict):
+            return MergedView._nested(values)
+        if isinstance(first, list):
+            return list(chain.from_iterable(values))
+        return values[-1]
+
+    def _resolve_with_function(
+        self, key: Any, merge_function: Callable[[Any, Any], Any]
+    ) -> Any:
+        if not any(key in layer for layer in self._layers):
+            raise KeyError(key)
+        return _fold_merge_function(merge_function, key, self._layers)
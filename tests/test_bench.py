@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from fuso.bench import WORKLOADS, compare_results, main, run_benchmarks
+
+
+def test_run_benchmarks_all_workloads():
+    results = run_benchmarks(repeat=1, number=1)
+    assert list(results["results"]) == list(WORKLOADS)
+    for result in results["results"].values():
+        assert result["number"] == 1
+        assert result["best"] == result["median"] > 0
+    json.dumps(results)
+
+
+def test_run_benchmarks_errors():
+    with pytest.raises(KeyError, match="Unknown workload 'missing'"):
+        run_benchmarks(["missing"])
+    with pytest.raises(ValueError, match="scale must be at least 1"):
+        run_benchmarks(scale=0)
+    with pytest.raises(ValueError, match="repeat must be at least 1"):
+        run_benchmarks(repeat=0)
+
+
+def test_compare_results():
+    baseline = {"results": {"a": {"best": 1.0}, "b": {"best": 2.0}, "c": {"best": 1}}}
+    current = {"results": {"a": {"best": 1.05}, "b": {"best": 3.0}}}
+    comparisons = compare_results(baseline, current, threshold=0.1)
+    assert [(c.name, c.regressed) for c in comparisons] == [("a", False), ("b", True)]
+    assert comparisons[1].ratio == 1.5
+
+
+def test_main_run_and_compare(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    assert main(["run", "-w", "sort_dict", "--repeat", "1", "-o", str(baseline)]) == 0
+    assert "sort_dict" in capsys.readouterr().out
+    results = json.loads(baseline.read_text())
+    assert list(results["results"]) == ["sort_dict"]
+
+    results["results"]["sort_dict"]["best"] *= 2
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(results))
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert "SLOWER" in capsys.readouterr().out
+    assert main(["compare", str(baseline), str(current), "--threshold", "1.5"]) == 0
@@ -0,0 +1,94 @@
+import pytest
+
+from fuso.cache import MergeCache
+from fuso.dicts import MergePlan
+from fuso.factories import (
+    create_merge_factory,
+    create_merge_list_of_dicts_by_key_factory,
+)
+
+
+def test_merge_cache_hits_and_copies():
+    cache = MergeCache()
+    merge = create_merge_factory(cache=cache)
+    original = {"tags": ["a"], "db": {"host": "x"}}
+    first = merge(original, {"tags": ["b"]})
+    first["db"]["host"] = "changed"
+    second = merge({"tags": ["a"], "db": {"host": "x"}}, {"tags": ["b"]})
+    assert second == {"db": {"host": "x"}, "tags": ["a", "b"]}
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    original["tags"].append("mutated")
+    assert merge(original, {"tags": ["b"]})["tags"] == ["a", "mutated", "b"]
+    assert cache.misses == 2
+
+
+def test_merge_cache_identity():
+    cache = MergeCache(identity=True)
+    merge = create_merge_factory(cache=cache)
+    original = {"a": 1}
+    updates = {"b": 2}
+    assert merge(original, updates) == {"a": 1, "b": 2}
+    assert merge(original, updates) == {"a": 1, "b": 2}
+    assert merge({"a": 1}, updates) == {"a": 1, "b": 2}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_merge_cache_shared_by_plans():
+    cache = MergeCache()
+    low = create_merge_factory(merge_functions={"n": min}, cache=cache)
+    high = create_merge_factory(merge_functions={"n": max}, cache=cache)
+    assert low({"n": 1}, {"n": 2}) == {"n": 1}
+    assert high({"n": 1}, {"n": 2}) == {"n": 2}
+    assert cache.hits == 0
+
+
+def test_merge_cache_eviction():
+    cache = MergeCache(max_entries=2)
+    merge = create_merge_factory(cache=cache)
+    for i in range(3):
+        merge({"n": i}, None)
+    assert (len(cache), cache.evictions) == (2, 1)
+    merge({"n": 0}, None)
+    assert cache.misses == 4
+
+    cache = MergeCache(max_bytes=200)
+    merge = create_merge_factory(cache=cache)
+    merge({"big": "x" * 500}, None)
+    assert len(cache) == 0
+    for i in range(10):
+        merge({"n": i}, None)
+    assert cache.size_bytes <= 200
+    assert cache.evictions > 0
+    cache.clear()
+    assert (len(cache), cache.size_bytes) == (0, 0)
+    assert repr(cache).startswith("MergeCache(entries=0")
+
+
+def test_merge_cache_unpicklable():
+    cache = MergeCache()
+    merge = create_merge_factory(cache=cache)
+    value = {"f": lambda: None}
+    assert merge(value, None)["f"] is value["f"]
+    merge = create_merge_factory(
+        post_processor=lambda d: lambda: d, ordering="none", cache=cache
+    )
+    assert merge({"a": 1}, None)() == {"a": 1}
+    assert (cache.misses, len(cache)) == (2, 0)
+
+
+def test_merge_cache_list_factory():
+    cache = MergeCache()
+    merge = create_merge_list_of_dicts_by_key_factory(key="id", cache=cache)
+    values = [{"id": 1, "tags": ["a"]}]
+    updates = [{"id": 1, "tags": ["b"]}]
+    assert merge(values, updates) == [{"id": 1, "tags": ["a", "b"]}]
+    assert merge(values, updates) == [{"id": 1, "tags": ["a", "b"]}]
+    assert cache.hits == 1
+
+
+def test_merge_cache_errors():
+    with pytest.raises(ValueError, match="max_entries must be at least 1"):
+        MergeCache(max_entries=0)
+    with pytest.raises(ValueError, match="In-place merges cannot be cached"):
+        MergePlan(inplace=True, cache=MergeCache())
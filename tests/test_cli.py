@@ -0,0 +1,123 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from fuso.cli import main, read_jsonl
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return path
+
+
+def test_merge_json_documents(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps({"db": {"host": "localhost"}, "tags": ["a"]}))
+    layers = write_jsonl(tmp_path / "layers.jsonl", [{"db": {"port": 1}}, {"b": 1}])
+    output = tmp_path / "merged.json"
+    assert main([str(base), str(layers), "-o", str(output), "--indent", "2"]) == 0
+    assert json.loads(output.read_text()) == {
+        "b": 1,
+        "db": {"host": "localhost", "port": 1},
+        "tags": ["a"],
+    }
+    assert main([str(base), str(base), "--ordering", "insertion"]) == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "db": {"host": "localhost"},
+        "tags": ["a", "a"],
+    }
+
+
+def test_merge_keyed_jsonl(tmp_path, capsys):
+    values = write_jsonl(tmp_path / "values.jsonl", [{"id": 1}, {"id": 2, "n": 2}])
+    updates = write_jsonl(
+        tmp_path / "updates.jsonl",
+        [{"id": "default", "active": True}, {"id": 2, "n": 20}, {"id": 3}],
+    )
+    assert (
+        main([str(values), str(updates), "--key", "id", "--default-key", "default"])
+        == 0
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"active": True, "id": 1},
+        {"active": True, "n": 20, "id": 2},
+        {"active": True, "id": 3},
+    ]
+
+
+def test_merge_keyed_json_arrays(tmp_path, capsys):
+    values = tmp_path / "values.json"
+    values.write_text(json.dumps([{"id": 1, "n": 1}, {"id": 3, "n": 3}]))
+    updates = write_jsonl(tmp_path / "updates.jsonl", [{"id": 2}, {"id": 3, "n": 30}])
+    more = write_jsonl(tmp_path / "more.ndjson", [{"id": 3, "m": 1}])
+    args = [str(values), str(updates), str(more), "--key", "id", "--presorted"]
+    assert main(args) == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {"n": 1, "id": 1},
+        {"id": 2},
+        {"m": 1, "n": 30, "id": 3},
+    ]
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("")
+    assert main([str(empty), "--key", "id", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out) == []
+
+
+def test_errors(tmp_path, capsys):
+    broken = tmp_path / "broken.jsonl"
+    broken.write_text('{"id": 1}\n\n{"id": \n')
+    assert main([str(broken), str(broken), "--key", "id"]) == 1
+    assert f"fuso: error: {broken}:3:" in capsys.readouterr().err
+    array = tmp_path / "array.json"
+    array.write_text("[1]")
+    assert main([str(array)]) == 1
+    assert "expected a JSON object" in capsys.readouterr().err
+    document = tmp_path / "document.json"
+    document.write_text("{}")
+    assert main([str(document), str(document), "--key", "id"]) == 1
+    assert "expected a JSON array" in capsys.readouterr().err
+    values = write_jsonl(tmp_path / "values.jsonl", [{"uid": 1}])
+    assert main([str(values), str(values), "--key", "id"]) == 1
+    assert "fuso: error: Key 'id' not found" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main([str(values), "--presorted"])
+
+
+def test_read_jsonl(tmp_path):
+    path = write_jsonl(tmp_path / "rows.jsonl", [{"a": 1}, [2], "x"])
+    assert list(read_jsonl(path)) == [{"a": 1}, [2], "x"]
+
+
+def test_python_m_fuso(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text('{"a": [1]}')
+    completed = subprocess.run(
+        [sys.executable, "-m", "fuso", str(path), str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(completed.stdout) == {"a": [1, 1]}
+
+
+def test_output_replaced_only_on_success(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    base.write_text('{"a": 1}')
+    override = tmp_path / "override.json"
+    override.write_text('{"b": 2}')
+    assert main([str(base), str(override), "-o", str(base)]) == 0
+    assert json.loads(base.read_text()) == {"a": 1, "b": 2}
+    before = base.read_text()
+    assert main([str(base), str(tmp_path / "missing.json"), "-o", str(base)]) == 1
+    assert "fuso: error:" in capsys.readouterr().err
+    assert base.read_text() == before
+    output = tmp_path / "new.json"
+    assert main([str(tmp_path / "missing.json"), "-o", str(output)]) == 1
+    assert not output.exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "base.json",
+        "override.json",
+    ]
@@ -0,0 +1,177 @@
+from array import array
+
+import pytest
+
+from fuso.columns import merge_list_of_dicts_by_key_columnar
+from fuso.factories import create_merge_list_of_dicts_by_key_factory
+from fuso.lists import ListMergePlan, merge_list_of_dicts_by_key
+from fuso.stats import MergeStats
+
+
+def keep_max(old, new):
+    return max(old or 0, new or 0)
+
+
+VALUES = [
+    {"id": i, "name": f"v{i}", "score": i, "ratio": i / 2, "tags": [f"v{i}"]}
+    for i in range(20)
+]
+UPDATES = [{"id": "default", "seen": True, "meta": {"a": 1}}] + [
+    {"id": i, "score": 100 - i, "name": None, "tags": [f"u{i}"]}
+    for i in range(10, 30, 3)
+]
+
+
+@pytest.mark.parametrize("ordering", ["sorted", "insertion"])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"default_key": "default"},
+        {"default_key": "default", "merge_functions": {"score": keep_max}},
+        {
+            "default_key": "default",
+            "merge_functions": {"$.meta.a": keep_max},
+            "object_key_order": ["tags"],
+        },
+    ],
+)
+def test_matches_merge_list_of_dicts_by_key(ordering, kwargs):
+    kwargs = {"key": "id", "ordering": ordering, **kwargs}
+    expected = merge_list_of_dicts_by_key(VALUES, UPDATES, **kwargs)
+    result = merge_list_of_dicts_by_key_columnar(VALUES, UPDATES, **kwargs)
+    assert result == expected
+    if ordering == "sorted":
+        assert [list(item) for item in result] == [list(item) for item in expected]
+
+
+def test_none_defaults_and_missing_fields():
+    values = [{"id": 1, "a": 1}, {"id": 2}]
+    updates = [{"id": "default", "a": None, "b": 2}, {"id": 2, "b": None}, {"id": 3}]
+    kwargs = {"key": "id", "default_key": "default"}
+    result = merge_list_of_dicts_by_key_columnar(values, updates, **kwargs)
+    assert result == merge_list_of_dicts_by_key(values, updates, **kwargs)
+    assert result == [
+        {"id": 1, "a": 1, "b": 2},
+        {"id": 2, "a": None, "b": 2},
+        {"id": 3, "a": None, "b": 2},
+    ]
+
+
+def test_composite_and_callable_keys():
+    values = [{"r": "eu", "id": 1, "n": 1}, {"r": "us", "id": 1, "n": 2}]
+    updates = [{"r": "eu", "id": 1, "n": 3}]
+    for key in [("r", "id"), lambda item: (item["r"], item["id"])]:
+        assert merge_list_of_dicts_by_key_columnar(
+            values, updates, key=key
+        ) == merge_list_of_dicts_by_key(values, updates, key=key)
+    columns = merge_list_of_dicts_by_key_columnar(
+        values, updates, key=("r", "id"), output="columns"
+    )
+    assert columns == {
+        "n": array("q", [3, 2]),
+        "r": ["eu", "us"],
+        "id": array("q", [1, 1]),
+    }
+    assert merge_list_of_dicts_by_key_columnar(
+        [], [], key=("r", "id"), output="columns"
+    ) == {
+        "r": [],
+        "id": [],
+    }
+
+
+def test_columns_output():
+    columns = merge_list_of_dicts_by_key_columnar(
+        VALUES, UPDATES, key="id", default_key="default", output="columns"
+    )
+    assert isinstance(columns["score"], array)
+    assert columns["score"].typecode == "q"
+    assert columns["ratio"][:2] == [0.0, 0.5]
+    assert columns["ratio"][-1] is None
+    assert columns["seen"] == [True] * 23
+    assert len(columns["tags"]) == 23
+    columns = merge_list_of_dicts_by_key_columnar(
+        VALUES, [], key="id", output="columns"
+    )
+    assert columns["ratio"].typecode == "d"
+    big = merge_list_of_dicts_by_key_columnar(
+        [{"id": 1, "n": 2**70}], [], key="id", output="columns"
+    )
+    assert big["n"] == [2**70]
+
+
+def test_type_mismatch():
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_list_of_dicts_by_key_columnar(
+            [{"id": 1, "n": 1}, {"id": 2, "n": "x"}], [{"id": 2, "n": 2}], key="id"
+        )
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_list_of_dicts_by_key_columnar(
+            [{"id": 1, "n": True}], [{"id": 1, "n": 1}], key="id"
+        )
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_list_of_dicts_by_key_columnar(
+            [],
+            [{"id": "d", "n": 1}, {"id": 1, "n": "x"}],
+            key="id",
+            default_key="d",
+        )
+
+
+def test_schema():
+    values = [{"id": 1, "a": 1, "b": 2}]
+    assert merge_list_of_dicts_by_key_columnar(
+        values,
+        [{"id": 1, "b": 3}],
+        key="id",
+        schema=["id", "b", "a"],
+        ordering="insertion",
+    ) == [{"b": 3, "a": 1, "id": 1}]
+    with pytest.raises(ValueError, match="Fields outside of the schema: b"):
+        merge_list_of_dicts_by_key_columnar(values, [], key="id", schema=["a"])
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="Unknown output 'frames'"):
+        merge_list_of_dicts_by_key_columnar([], [], key="id", output="frames")
+    with pytest.raises(ValueError, match="Unknown ordering"):
+        merge_list_of_dicts_by_key_columnar([], [], key="id", ordering="random")
+    with pytest.raises(ValueError, match="default_key requires"):
+        merge_list_of_dicts_by_key_columnar([], [], key=len, default_key="d")
+    with pytest.raises(KeyError, match="Key 'id' not found in update"):
+        merge_list_of_dicts_by_key_columnar([], [{"uid": 1}], key="id")
+
+
+def test_wildcard_merge_functions_merge_row_by_row():
+    merge_functions = {"$.*.n": keep_max}
+    values = [{"id": 1, "a": {"n": 1}, "b": 1}]
+    updates = [{"id": 1, "a": {"n": 0}, "b": 2}]
+    assert merge_list_of_dicts_by_key_columnar(
+        values, updates, key="id", merge_functions=merge_functions
+    ) == merge_list_of_dicts_by_key(
+        values, updates, key="id", merge_functions=merge_functions
+    )
+
+
+def test_columnar_plan():
+    merge_by_id = create_merge_list_of_dicts_by_key_factory(
+        key="id", default_key="default", columnar=True
+    )
+    assert merge_by_id.columnar
+    assert "columnar=True" in repr(merge_by_id)
+    assert merge_by_id(VALUES, UPDATES) == merge_list_of_dicts_by_key(
+        VALUES, UPDATES, key="id", default_key="default"
+    )
+    with pytest.raises(ValueError, match="Columnar merges do not support"):
+        ListMergePlan(key="id", columnar=True, workers=2)
+    with pytest.raises(ValueError, match="Columnar merges do not support"):
+        ListMergePlan(key="id", columnar=True, stats=MergeStats())
+
+
+def test_composite_key_with_mixed_later_fields():
+    values = [{"r": "us", "id": "x"}, {"r": "eu", "id": 1}, {"r": "ap", "id": None}]
+    assert merge_list_of_dicts_by_key_columnar(values, [], key=("r", "id")) == [
+        {"r": "ap", "id": None},
+        {"r": "eu", "id": 1},
+        {"r": "us", "id": "x"},
+    ]
@@ -1,6 +1,8 @@
+import sys
+
 import pytest
 
-from fuso.dicts import merge_dict
+from fuso.dicts import MergePlan, _plain_plan, merge_dict, merge_into, merge_many
 
 
 @pytest.mark.parametrize(
@@ -294,3 +296,333 @@ def test_merge_dict_key_order_none():
     assert result == expected_output
     # Order may vary since no key_order is provided
     assert set(result.keys()) == {"a", "b", "c"}
+
+
+def test_merge_dict_insertion_ordering():
+    original = {"b": 2, "a": {"y": 1, "x": 2}}
+    updates = {"c": 3, "a": {"z": 3, "x": 4}, "b": 5}
+    result = merge_dict(original, updates, ordering="insertion")
+    assert result == {"b": 5, "a": {"y": 1, "x": 4, "z": 3}, "c": 3}
+    assert list(result) == ["b", "a", "c"]
+    assert list(result["a"]) == ["y", "x", "z"]
+
+
+def test_merge_dict_insertion_ordering_with_merge_functions():
+    result = merge_dict(
+        {"b": 2, "a": 1},
+        {"c": 3, "a": 4},
+        merge_functions={"a": lambda o, u: o + u},
+        key_order=["c"],
+        ordering="insertion",
+    )
+    assert list(result.items()) == [("b", 2), ("a", 5), ("c", 3)]
+
+
+def test_merge_dict_no_ordering():
+    result = merge_dict({"b": 2, "a": 1}, {"c": 3, "a": None}, ordering="none")
+    assert result == {"a": 1, "b": 2, "c": 3}
+
+
+def test_merge_dict_unknown_ordering():
+    with pytest.raises(ValueError, match="Unknown ordering 'random'"):
+        merge_dict({}, {}, ordering="random")  # type: ignore[arg-type]
+
+
+def test_merge_dict_reuses_plain_plans():
+    _plain_plan.cache_clear()
+    for _ in range(3):
+        assert merge_dict({"b": [1]}, {"b": [2], "a": 1}, key_order=["b"]) == {
+            "b": [1, 2],
+            "a": 1,
+        }
+        merge_many({"a": 1}, {"a": 2}, key_order=["b"])
+    assert _plain_plan.cache_info().misses == 1
+    assert merge_dict({"a": 1}, {"a": 2}, merge_functions={"a": min}) == {"a": 1}
+    assert _plain_plan.cache_info().currsize == 1
+    with pytest.raises(ValueError, match="Unknown engine"):
+        merge_dict({}, {}, engine="fast")  # type: ignore[arg-type]
+
+
+def _nested(depth, leaf):
+    root = node = {}
+    for _ in range(depth):
+        node["child"] = node = {}
+    node.update(leaf)
+    return root
+
+
+@pytest.mark.parametrize("engine", ["iterative", "recursive"])
+def test_merge_dict_engines_agree(engine):
+    original = {
+        "a": {"x": 1, "y": [1], "z": {"deep": {"keep": True}}},
+        "b": None,
+        "c": "text",
+    }
+    updates = {
+        "a": {"y": [2], "z": {"deep": {"new": 1}, "other": None}, "w": None},
+        "b": {"k": 1},
+        "d": None,
+    }
+    assert merge_dict(original, updates, engine=engine) == {
+        "a": {
+            "x": 1,
+            "y": [1, 2],
+            "z": {"deep": {"keep": True, "new": 1}, "other": None},
+            "w": None,
+        },
+        "b": {"k": 1},
+        "c": "text",
+        "d": None,
+    }
+
+
+def test_merge_dict_iterative_engine_type_mismatch():
+    with pytest.raises(
+        TypeError,
+        match="Cannot merge different types: <class 'str'> and <class 'int'>",
+    ):
+        merge_dict({"a": {"b": {"c": "x"}}}, {"a": {"b": {"c": 1}}})
+
+
+def test_merge_dict_iterative_engine_has_no_depth_limit():
+    depth = sys.getrecursionlimit() * 2
+    original = _nested(depth, {"tags": ["a"], "keep": 1})
+    updates = _nested(depth, {"tags": ["b"]})
+    with pytest.raises(RecursionError):
+        merge_dict(original, updates, engine="recursive")
+    node = merge_dict(original, updates)
+    for _ in range(depth):
+        node = node["child"]
+    assert node == {"tags": ["a", "b"], "keep": 1}
+
+
+def test_merge_dict_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown engine 'magic'"):
+        merge_dict({}, {}, engine="magic")  # type: ignore[arg-type]
+
+
+def test_merge_into_updates_target_in_place():
+    tags = ["user"]
+    profile = {"name": "Alice", "emails": ["a@example.com"]}
+    target = {"tags": tags, "profile": profile, "age": 30}
+    updates = {
+        "tags": ["editor"],
+        "profile": {"emails": ["b@example.com"], "phone": None},
+        "age": None,
+        "team": {"name": "core", "members": ["alice"]},
+    }
+    result = merge_into(target, updates)
+    assert result is target
+    assert target == {
+        "age": 30,
+        "profile": {
+            "emails": ["a@example.com", "b@example.com"],
+            "name": "Alice",
+            "phone": None,
+        },
+        "tags": ["user", "editor"],
+        "team": {"members": ["alice"], "name": "core"},
+    }
+    assert list(target) == ["age", "profile", "tags", "team"]
+    assert target["tags"] is tags
+    assert target["profile"] is profile
+
+
+def test_merge_into_copies_values_from_updates():
+    updates = {"team": {"members": ["alice"], "meta": {"size": 1}}}
+    target = merge_into({}, updates)
+    merge_into(target, {"team": {"members": ["bob"], "meta": {"lead": "bob"}}})
+    assert updates == {"team": {"members": ["alice"], "meta": {"size": 1}}}
+    assert target["team"] == {
+        "members": ["alice", "bob"],
+        "meta": {"size": 1, "lead": "bob"},
+    }
+
+
+def test_merge_into_with_merge_functions():
+    target = {"total": 1, "count": 5, "name": "a"}
+    result = merge_into(
+        target,
+        {"total": 2, "name": "b", "extra": 1},
+        merge_functions={
+            "total": lambda o, u: o + u,
+            "count": lambda o, u: o if u is None else u,
+            "missing": lambda o, u: "never",
+        },
+        ordering="insertion",
+    )
+    assert result is target
+    assert list(target.items()) == [
+        ("total", 3),
+        ("count", 5),
+        ("name", "b"),
+        ("extra", 1),
+    ]
+
+
+def test_merge_into_type_mismatch():
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_into({"a": {"b": [1]}}, {"a": {"b": {"c": 1}}})
+
+
+def test_merge_dict_inplace_folds_updates():
+    accumulator = {}
+    for i in range(3):
+        merge_dict(
+            accumulator,
+            {"ids": [i], "by_id": {str(i): i}},
+            inplace=True,
+            ordering="none",
+        )
+    assert accumulator == {"ids": [0, 1, 2], "by_id": {"0": 0, "1": 1, "2": 2}}
+
+
+def test_merge_dict_inplace_with_post_processor():
+    target = {"b": 1}
+    result = merge_dict(
+        target,
+        {"a": 2},
+        inplace=True,
+        post_processor=lambda d: {**d, "c": 3},
+    )
+    assert result == {"a": 2, "b": 1, "c": 3}
+    assert target == {"a": 2, "b": 1}
+
+
+def test_merge_dict_inplace_requires_iterative_engine():
+    with pytest.raises(ValueError, match="In-place merges require"):
+        merge_dict({}, {}, inplace=True, engine="recursive")
+
+
+def test_merge_dict_copy_on_write_shares_untouched_subtrees():
+    untouched = {"x": {"deep": [1, 2]}}
+    sibling = {"c": 1, "d": [1]}
+    original = {"a": {"b": sibling, "e": untouched}, "f": {"g": 1}}
+    updates = {"a": {"b": {"c": 2}}, "h": {"i": 1}}
+    result = merge_dict(original, updates, copy_on_write=True, ordering="none")
+    assert result == {
+        "a": {"b": {"c": 2, "d": [1]}, "e": untouched},
+        "f": {"g": 1},
+        "h": {"i": 1},
+    }
+    assert result["a"]["e"] is untouched
+    assert result["a"]["b"]["d"] is sibling["d"]
+    assert result["f"] is original["f"]
+    assert result["h"] is updates["h"]
+    assert result["a"] is not original["a"]
+    assert original == {"a": {"b": {"c": 1, "d": [1]}, "e": untouched}, "f": {"g": 1}}
+
+
+def test_merge_dict_copy_on_write_returns_original_without_changes():
+    original = {"a": {"b": {"c": 1}, "tags": ["x"]}, "d": 2}
+    updates = {"a": {"b": {"c": None}, "tags": []}, "d": None}
+    assert merge_dict(original, updates, copy_on_write=True, ordering="none") is (
+        original
+    )
+    result = merge_dict(original, updates, copy_on_write=True)
+    assert result == original
+    assert result["a"] is original["a"]
+
+
+def test_merge_dict_copy_on_write_matches_default_merge():
+    original = {"a": {"x": 1, "y": [1], "z": None}, "b": 1}
+    updates = {"a": {"y": [2], "z": {"k": 1}, "w": None}, "b": 3, "c": None}
+    assert merge_dict(original, updates, copy_on_write=True) == merge_dict(
+        original, updates
+    )
+    assert merge_dict(
+        original,
+        updates,
+        copy_on_write=True,
+        merge_functions={"b": lambda o, u: o + u},
+    ) == {"a": {"x": 1, "y": [1, 2], "z": {"k": 1}, "w": None}, "b": 4, "c": None}
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_dict({"a": {"b": 1}}, {"a": {"b": "x"}}, copy_on_write=True)
+
+
+def test_merge_dict_copy_on_write_invalid_combinations():
+    with pytest.raises(ValueError, match="cannot be both in place and copy-on-write"):
+        merge_dict({}, {}, inplace=True, copy_on_write=True)
+    with pytest.raises(ValueError, match="Copy-on-write merges require"):
+        merge_dict({}, {}, copy_on_write=True, engine="recursive")
+
+
+def test_merge_many_matches_folded_merge_dict():
+    layers = [
+        {"a": {"x": 1, "l": [1]}, "b": 1, "c": None, "t": ["base"]},
+        {"a": {"l": [2], "y": {"k": 1}}, "b": None, "d": None},
+        None,
+        {"a": {"x": 3, "y": {"j": 2}, "l": None}, "c": "set", "t": ["env"]},
+        {"a": {"l": [3]}, "e": {"only": True}, "t": []},
+    ]
+    folded = layers[0]
+    for layer in layers[1:]:
+        folded = merge_dict(folded, layer)
+    result = merge_many(*layers)
+    assert result == folded
+    assert list(result) == list(folded)
+    assert result["a"]["l"] == [1, 2, 3]
+    assert result["e"] is layers[4]["e"]
+
+
+def test_merge_many_with_merge_functions_and_post_processor():
+    calls = []
+
+    def add(old, new):
+        calls.append((old, new))
+        return (old or 0) + (new or 0)
+
+    result = merge_many(
+        {"a": 1},
+        {"b": 2},
+        {"total": 1},
+        {"total": 2, "a": 3},
+        merge_functions={"total": add, "unused": add},
+        post_processor=lambda d: {**d, "count": len(d)},
+        key_order=["total"],
+    )
+    assert calls == [(None, 1), (1, 2)]
+    assert list(result.items()) == [("total", 3), ("a", 3), ("b", 2), ("count", 3)]
+
+
+def test_merge_many_single_layer_and_type_mismatch():
+    assert merge_many({"b": 1, "a": 2}) == {"a": 2, "b": 1}
+    assert merge_many(None) == {}
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_many({"a": {"b": 1}}, {"a": {"b": 2}}, {"a": {"b": "x"}})
+
+
+def test_merge_many_ignores_falsy_merge_functions():
+    merge_functions = {"n": None, "tags": None}
+    layers = [{"n": 1, "tags": ["a"]}, {"n": 2, "tags": ["b"]}, {"tags": ["c"]}]
+    result = merge_many(*layers, merge_functions=merge_functions)
+    assert result == {"n": 2, "tags": ["a", "b", "c"]}
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        merge_many({"n": 1}, {"n": "x"}, merge_functions=merge_functions)
+
+
+def test_merge_plan_merge_many_in_place():
+    plan = MergePlan(inplace=True, ordering="insertion")
+    target = {"tags": ["a"]}
+    assert plan.merge_many(target, {"tags": ["b"]}, {"tags": ["c"], "x": 1}) is target
+    assert target == {"tags": ["a", "b", "c"], "x": 1}
+
+
+def test_merge_plan_merge_with_defaults_matches_two_step_merge():
+    original = {"name": "api", "tags": ["a"], "db": {"host": "x"}, "age": 3, "n": 1}
+    defaults = {"tags": ["d"], "db": {"port": 1}, "age": 5, "env": "prod", "n": None}
+    cases = [None, {}, {"tags": ["u"], "db": {"host": "y"}, "age": 1, "extra": None}]
+    functions = [None, {"age": lambda o, u: max(o or 0, u or 0)}]
+    for merge_functions in functions:
+        for ordering in ("sorted", "insertion"):
+            plan = MergePlan(merge_functions=merge_functions, ordering=ordering)
+            for updates in cases:
+                expected = plan(
+                    original, merge_dict(defaults, updates, ordering="insertion")
+                )
+                result = plan.merge_with_defaults(original, defaults, updates)
+                assert result == expected
+                assert list(result) == list(expected)
+    assert MergePlan().merge_with_defaults(None, {}, None) == {}
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        MergePlan().merge_with_defaults({"a": 1}, {"a": "x"})
@@ -1,7 +1,9 @@
+from fuso.dicts import MergePlan
 from fuso.factories import (
     create_merge_factory,
     create_merge_list_of_dicts_by_key_factory,
 )
+from fuso.lists import ListMergePlan
 
 
 def test_merge_factory():
@@ -52,3 +54,66 @@ def test_merge_list_of_dicts_by_key_factory():
         )
         == expected_output
     )
+
+
+def test_merge_factory_returns_reusable_plan():
+    factory = create_merge_factory(key_order=["b"])
+    assert isinstance(factory, MergePlan)
+    first = factory({"a": 1, "b": 2}, {"c": 3})
+    second = factory({"a": 1}, {"b": None})
+    assert list(first) == ["b", "a", "c"]
+    assert list(second) == ["b", "a"]
+    assert second == {"a": 1, "b": None}
+
+
+def test_merge_factory_with_post_processor():
+    factory = create_merge_factory(
+        merge_functions={"a": lambda o, u: (o or 0) + (u or 0)},
+        post_processor=lambda d: {**d, "total": sum(d.values())},
+    )
+    assert factory({"a": 1, "b": 2}, {"a": 3}) == {"a": 4, "b": 2, "total": 6}
+
+
+def test_merge_factory_explain():
+    def keep_max(old, new):
+        return max(old, new)
+
+    plan = create_merge_factory(
+        merge_functions={"age": keep_max}, key_order=["name", "age"]
+    )
+    explanation = plan.explain()
+    assert "merge path: merge_with_functions" in explanation
+    assert "age -> test_merge_factory_explain.<locals>.keep_max" in explanation
+    assert "key order: name, age" in explanation
+    assert "post processor: (none)" in explanation
+
+    assert "merge path: merge_without_functions" in create_merge_factory().explain()
+
+
+def test_factories_with_ordering():
+    merge = create_merge_factory(key_order=["z"], ordering="insertion")
+    assert list(merge({"b": 1, "a": 2}, {"z": 3})) == ["b", "a", "z"]
+    assert "ordering: insertion" in merge.explain()
+
+    merge_by_id = create_merge_list_of_dicts_by_key_factory(
+        key="id", ordering="insertion"
+    )
+    assert merge_by_id([{"id": 2}], [{"id": 1}]) == [{"id": 2}, {"id": 1}]
+
+
+def test_factories_merge_many():
+    merge = create_merge_factory(
+        merge_functions={"n": lambda o, u: (o or 0) + (u or 0)}
+    )
+    assert merge.merge_many({"n": 1}, {"n": 2}, {"n": 3, "x": [1]}) == {
+        "n": 6,
+        "x": [1],
+    }
+
+    merge_by_id = create_merge_list_of_dicts_by_key_factory(key="id")
+    assert isinstance(merge_by_id, ListMergePlan)
+    assert merge_by_id.merge_many(
+        [{"id": 1, "tags": ["a"]}],
+        [{"id": 1, "tags": ["b"]}],
+        [{"id": 1, "tags": ["c"]}, {"id": 0}],
+    ) == [{"id": 0}, {"id": 1, "tags": ["a", "b", "c"]}]
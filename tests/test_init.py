@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import fuso
+
+# Cumulative microseconds `python -X importtime` may report for `import fuso`.
+IMPORT_TIME_BUDGET = 20_000
+EAGER_MODULES = ("concurrent.futures", "asyncio", "numpy", "pickle")
+
+
+def import_times(code):
+    env = dict(os.environ)
+    src = str(Path(fuso.__file__).parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time_budget():
+    times = import_times("import fuso")
+    assert times["fuso"] <= IMPORT_TIME_BUDGET
+    # Modules the interpreter loads at startup are not imported by fuso.
+    assert times.keys() - import_times("pass").keys() == {"fuso"}
+
+
+def test_submodules_are_loaded_on_first_use():
+    times = import_times("from fuso import merge_dict")
+    assert "fuso.dicts" in times
+    assert "fuso.parallel" not in times
+    assert not [name for name in EAGER_MODULES if name in times]
+
+
+def test_public_names():
+    from fuso.dicts import merge_dict  # noqa: PLC0415
+
+    assert fuso.merge_dict is merge_dict
+    assert set(fuso.__all__) <= set(dir(fuso))
+    for name in fuso.__all__:
+        assert getattr(fuso, name) is not None
+    with pytest.raises(AttributeError, match="has no attribute 'merge_everything'"):
+        fuso.merge_everything  # noqa: B018
+    with pytest.raises(AttributeError, match="has no attribute '__wrapped__'"):
+        fuso.__wrapped__  # noqa: B018
+    assert "TYPE_CHECKING" not in dir(fuso)
+    assert not hasattr(fuso, "TYPE_CHECKING")
+
+
+def test_submodules_after_bare_import():
+    code = (
+        "import fuso; "
+        "assert fuso.utils.sort_dict is fuso.sort_dict; "
+        "assert fuso.dicts.merge_dict is fuso.merge_dict; "
+        "assert fuso.lists.ListMergePlan is fuso.ListMergePlan; "
+        "assert fuso.factories.create_merge_factory is fuso.create_merge_factory"
+    )
+    import_times(code)
+    assert fuso.utils.sort_dict is fuso.sort_dict
@@ -1,6 +1,10 @@
 import pytest
 
-from fuso.lists import merge_list_of_dicts_by_key
+from fuso.lists import (
+    ListMergePlan,
+    merge_list_of_dicts_by_key,
+    merge_many_list_of_dicts_by_key,
+)
 
 
 @pytest.mark.parametrize(
@@ -220,3 +224,188 @@ def test_merge_list_of_dicts_by_key_empty_values():
         {"id": 2, "name": "Bob", "age": 25},
     ]
     assert merge_list_of_dicts_by_key(values, updates, key="id") == expected_output
+
+
+def test_merge_list_of_dicts_by_key_insertion_ordering():
+    values = [
+        {"id": 3, "name": "Charlie"},
+        {"id": 1, "name": "Alice"},
+    ]
+    updates = [
+        {"id": 2, "name": "Bob"},
+        {"id": 1, "age": 31},
+    ]
+    result = merge_list_of_dicts_by_key(values, updates, key="id", ordering="insertion")
+    assert result == [
+        {"id": 3, "name": "Charlie"},
+        {"id": 1, "name": "Alice", "age": 31},
+        {"id": 2, "name": "Bob"},
+    ]
+    assert list(result[1]) == ["name", "age", "id"]
+
+
+def test_merge_list_of_dicts_by_key_passes_unmatched_rows_through():
+    values = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+    updates = [{"id": 1, "age": 31}, {"id": 3, "name": "Charlie"}]
+    for ordering in ("insertion", "none"):
+        result = merge_list_of_dicts_by_key(
+            values, updates, key="id", ordering=ordering
+        )
+        by_id = {item["id"]: item for item in result}
+        assert by_id[2] is values[1]
+        assert by_id[3] is updates[1]
+        assert by_id[1] == {"id": 1, "name": "Alice", "age": 31}
+        assert by_id[1] is not values[0]
+    result = merge_list_of_dicts_by_key(values, updates, key="id")
+    assert result[1] == values[1]
+    assert result[1] is not values[1]
+    result = merge_list_of_dicts_by_key(
+        values,
+        [*updates, {"id": "default", "active": True}],
+        key="id",
+        default_key="default",
+        ordering="insertion",
+    )
+    assert result[1] == {"id": 2, "name": "Bob", "active": True}
+    assert values[1] == {"id": 2, "name": "Bob"}
+    assert values[0] == {"id": 1, "name": "Alice"}
+
+
+def test_merge_list_of_dicts_by_key_no_ordering():
+    values = [{"id": 2, "name": "Bob"}]
+    updates = [{"id": 1, "name": "Alice"}]
+    result = merge_list_of_dicts_by_key(values, updates, key="id", ordering="none")
+    assert sorted(result, key=lambda item: item["id"]) == [
+        {"id": 1, "name": "Alice"},
+        {"id": 2, "name": "Bob"},
+    ]
+
+
+def test_merge_list_of_dicts_by_key_unknown_ordering():
+    with pytest.raises(ValueError, match="Unknown ordering 'random'"):
+        merge_list_of_dicts_by_key([], [], key="id", ordering="random")  # type: ignore[arg-type]
+
+
+def test_merge_many_list_of_dicts_by_key_matches_fold():
+    values = [
+        {"id": 2, "name": "Bob", "tags": ["b"]},
+        {"id": 1, "name": "Alice", "tags": ["a"], "age": 30},
+    ]
+    layers = [
+        [{"id": "default", "tags": ["d1"]}, {"id": 1, "age": 31}],
+        [{"id": 3, "name": "Charlie"}],
+        [{"id": "default", "active": True}, {"id": 2, "tags": ["b2"]}],
+    ]
+    kwargs = {
+        "key": "id",
+        "default_key": "default",
+        "merge_functions": {"age": lambda o, u: max(o or 0, u or 0)},
+    }
+    for ordering in ("sorted", "insertion"):
+        folded = values
+        for layer in layers:
+            folded = merge_list_of_dicts_by_key(
+                folded, layer, ordering=ordering, **kwargs
+            )
+        result = merge_many_list_of_dicts_by_key(
+            values, *layers, ordering=ordering, **kwargs
+        )
+        assert result == folded
+        assert [list(item) for item in result] == [list(item) for item in folded]
+
+
+def test_merge_many_list_of_dicts_by_key_without_updates():
+    values = [{"id": 2, "b": 1, "a": 2}, {"id": 1}]
+    assert merge_many_list_of_dicts_by_key(values, key="id") == (
+        merge_list_of_dicts_by_key(values, [], key="id")
+    )
+
+
+def test_merge_list_of_dicts_by_key_default_does_not_modify_inputs():
+    values = [{"id": 1, "tags": ["a"]}, {"id": 2}]
+    updates = [
+        {"id": "default", "tags": ["d"], "env": "prod"},
+        {"id": 2, "tags": ["b"]},
+    ]
+    result = merge_list_of_dicts_by_key(
+        values, updates, key="id", default_key="default"
+    )
+    assert result == [
+        {"id": 1, "env": "prod", "tags": ["a", "d"]},
+        {"id": 2, "env": "prod", "tags": ["d", "b"]},
+    ]
+    result[1]["tags"].append("x")
+    assert updates[0] == {"id": "default", "tags": ["d"], "env": "prod"}
+    assert values == [{"id": 1, "tags": ["a"]}, {"id": 2}]
+
+
+def test_merge_list_of_dicts_by_key_composite_key():
+    values = [
+        {"region": "us", "account": "a", "id": 1, "plan": "free"},
+        {"region": "eu", "account": "a", "id": 1, "plan": "free", "tags": ["x"]},
+    ]
+    updates = [
+        {"region": "eu", "account": "a", "id": 1, "tags": ["y"]},
+        {"region": "eu", "account": "b", "id": 2, "plan": "pro"},
+        {"region": "*", "account": "*", "id": "*", "active": True},
+    ]
+    key = ("region", "account", "id")
+    result = merge_list_of_dicts_by_key(
+        values, updates, key=key, default_key=("*", "*", "*")
+    )
+    assert result == [
+        {
+            "region": "eu",
+            "account": "a",
+            "id": 1,
+            "plan": "free",
+            "tags": ["x", "y"],
+            "active": True,
+        },
+        {"region": "eu", "account": "b", "id": 2, "plan": "pro", "active": True},
+        {"region": "us", "account": "a", "id": 1, "plan": "free", "active": True},
+    ]
+    assert (
+        merge_many_list_of_dicts_by_key(
+            values, updates[:2], updates[2:], key=key, default_key=("*", "*", "*")
+        )
+        == result
+    )
+    with pytest.raises(KeyError, match="Key 'account' not found in update"):
+        merge_list_of_dicts_by_key(values, [{"region": "eu", "id": 1}], key=key)
+
+
+def test_merge_list_of_dicts_by_key_callable_key():
+    values = [{"email": "Alice@Example.com", "age": 30}, {"email": "bob@x.io"}]
+    updates = [{"email": "alice@example.com", "age": 31}]
+    result = merge_list_of_dicts_by_key(
+        values, updates, key=lambda item: item["email"].lower()
+    )
+    assert result == [
+        {"email": "alice@example.com", "age": 31},
+        {"email": "bob@x.io"},
+    ]
+    with pytest.raises(ValueError, match="default_key requires"):
+        merge_list_of_dicts_by_key(values, updates, key=len, default_key=0)
+    with pytest.raises(ValueError, match="Parallel merges"):
+        ListMergePlan(key=("a", "b"), workers=2)
+
+
+def test_merge_list_of_dicts_by_key_default_with_falsy_merge_function():
+    result = merge_list_of_dicts_by_key(
+        [{"id": 1, "tags": ["a"]}],
+        [{"id": "d", "tags": ["d"]}, {"id": 1, "tags": ["b"]}],
+        key="id",
+        default_key="d",
+        merge_functions={"tags": None},
+    )
+    assert result == [{"id": 1, "tags": ["a", "d", "b"]}]
+
+
+def test_merge_by_composite_key_with_mixed_later_fields():
+    values = [{"r": "us", "id": "x"}, {"r": "eu", "id": 1}]
+    updates = [{"r": "ap", "id": None, "n": 1}]
+    expected = [{"r": "ap", "id": None, "n": 1}, {"r": "eu", "id": 1}, values[0]]
+    key = ("r", "id")
+    assert merge_list_of_dicts_by_key(values, updates, key=key) == expected
+    assert merge_many_list_of_dicts_by_key(values, updates, key=key) == expected
@@ -0,0 +1,71 @@
+import pytest
+
+from fuso.factories import create_merge_list_of_dicts_by_key_factory
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.parallel import merge_list_of_dicts_by_key_sharded
+
+
+def keep_max(old, new):
+    return max(old or 0, new or 0)
+
+
+VALUES = [{"id": i, "score": i, "tags": [f"v{i}"]} for i in range(40)]
+UPDATES = [{"id": "default", "seen": True}] + [
+    {"id": i, "score": 100 - i, "tags": [f"u{i}"]} for i in range(30, 60, 3)
+]
+
+
+@pytest.mark.parametrize("ordering", ["sorted", "insertion"])
+def test_sharded_merge_matches_merge_list_of_dicts_by_key(ordering):
+    kwargs = {
+        "key": "id",
+        "default_key": "default",
+        "merge_functions": {"score": keep_max},
+        "object_key_order": ["id", "tags"],
+        "ordering": ordering,
+    }
+    result = merge_list_of_dicts_by_key_sharded(
+        VALUES, UPDATES, workers=2, chunk_size=7, **kwargs
+    )
+    expected = merge_list_of_dicts_by_key(VALUES, UPDATES, **kwargs)
+    assert result == expected
+    assert [list(item) for item in result] == [list(item) for item in expected]
+
+
+def test_sharded_merge_without_ordering():
+    kwargs = {"key": "id", "default_key": "default"}
+    result = merge_list_of_dicts_by_key_sharded(
+        VALUES, UPDATES, ordering="none", workers=2, chunk_size=7, **kwargs
+    )
+    assert sorted(result, key=lambda item: item["id"]) == (
+        merge_list_of_dicts_by_key(VALUES, UPDATES, **kwargs)
+    )
+
+
+def test_sharded_merge_small_input_runs_inline():
+    result = merge_list_of_dicts_by_key_sharded(
+        [{"id": 1, "f": lambda: None}], [], key="id", workers=4
+    )
+    assert [item["id"] for item in result] == [1]
+
+
+def test_sharded_merge_errors():
+    with pytest.raises(KeyError, match="Key 'id' not found in update"):
+        merge_list_of_dicts_by_key_sharded(
+            VALUES, [{"uid": 1}], key="id", workers=2, chunk_size=5
+        )
+    with pytest.raises(KeyError, match="Duplicate key '1' found for lookup key 'id'"):
+        merge_list_of_dicts_by_key_sharded(
+            [{"id": 1}] * 10, [], key="id", workers=2, chunk_size=5
+        )
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        merge_list_of_dicts_by_key_sharded([], [], key="id", workers=0)
+
+
+def test_list_factory_with_workers():
+    merge_by_id = create_merge_list_of_dicts_by_key_factory(
+        key="id", workers=2, chunk_size=10
+    )
+    assert merge_by_id(VALUES, UPDATES[1:]) == merge_list_of_dicts_by_key(
+        VALUES, UPDATES[1:], key="id"
+    )
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from fuso.dicts import merge_dict
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.patches import diff, diff_list_of_dicts_by_key
+
+
+def test_diff_minimal_patch():
+    shared = {"big": list(range(100))}
+    original = {
+        "name": "api",
+        "db": {"host": "localhost", "port": 5432, "options": {"ssl": False}},
+        "tags": ["a"],
+        "shared": shared,
+        "empty": None,
+    }
+    updated = {
+        "name": "api",
+        "db": {"host": "localhost", "port": 6432, "options": {"ssl": False}},
+        "tags": ["a", "b", "c"],
+        "shared": shared,
+        "empty": {"now": "set"},
+        "new": None,
+    }
+    patch = diff(original, updated)
+    assert patch == {
+        "db": {"port": 6432},
+        "tags": ["b", "c"],
+        "empty": {"now": "set"},
+        "new": None,
+    }
+    assert merge_dict(original, patch) == updated
+    assert diff(original, dict(original)) == {}
+    assert diff(None, {"a": 1}) == {"a": 1}
+    assert diff({}, None) == {}
+
+
+def test_diff_reports_inexpressible_changes():
+    original = {"a": 1, "b": 2, "c": "x", "d": [1, 2], "e": {"f": 1, "g": 1}}
+    updated = {"b": None, "c": 3, "d": [2], "e": {"f": 1}}
+    with pytest.raises(ValueError) as error:
+        diff(original, updated)
+    assert str(error.value) == "\n".join(
+        [
+            "Cannot express the changes as merge updates:",
+            "  a: key was removed",
+            "  b: value was replaced by None",
+            "  c: type changed from str to int",
+            "  d: list does not start with the original list",
+            "  e.g: key was removed",
+        ]
+    )
+
+
+def test_diff_round_trips_random_documents():
+    rng = random.Random(1)
+
+    def value(depth):
+        kind = rng.randrange(4 if depth < 3 else 3)
+        if kind == 0:
+            return rng.randint(0, 3)
+        if kind == 1:
+            return [rng.randint(0, 3) for _ in range(rng.randint(0, 3))]
+        if kind == 2:
+            return None
+        return document(depth + 1)
+
+    def document(depth=0):
+        return {key: value(depth) for key in rng.sample("abcde", rng.randint(0, 4))}
+
+    round_trips = 0
+    for _ in range(500):
+        original = document()
+        try:
+            updated = merge_dict(original, document())
+        except TypeError:
+            continue
+        patch = diff(original, updated)
+        assert merge_dict(original, patch) == updated
+        round_trips += 1
+    assert round_trips > 100
+
+
+def test_diff_list_of_dicts_by_key():
+    values = [
+        {"id": 1, "tags": ["a"]},
+        {"id": 2, "name": "Bob"},
+        {"id": 3, "n": 1},
+    ]
+    updated = [
+        {"id": 3, "n": 1},
+        {"id": 1, "tags": ["a", "b"]},
+        {"id": 2, "name": "Bob"},
+        {"id": 4, "name": "Dan"},
+    ]
+    patch = diff_list_of_dicts_by_key(values, updated, key="id")
+    assert patch == [{"id": 1, "tags": ["b"]}, {"id": 4, "name": "Dan"}]
+    assert merge_list_of_dicts_by_key(values, patch, key="id") == sorted(
+        updated, key=lambda item: item["id"]
+    )
+    assert values[0] == {"id": 1, "tags": ["a"]}
+
+    with pytest.raises(ValueError, match=r"(?s)1.tags: list does not.*3: item was"):
+        diff_list_of_dicts_by_key(values, [{"id": 1, "tags": []}, values[1]], key="id")
@@ -0,0 +1,198 @@
+import pytest
+
+from fuso.dicts import MergePlan, merge_dict, merge_many
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.selectors import compile_selectors, is_selector
+from fuso.state import MergeState
+from fuso.stats import MergeStats
+from fuso.views import MergedView
+
+
+def replace(original, update):
+    return original if update is None else update
+
+
+def test_is_selector():
+    assert is_selector("$.spec.containers")
+    assert is_selector("$.*")
+    assert not is_selector("*")
+    assert not is_selector("example.com")
+    assert not is_selector("labels")
+    assert not is_selector(1)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"stats": MergeStats()}, {"inplace": True}, {"copy_on_write": True}],
+)
+def test_dotted_keys_match_top_level_keys(options):
+    def keep_update(original, update):
+        return update
+
+    merged = merge_dict(
+        {"example.com": ["a"], "*": ["a"]},
+        {"example.com": ["b"], "*": ["b"]},
+        merge_functions={"example.com": keep_update, "*": keep_update},
+        **options,
+    )
+    assert merged == {"*": ["b"], "example.com": ["b"]}
+    merged = merge_list_of_dicts_by_key(
+        [{"id": 1, "v1.2": ["a"]}],
+        [{"id": 1, "v1.2": ["b"]}],
+        key="id",
+        merge_functions={"v1.2": keep_update},
+    )
+    assert merged == [{"id": 1, "v1.2": ["b"]}]
+    merged = merge_dict(
+        {"a.b": [{"id": 1, "n": 1}], "a": {"b": [{"id": 1}]}},
+        {"a.b": [{"id": 1, "n": 2}], "a": {"b": [{"id": 1}]}},
+        list_keys={"a.b": "id"},
+    )
+    assert merged == {"a": {"b": [{"id": 1}, {"id": 1}]}, "a.b": [{"id": 1, "n": 2}]}
+
+
+def test_compile_selectors_precedence():
+    root = compile_selectors(
+        {"$.**.labels": "globstar", "$.*.labels": "star", "$.spec.labels": "literal"}
+    )
+    assert root.step("spec").step("labels").function == "literal"
+    assert root.step("meta").step("labels").function == "star"
+    assert root.step("a").step("b").step("labels").function == "globstar"
+    assert root.step("labels").function == "globstar"
+    assert root.step("spec").step("other").function is None
+    assert root.step("meta") is root.step("other")
+    assert compile_selectors({"a": None}) is None
+    leaf = compile_selectors({"$.a.b": max}).step("a").step("b")
+    assert not leaf.live
+    assert leaf.step("c") is None
+
+
+def test_merge_dict_with_path_selectors():
+    original = {
+        "spec": {"containers": ["app"], "tags": ["a"], "labels": {"x": 1}},
+        "meta": {"tags": ["m"], "labels": {"x": 1}, "deep": {"labels": {"y": 1}}},
+        "labels": {"top": 1},
+        "age": 30,
+    }
+    updates = {
+        "spec": {"containers": ["sidecar"], "tags": ["b"], "labels": {"z": 2}},
+        "meta": {"tags": ["n"], "labels": {"z": 2}, "deep": {"labels": {"z": 2}}},
+        "labels": {"top": 2},
+        "age": 25,
+    }
+    merged = merge_dict(
+        original,
+        updates,
+        merge_functions={
+            "$.spec.containers": replace,
+            "$.*.tags": replace,
+            "$.**.labels": replace,
+            "age": max,
+        },
+    )
+    assert merged == {
+        "age": 30,
+        "labels": {"top": 2},
+        "meta": {"deep": {"labels": {"z": 2}}, "labels": {"z": 2}, "tags": ["n"]},
+        "spec": {"containers": ["sidecar"], "labels": {"z": 2}, "tags": ["b"]},
+    }
+    assert original["spec"]["containers"] == ["app"]
+
+
+def test_path_selectors_only_apply_where_both_sides_have_the_parent():
+    plan = MergePlan(merge_functions={"$.a.b": lambda o, u: "f"}, ordering="insertion")
+    assert plan({"a": {"b": 1, "c": 1}}, {"a": {"c": 2}}) == {"a": {"b": "f", "c": 2}}
+    assert plan({}, {"a": {"b": 1}}) == {"a": {"b": 1}}
+    assert plan({"a": {"b": 1}}, {}) == {"a": {"b": 1}}
+    assert plan.merge_many({"a": {"b": 1}}, {"a": {}}, {"a": {}}) == {"a": {"b": "f"}}
+    assert merge_many(
+        {"a": {"b": 1}}, {"a": {}}, merge_functions={"$.a.b": lambda o, u: "f"}
+    ) == {"a": {"b": "f"}}
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        plan({"x": {"y": 1}}, {"x": [1]})
+    assert "merge path: merge_with_selectors" in plan.explain()
+
+
+def test_path_selectors_unsupported():
+    for options in ({"inplace": True}, {"copy_on_write": True}):
+        with pytest.raises(ValueError, match="Path selectors"):
+            MergePlan(merge_functions={"$.a.b": max}, **options)
+    with pytest.raises(ValueError, match="does not support path selectors"):
+        MergedView({}, merge_functions={"$.a.b": max})
+    with pytest.raises(ValueError, match="does not support path selectors"):
+        MergeState({}, merge_functions={"$.**.b": max})
+
+
+def test_list_keys_merge_nested_lists_by_key():
+    original = {
+        "spec": {
+            "containers": [
+                {"name": "app", "image": "app:1", "env": [{"name": "A", "value": 1}]},
+                {"name": "sidecar", "image": "proxy:1"},
+            ],
+            "volumes": [{"name": "data"}],
+        }
+    }
+    updates = {
+        "spec": {
+            "containers": [
+                {"name": "app", "image": "app:2", "env": [{"name": "A", "value": 2}]},
+                {"name": "debug", "image": "busybox"},
+            ],
+            "volumes": [{"name": "data"}],
+        }
+    }
+    merged = merge_dict(
+        original,
+        updates,
+        list_keys={"$.spec.containers": "name", "$.spec.containers.env": "name"},
+    )
+    assert merged["spec"]["containers"] == [
+        {"name": "app", "image": "app:2", "env": [{"name": "A", "value": 2}]},
+        {"name": "sidecar", "image": "proxy:1"},
+        {"name": "debug", "image": "busybox"},
+    ]
+    assert merged["spec"]["volumes"] == [{"name": "data"}, {"name": "data"}]
+    assert original["spec"]["containers"][0]["image"] == "app:1"
+    merged = merge_dict(
+        original,
+        updates,
+        merge_functions={"$.spec.volumes": replace},
+        list_keys={"$.**.containers": "name", "$.spec.volumes": "name"},
+    )
+    assert merged["spec"]["volumes"] == [{"name": "data"}]
+    assert merged["spec"]["containers"][0]["env"] == [
+        {"name": "A", "value": 1},
+        {"name": "A", "value": 2},
+    ]
+
+
+def test_list_keys_layers_and_defaults():
+    plan = MergePlan(list_keys={"items": ("kind", "name")}, ordering="insertion")
+    layers = [
+        {"items": [{"kind": "a", "name": "x", "n": 1}]},
+        {"items": [{"kind": "a", "name": "x", "n": 2}, {"kind": "b", "name": "x"}]},
+        {"items": [{"kind": "b", "name": "x", "n": 3}]},
+    ]
+    expected = {
+        "items": [
+            {"kind": "a", "name": "x", "n": 2},
+            {"kind": "b", "name": "x", "n": 3},
+        ]
+    }
+    assert plan.merge_many(*layers) == expected
+    assert plan(plan(layers[0], layers[1]), layers[2]) == expected
+    assert plan.merge_with_defaults(layers[0], layers[1], layers[2]) == expected
+    assert "items by ('kind', 'name')" in plan.explain()
+
+
+def test_list_keys_errors():
+    plan = MergePlan(list_keys={"items": "id"})
+    with pytest.raises(KeyError, match="Key 'id' not found in update"):
+        plan({"items": [{"id": 1}]}, {"items": [{"name": 1}]})
+    with pytest.raises(KeyError, match="Duplicate key '1' found for lookup key 'id'"):
+        plan({"items": [{"id": 1}, {"id": 1}]}, {"items": [{"id": 2}]})
+    with pytest.raises(KeyError, match="Duplicate key '2' found for lookup key 'id'"):
+        plan({"items": [{"id": 1}]}, {"items": [{"id": 2}, {"id": 2}]})
+    with pytest.raises(ValueError, match="list keys"):
+        MergePlan(list_keys={"items": "id"}, inplace=True)
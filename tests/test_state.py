@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from fuso.dicts import merge_many
+from fuso.state import MergeState
+
+
+def _assert_matches_full_merge(state, **kwargs):
+    expected = merge_many(*state.layers, **kwargs)
+    assert state.result == expected
+    stack = [(state.result, expected)]
+    while stack:
+        result, full = stack.pop()
+        assert list(result) == list(full)
+        stack.extend(
+            (result[key], value)
+            for key, value in full.items()
+            if isinstance(value, dict)
+        )
+
+
+def test_merge_state_update_reports_changed_paths():
+    base = {"db": {"host": "localhost", "port": 5432}, "tags": ["base"], "debug": False}
+    override = {"db": {"port": 6432}, "tags": ["tenant"]}
+    state = MergeState(base, override)
+    assert state.result == merge_many(base, override)
+
+    assert state.update(1, {"db": {"port": 7432}, "tags": ["tenant"]}) == [
+        ("db", "port")
+    ]
+    assert state.result["db"] == {"host": "localhost", "port": 7432}
+    assert sorted(state.update(1, {"db": {"port": 7432, "user": "app"}})) == [
+        ("db", "user"),
+        ("tags",),
+    ]
+    assert state.result["tags"] == ["base"]
+    assert state.update(1, {"db": {"port": 7432, "user": "app"}}) == []
+    assert state.update(1, {"db": {"host": "localhost"}}) == [
+        ("db", "port"),
+        ("db", "user"),
+    ]
+    assert state.result["db"] == {"host": "localhost", "port": 5432}
+    assert base == {
+        "db": {"host": "localhost", "port": 5432},
+        "tags": ["base"],
+        "debug": False,
+    }
+    _assert_matches_full_merge(state)
+
+
+def test_merge_state_does_not_modify_layers():
+    first = {"a": {"b": {"x": 1}}}
+    second = {"a": {"c": 1}}
+    state = MergeState(first, second)
+    state.update(1, {"a": {"c": 1, "b": {"y": 2}}})
+    state.update(0, {"a": {"b": {"x": 2}}})
+    assert first == {"a": {"b": {"x": 1}}}
+    assert second == {"a": {"c": 1}}
+    assert state.result == {"a": {"b": {"x": 2, "y": 2}, "c": 1}}
+
+
+def test_merge_state_key_order_matches_full_merge():
+    layers = [{"a": {"x": 1}, "b": 1}, {"a": {"y": 1}, "c": 1}, {"a": {"x": 2}}]
+    for ordering in ("sorted", "insertion"):
+        state = MergeState(*layers, ordering=ordering)
+        state.update(1, {"a": {"z": 1, "y": 1}, "0": 1})
+        _assert_matches_full_merge(state, ordering=ordering)
+        state.update(0, {"a": {"q": 1}})
+        _assert_matches_full_merge(state, ordering=ordering)
+
+
+def test_merge_state_update_follows_reordered_keys():
+    state = MergeState({}, {"b": {"x": 1, "y": 2}})
+    assert sorted(state.update(1, {"b": {"y": 3, "x": 4}})) == [("b", "x"), ("b", "y")]
+    assert list(state.result["b"]) == list(merge_many({}, {"b": {"y": 3, "x": 4}})["b"])
+    _assert_matches_full_merge(state)
+    state.update(0, {"b": {"y": 0}, "a": 1})
+    state.update(0, {"a": 1, "b": {"x": 0}})
+    _assert_matches_full_merge(state)
+    functions = MergeState(
+        {"b": {"x": 1}}, {"b": {"y": 1}}, merge_functions={"b": lambda o, u: {**u, **o}}
+    )
+    functions.update(0, {"b": {"z": 1, "x": 1}})
+    _assert_matches_full_merge(
+        functions, merge_functions={"b": lambda o, u: {**u, **o}}
+    )
+
+
+def test_merge_state_random_updates_match_full_merge():
+    rng = random.Random(0)
+
+    def layer():
+        return {
+            key: rng.choice(
+                [
+                    None,
+                    rng.randint(0, 3),
+                    [rng.randint(0, 3)],
+                    {key: rng.randint(0, 3) for key in rng.sample("xyz", 2)},
+                ]
+            )
+            for key in rng.sample("abcdef", rng.randint(0, 4))
+        }
+
+    def valid(layers):
+        try:
+            merge_many(*layers)
+        except TypeError:
+            return False
+        return True
+
+    for ordering in ("sorted", "insertion"):
+        layers = [{"a": {"x": 1}}, {}, {}]
+        state = MergeState(*layers, ordering=ordering)
+        for _ in range(200):
+            index = rng.randrange(3)
+            new_layer = layer()
+            candidate = list(state.layers)
+            candidate[index] = new_layer
+            if not valid(candidate):
+                continue
+            state.update(index, new_layer)
+            _assert_matches_full_merge(state, ordering=ordering)
+
+
+def test_merge_state_merge_functions():
+    state = MergeState({"n": 1}, {"n": 5}, merge_functions={"n": max})
+    assert state.result == {"n": 5}
+    assert state.update(1, {"n": 0}) == [("n",)]
+    assert state.result == {"n": 1}
+    single = MergeState({"n": 1}, merge_functions={"n": lambda o, u: (o, u)})
+    assert single.update(0, {"n": 2}) == [("n",)]
+    assert single.result == {"n": (2, None)}
+    assert single.update(0, {}) == [("n",)]
+    assert single.result == {}
+
+
+def test_merge_state_type_error_leaves_state_unchanged():
+    state = MergeState({"a": {"b": 1}}, {"a": {"c": 1}})
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        state.update(1, {"a": 5})
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        MergeState({"a": 1}, {"a": {"b": {}}}, {"a": None}).update(
+            2, {"a": {"b": {"c": 1}}}
+        )
+    assert state.result == {"a": {"b": 1, "c": 1}}
+    assert state.layers == ({"a": {"b": 1}}, {"a": {"c": 1}})
+    assert repr(MergeState()) == "MergeState(layers=0, keys=0)"
+    with pytest.raises(IndexError):
+        MergeState().update(0, {})
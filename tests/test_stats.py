@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from fuso.dicts import MergePlan, merge_dict
+from fuso.factories import (
+    create_merge_factory,
+    create_merge_list_of_dicts_by_key_factory,
+)
+from fuso.lists import ListMergePlan, merge_list_of_dicts_by_key
+from fuso.stats import MergeStats
+
+
+def test_merge_stats_merge_dict():
+    stats = MergeStats()
+    original = {"a": {"x": 1, "y": [1, 2]}, "b": 1, "c": None}
+    updates = {"a": {"y": [3]}, "b": 2, "d": None}
+    merged = merge_dict(original, updates, merge_functions={"b": max}, stats=stats)
+    assert merged == merge_dict(original, updates, merge_functions={"b": max})
+    assert stats.merges == 1
+    assert stats.merge_function_calls == {"b": 1}
+    assert set(stats.merge_function_time) == {"b"}
+    assert set(stats.key_time) == {"a", "b", "c", "d"}
+    assert stats.list_items_copied == 3
+    # "a", "a.y", "c" and "d"; "b" is handled by its merge function.
+    assert stats.nodes == 4
+    assert stats.sorts == 1
+    assert stats.merge_time >= 0
+    assert stats.sort_time >= 0
+
+
+def test_merge_stats_accumulate_and_reset():
+    stats = MergeStats()
+    plan = create_merge_factory(ordering="insertion", stats=stats)
+    plan({"a": 1}, {"a": 2})
+    plan.merge_many({"a": 1}, {"a": 2}, {"b": 3})
+    assert stats.merges == 3
+    assert stats.sorts == 0
+    assert "merge path: merge_with_stats" in plan.explain()
+    stats.reset()
+    assert stats.merges == 0
+    assert not stats.key_time
+
+
+def test_merge_stats_keyed_lists():
+    stats = MergeStats()
+    values = [{"id": 1, "tags": ["a"]}, {"id": 2}]
+    updates = [{"id": "default", "env": "prod"}, {"id": 1, "tags": ["b"]}]
+    kwargs = {"key": "id", "default_key": "default"}
+    expected = merge_list_of_dicts_by_key(values, updates, **kwargs)
+    assert merge_list_of_dicts_by_key(values, updates, stats=stats, **kwargs) == (
+        expected
+    )
+    assert stats.merges == 2
+    # One sort per item and one for the list.
+    assert stats.sorts == 3
+    factory = create_merge_list_of_dicts_by_key_factory(stats=stats, **kwargs)
+    assert factory(values, updates) == expected
+    assert stats.merges == 4
+    exported = stats.as_dict()
+    assert json.loads(json.dumps(exported)) == exported
+    assert set(exported["key_time"]) == {"env", "tags"}
+
+
+def test_merge_stats_unsupported():
+    with pytest.raises(ValueError, match="in-place or copy-on-write"):
+        MergePlan(inplace=True, stats=MergeStats())
+    with pytest.raises(ValueError, match="in-place or copy-on-write"):
+        MergePlan(copy_on_write=True, stats=MergeStats())
+    with pytest.raises(ValueError, match="across worker processes"):
+        ListMergePlan(key="id", workers=2, stats=MergeStats())
+    assert repr(MergeStats()).startswith("MergeStats(merges=0")
@@ -0,0 +1,204 @@
+from collections import Counter, OrderedDict, defaultdict
+
+import pytest
+
+from fuso.dicts import MergePlan, merge_dict, merge_many
+from fuso.factories import create_merge_factory
+from fuso.strategies import (
+    MERGE_MAPPING,
+    StrategyRegistry,
+    keep_last,
+    ordered_union,
+    prepend,
+    replace,
+    union_by,
+)
+
+
+def test_builtin_strategies():
+    original = {
+        "tags": ("a",),
+        "roles": {"admin"},
+        "flags": frozenset({"x"}),
+        "hits": Counter(a=1),
+        "items": [1],
+        "name": "old",
+    }
+    updates = {
+        "tags": ("b",),
+        "roles": {"editor"},
+        "flags": frozenset({"y"}),
+        "hits": Counter(a=2, b=1),
+        "items": [2],
+        "name": "new",
+    }
+    merged = merge_dict(original, updates, strategies=StrategyRegistry())
+    assert merged == {
+        "flags": frozenset({"x", "y"}),
+        "hits": Counter(a=3, b=1),
+        "items": [1, 2],
+        "name": "new",
+        "roles": {"admin", "editor"},
+        "tags": ("a", "b"),
+    }
+    assert original["roles"] == {"admin"}
+    assert original["hits"] == Counter(a=1)
+
+
+def test_mapping_subclasses_are_preserved():
+    original = {
+        "ordered": OrderedDict(b=1, a={"x": [1]}),
+        "default": defaultdict(list, a=[1]),
+    }
+    updates = {
+        "ordered": OrderedDict(a={"x": [2]}, c=3),
+        "default": defaultdict(list, a=[2]),
+    }
+    merged = merge_dict(original, updates, strategies=StrategyRegistry())
+    assert type(merged["ordered"]) is OrderedDict
+    assert list(merged["ordered"].items()) == [("b", 1), ("a", {"x": [1, 2]}), ("c", 3)]
+    assert type(merged["default"]) is defaultdict
+    assert merged["default"].default_factory is list
+    assert merged["default"] == {"a": [1, 2]}
+    assert original["ordered"]["a"] == {"x": [1]}
+
+
+def test_none_and_type_mismatch():
+    strategies = StrategyRegistry()
+    merged = merge_dict(
+        {"a": {"b": {1}, "c": None}},
+        {"a": {"b": None, "c": {2}, "d": None}},
+        strategies=strategies,
+    )
+    assert merged == {"a": {"b": {1}, "c": {2}, "d": None}}
+    with pytest.raises(TypeError):
+        merge_dict({"a": {"b": {1}}}, {"a": {"b": [1]}}, strategies=strategies)
+    with pytest.raises(TypeError):
+        strategies.merge({1}, (1,))
+
+
+def test_without_builtins_values_are_replaced():
+    strategies = StrategyRegistry(builtins=False)
+    assert strategies.lookup(dict) is None
+    assert strategies.merge({"a": [1]}, {"b": [2]}) == {"b": [2]}
+    strategies.register(dict, MERGE_MAPPING)
+    assert strategies.merge({"a": [1]}, {"a": [2]}) == {"a": [2]}
+
+
+def test_lookup_follows_mro_and_is_cached():
+    class Tags(set):
+        pass
+
+    strategies = StrategyRegistry()
+    assert strategies.lookup(Tags) is strategies.lookup(set)
+    assert strategies.merge(Tags({"a"}), Tags({"b"})) == {"a", "b"}
+    assert strategies.lookup(str) is None
+
+    def keep(original, update):
+        return original
+
+    strategies.register(Tags, keep)
+    assert strategies.lookup(Tags) is keep
+    strategies.register(str, keep)
+    assert merge_dict({"a": "x"}, {"a": "y"}, strategies=strategies) == {"a": "x"}
+
+
+def test_plans_fold_layers_with_strategies():
+    strategies = StrategyRegistry()
+    plan = MergePlan(merge_functions={"n": max}, strategies=strategies)
+    layers = [{"s": {1}, "n": 1}, {"s": {2}, "n": 3}, {"s": {3}, "n": 2}]
+    assert plan.merge_many(*layers) == {"n": 3, "s": {1, 2, 3}}
+    assert merge_many(*layers[:2]) == {"n": 3, "s": {2}}
+    merged = plan.merge_with_defaults({"s": {1}}, {"s": {2}}, {"s": {3}})
+    assert merged == {"s": {1, 2, 3}}
+    assert "StrategyRegistry(" in plan.explain()
+
+
+def test_strategies_option_validation():
+    with pytest.raises(ValueError, match="Type strategies"):
+        create_merge_factory(inplace=True, strategies=StrategyRegistry())
+    with pytest.raises(ValueError, match="Type strategies"):
+        MergePlan(copy_on_write=True, strategies=StrategyRegistry())
+
+
+def test_ordered_union():
+    assert ordered_union(["a", "b", "a"], ["c", "b"]) == ["a", "b", "c"]
+    assert ordered_union(None, ["a", "a"]) == ["a"]
+    assert ordered_union(["a"], None) == ["a"]
+    assert ordered_union(None, None) is None
+    items = [{"a": [1]}, {"a": [1]}, [1], (1,), (1,), [1], {"a": (1,)}]
+    assert ordered_union(items, [{"a": [1]}, ([2],), ([2],)]) == [
+        {"a": [1]},
+        [1],
+        (1,),
+        {"a": (1,)},
+        ([2],),
+    ]
+
+
+def test_ordered_union_unfreezable_items():
+    class Item:
+        __hash__ = None
+
+        def __init__(self, value):
+            self.value = value
+
+        def __eq__(self, other):
+            return isinstance(other, Item) and other.value == self.value
+
+    merged = ordered_union([Item(1), Item(2)], [Item(1), Item(3), "x", "x"])
+    assert [getattr(item, "value", item) for item in merged] == [1, 2, 3, "x"]
+
+
+def test_union_by():
+    by_id = union_by("id")
+    assert by_id([{"id": 1, "v": "a"}], [{"id": 1, "v": "b"}, {"id": 2}]) == [
+        {"id": 1, "v": "a"},
+        {"id": 2},
+    ]
+    by_lower = union_by(str.lower)
+    assert by_lower(["A", "b"], ["a", "B", "c"]) == ["A", "b", "c"]
+    by_tags = union_by(lambda item: item["tags"])
+    assert by_tags([{"tags": ["x"]}], [{"tags": ["x"]}, {"tags": ["y"]}]) == [
+        {"tags": ["x"]},
+        {"tags": ["y"]},
+    ]
+    assert by_id(None, None) is None
+
+
+def test_replace_prepend_keep_last():
+    assert replace([1], [2]) == [2]
+    assert replace([1], None) == [1]
+    assert prepend([1, 2], [3]) == [3, 1, 2]
+    assert prepend(None, [3]) == [3]
+    assert prepend(None, None) is None
+    last_three = keep_last(3)
+    assert last_three([1, 2, 3], [4, 5]) == [3, 4, 5]
+    assert last_three([1], [2]) == [1, 2]
+    assert last_three(None, [1, 2, 3, 4]) == [2, 3, 4]
+    assert last_three([1, 2, 3, 4], None) == [2, 3, 4]
+    assert last_three(None, None) is None
+    assert keep_last(0)([1], [2]) == []
+    with pytest.raises(ValueError, match="must not be negative"):
+        keep_last(-1)
+
+
+def test_list_strategies_per_key_and_globally():
+    original = {"tags": ["a", "b"], "meta": {"tags": ["x"], "log": [1, 2]}}
+    updates = {"tags": ["b", "c"], "meta": {"tags": ["x", "y"], "log": [3]}}
+    merged = merge_dict(
+        original,
+        updates,
+        merge_functions={"tags": ordered_union, "$.meta.log": keep_last(2)},
+    )
+    assert merged == {
+        "meta": {"log": [2, 3], "tags": ["x", "x", "y"]},
+        "tags": ["a", "b", "c"],
+    }
+    strategies = StrategyRegistry()
+    strategies.register(list, ordered_union)
+    merged = merge_dict(original, updates, strategies=strategies)
+    assert merged == {
+        "meta": {"log": [1, 2, 3], "tags": ["x", "y"]},
+        "tags": ["a", "b", "c"],
+    }
@@ -0,0 +1,99 @@
+import pytest
+
+from fuso.lists import merge_list_of_dicts_by_key
+from fuso.streams import iter_merge_list_of_dicts_by_key
+
+VALUES = [
+    {"id": 1, "name": "Alice", "tags": ["user"]},
+    {"id": 3, "name": "Charlie", "tags": ["user"]},
+    {"id": 4, "name": "Dana"},
+]
+UPDATES = [
+    {"id": "default", "active": True},
+    {"id": 2, "name": "Bob"},
+    {"id": 3, "tags": ["admin"]},
+    {"id": 5, "name": "Eve"},
+]
+
+
+def test_iter_merge_hash_join_matches_list_merge():
+    merged = iter_merge_list_of_dicts_by_key(
+        iter(VALUES), iter(UPDATES), key="id", default_key="default"
+    )
+    expected = merge_list_of_dicts_by_key(
+        VALUES, UPDATES, key="id", default_key="default", ordering="insertion"
+    )
+    assert list(merged) == expected
+    assert [item["id"] for item in expected] == [1, 3, 4, 2, 5]
+
+
+def test_iter_merge_presorted_matches_list_merge():
+    merged = iter_merge_list_of_dicts_by_key(
+        (row for row in VALUES),
+        (row for row in UPDATES),
+        key="id",
+        default_key="default",
+        merge_functions={"name": lambda o, u: (u or o).upper()},
+        presorted=True,
+    )
+    assert list(merged) == merge_list_of_dicts_by_key(
+        VALUES,
+        UPDATES,
+        key="id",
+        default_key="default",
+        merge_functions={"name": lambda o, u: (u or o).upper()},
+    )
+
+
+def test_iter_merge_is_lazy():
+    consumed = []
+
+    def values():
+        for i in range(1_000_000):
+            consumed.append(i)
+            yield {"id": i}
+
+    merged = iter_merge_list_of_dicts_by_key(
+        values(), iter([{"id": 1, "x": 1}]), key="id", presorted=True
+    )
+    assert next(merged) == {"id": 0}
+    assert next(merged) == {"id": 1, "x": 1}
+    assert len(consumed) == 2
+
+
+def test_iter_merge_presorted_rejects_unsorted_input():
+    merged = iter_merge_list_of_dicts_by_key(
+        [{"id": 2}, {"id": 1}], [], key="id", presorted=True
+    )
+    with pytest.raises(ValueError, match="Values are not sorted by 'id': 1 follows 2"):
+        list(merged)
+
+
+def test_iter_merge_presorted_rejects_late_default():
+    merged = iter_merge_list_of_dicts_by_key(
+        [{"id": "a"}],
+        [{"id": "a"}, {"id": "default"}],
+        key="id",
+        default_key="default",
+        presorted=True,
+    )
+    with pytest.raises(ValueError, match="must be the first item"):
+        list(merged)
+
+
+@pytest.mark.parametrize("presorted", [True, False])
+def test_iter_merge_duplicate_and_missing_keys(presorted):
+    with pytest.raises(KeyError, match="Duplicate key '1' found for lookup key 'id'"):
+        list(
+            iter_merge_list_of_dicts_by_key(
+                [], [{"id": 1}, {"id": 1}], key="id", presorted=presorted
+            )
+        )
+    with pytest.raises(
+        KeyError, match="Key 'id' not found in value. Available keys: uid"
+    ):
+        list(
+            iter_merge_list_of_dicts_by_key(
+                [{"uid": 1}], [], key="id", presorted=presorted
+            )
+        )
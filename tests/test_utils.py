@@ -1,6 +1,12 @@
 import pytest
 
-from fuso.utils import sort_dict, sort_list_of_dicts_by_key, to_list_of_dicts_by_key
+from fuso.utils import (
+    RowView,
+    _key_ranks,
+    sort_dict,
+    sort_list_of_dicts_by_key,
+    to_list_of_dicts_by_key,
+)
 
 
 def test_list_to_dict_by_key():
@@ -51,6 +57,58 @@ def test_list_to_dict_by_key_duplicate_key():
         to_list_of_dicts_by_key(input_data, key="id")
 
 
+def test_list_to_dict_by_key_composite_and_callable_keys():
+    input_data = [
+        {"region": "eu", "id": 1, "name": "Alice"},
+        {"region": "us", "id": 1, "name": "Bob"},
+    ]
+    assert to_list_of_dicts_by_key(input_data, key=("region", "id")) == {
+        ("eu", 1): {"name": "Alice"},
+        ("us", 1): {"name": "Bob"},
+    }
+    assert to_list_of_dicts_by_key(input_data, key=("region",)) == {
+        ("eu",): {"id": 1, "name": "Alice"},
+        ("us",): {"id": 1, "name": "Bob"},
+    }
+    by_name = to_list_of_dicts_by_key(input_data, key=lambda item: item["name"][0])
+    assert by_name["A"] == input_data[0]
+    view = to_list_of_dicts_by_key(input_data, key=("region", "id"), copy=False)[
+        ("eu", 1)
+    ]
+    assert view == {"name": "Alice"}
+    assert len(view) == 1
+    with pytest.raises(KeyError, match="Key 'id' not found in value"):
+        to_list_of_dicts_by_key([{"region": "eu"}], key=("region", "id"))
+    with pytest.raises(KeyError, match="Duplicate key '\\('eu', 1\\)'"):
+        to_list_of_dicts_by_key(input_data[:1] * 2, key=("region", "id"))
+
+
+def test_list_to_dict_by_key_without_copy():
+    input_data = [
+        {"id": 1, "name": "Alice", "age": 30},
+        {"id": 2, "name": "Bob"},
+    ]
+    index = to_list_of_dicts_by_key(input_data, key="id", copy=False)
+    view = index[1]
+    assert isinstance(view, RowView)
+    assert view.row is input_data[0]
+    assert view == {"name": "Alice", "age": 30}
+    assert list(view) == ["name", "age"]
+    assert len(view) == 2
+    assert "id" not in view
+    assert "name" in view
+    with pytest.raises(KeyError):
+        view["id"]
+    copied = view.copy()
+    assert copied == {"name": "Alice", "age": 30}
+    assert type(copied) is dict
+    assert repr(index[2]) == "RowView({'name': 'Bob'})"
+    input_data[1]["age"] = 25
+    assert index[2] == {"name": "Bob", "age": 25}
+    with pytest.raises(KeyError, match="Duplicate key '1' found for lookup key 'id'"):
+        to_list_of_dicts_by_key([input_data[0], input_data[0]], key="id", copy=False)
+
+
 @pytest.mark.parametrize(
     "value,key_order,expected_keys",
     [
@@ -96,3 +154,64 @@ def test_sort_list_of_dicts_by_key():
     ]
     sorted_list = sort_list_of_dicts_by_key(input_list, key="name")
     assert [item["name"] for item in sorted_list] == ["a", "b", "c"]
+
+
+def test_sort_list_of_dicts_by_composite_and_callable_keys():
+    values = [
+        {"region": "us", "id": 1},
+        {"region": "eu", "id": 2},
+        {"region": "eu", "id": 1},
+    ]
+    assert sort_list_of_dicts_by_key(values, key=("region", "id")) == [
+        {"region": "eu", "id": 1},
+        {"region": "eu", "id": 2},
+        {"region": "us", "id": 1},
+    ]
+    assert sort_list_of_dicts_by_key(values, key=("region", "id"), reverse=True) == [
+        {"region": "us", "id": 1},
+        {"region": "eu", "id": 2},
+        {"region": "eu", "id": 1},
+    ]
+    assert sort_list_of_dicts_by_key(
+        values, key=lambda item: -item["id"], reverse=True
+    ) == [values[0], values[2], values[1]]
+
+
+def test_sort_dict_wide():
+    value = {f"k{i:05}": i for i in reversed(range(5000))}
+    key_order = ["k04999", "missing", "k00010", "k04999"]
+    keys = list(sort_dict(value, key_order))
+    assert keys[:2] == ["k04999", "k00010"]
+    assert keys[2:] == sorted(k for k in value if k not in key_order)
+
+
+def test_sort_dict_key_order_longer_than_dict():
+    value = {"b": 2, "a": 1, "z": 0}
+    key_order = [f"x{i}" for i in range(100)] + ["z", "b"]
+    assert list(sort_dict(value, key_order)) == ["z", "b", "a"]
+
+
+def test_sort_dict_reuses_rank_table():
+    key_order = ["c", "a"]
+    sort_dict({"a": 1, "c": 2}, key_order)
+    hits = _key_ranks.cache_info().hits
+    assert list(sort_dict({"b": 1, "a": 2, "c": 3}, list(key_order))) == [
+        "c",
+        "a",
+        "b",
+    ]
+    assert _key_ranks.cache_info().hits == hits + 1
+
+
+def test_sort_by_composite_key_with_mixed_later_fields():
+    values = [
+        {"r": "us", "id": "x"},
+        {"r": "eu", "id": 1},
+        {"r": "ap", "id": None},
+    ]
+    expected = sorted(values, key=lambda item: (item["r"], item["id"]))
+    assert sort_list_of_dicts_by_key(values, key=("r", "id")) == expected
+    assert (
+        sort_list_of_dicts_by_key(values, key=("r", "id"), reverse=True)
+        == (expected[::-1])
+    )
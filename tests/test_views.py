@@ -0,0 +1,67 @@
+import pytest
+
+from fuso.dicts import merge_dict
+from fuso.views import MergedView
+
+
+def test_merged_view_matches_merge_dict():
+    base = {
+        "name": "svc",
+        "db": {"host": "localhost", "port": 5432, "opts": {"ssl": False}},
+        "tags": ["base"],
+        "empty": None,
+    }
+    env = {"db": {"opts": {"ssl": True}}, "tags": ["env"], "replicas": 2}
+    tenant = {"db": {"host": "tenant"}, "tags": ["tenant"], "name": None}
+    view = MergedView(base, env, tenant)
+    expected = merge_dict(merge_dict(base, env), tenant)
+    assert view.materialize() == expected
+    assert list(view.materialize()) == list(expected)
+    assert view == expected
+    assert len(view) == len(expected)
+    assert view["tags"] == ["base", "env", "tenant"]
+
+
+def test_merged_view_resolves_lazily_and_caches():
+    calls = []
+
+    def track(old, new):
+        calls.append((old, new))
+        return new if new is not None else old
+
+    view = MergedView(
+        {"a": {"x": 1}, "b": 1}, {"a": {"y": 2}}, merge_functions={"b": track}
+    )
+    assert calls == []
+    nested = view["a"]
+    assert isinstance(nested, MergedView)
+    assert nested is view["a"]
+    assert dict(nested) == {"x": 1, "y": 2}
+    assert view["b"] == 1
+    assert view["b"] == 1
+    assert calls == [(1, None)]
+
+
+def test_merged_view_merge_functions_without_updates():
+    view = MergedView({"a": 1}, merge_functions={"a": lambda o, u: o * 10})
+    assert (
+        view["a"]
+        == merge_dict({"a": 1}, None, merge_functions={"a": lambda o, u: o * 10})["a"]
+    )
+
+
+def test_merged_view_ordering():
+    view = MergedView({"b": 1, "a": 2}, {"c": 3}, key_order=["c"])
+    assert list(view) == ["c", "a", "b"]
+    view = MergedView({"b": 1, "a": 2}, {"c": 3}, ordering="insertion")
+    assert list(view) == ["b", "a", "c"]
+
+
+def test_merged_view_missing_key_and_type_mismatch():
+    view = MergedView({"a": 1}, {"b": [1]}, {"b": "x"})
+    assert "a" in view
+    assert "z" not in view
+    with pytest.raises(KeyError):
+        view["z"]
+    with pytest.raises(TypeError, match="Cannot merge different types"):
+        view["b"]